@@ -18,15 +18,26 @@ Author: pneumatick
 """
 
 import os
+import base64
+import bisect
+import collections
+import contextlib
+import json
+import math
 import sqlite3
 import datetime
-import pandas as pd
+import queue
+import re
+import threading
 
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Only the error type is imported eagerly. pandas and the Google auth/client
+# libraries are imported by the methods that use them, so that local commands
+# do not pay for loading them.
 from googleapiclient.errors import HttpError
-from google_auth_oauthlib.flow import InstalledAppFlow
 
 # The CLIENT_SECRETS_FILE variable specifies the name of a file that contains
 # the OAuth 2.0 information for this application, including its client_id and
@@ -41,23 +52,513 @@ SCOPES = ['https://www.googleapis.com/auth/youtube.readonly']
 API_SERVICE_NAME = 'youtube'
 API_VERSION = 'v3'
 
+# Partial response masks (fields=) declaring exactly what each API call uses
+PAGE_ARCHIVE_FIELDS = (
+    'etag,nextPageToken,'
+    'items(snippet(title,position),contentDetails/videoId,status/privacyStatus)'
+)
+PAGE_PRINT_FIELDS = 'nextPageToken,items(snippet(title,position),contentDetails/videoId)'
+ETAG_FIELDS = 'etag,pageInfo/totalResults'
+PLAYLIST_RESOURCE_FIELDS = 'items(id,etag,snippet/title,contentDetails/itemCount)'
+PLAYLIST_INFO_FIELDS = 'items(id,snippet/title)'
+VIDEO_STATUS_FIELDS = 'items(id,status/privacyStatus)'
+# Stored for videos that videos.list no longer returns (deleted, or private to
+# another channel)
+UNAVAILABLE_STATUS = 'unavailable'
+
+# Quota units charged per API method, and the default daily quota per project
+QUOTA_COSTS = {
+    'playlistItems.list': 1,
+    'playlists.list': 1,
+    'videos.list': 1,
+}
+DAILY_QUOTA = 10000
+QUOTA_TIMEZONE = 'America/Los_Angeles'
+# Retries for 5xx/429 responses and connection errors; googleapiclient waits
+# a random 0 - 2^n seconds before retry n (exponential backoff with full jitter)
+API_RETRIES = 5
+# HTTP verbs of the YouTube Data API methods
+API_METHODS = {'GET': 'list', 'POST': 'insert', 'PUT': 'update', 'DELETE': 'delete'}
+
+# SQLite database settings
+DB_PATH = 'playlists.db'
+# Seconds a connection waits on a lock held by another connection (workers, GUI)
+DB_TIMEOUT = 30
+
+# PRAGMAs applied to every database connection, by profile name:
+# - 'wal': write-ahead log, so readers (e.g. the GUI) never wait on an archive
+#   that is writing; synchronous=NORMAL only syncs at checkpoints, a 64 MiB page
+#   cache and 256 MiB of memory-mapped I/O speed up searches
+# - 'default': SQLite's rollback journal with full syncs, for databases on
+#   network file systems, where WAL is not supported
+DB_PROFILES = {
+    'wal': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': DB_TIMEOUT * 1000,
+    },
+    'default': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': DB_TIMEOUT * 1000,
+    },
+}
+DB_PROFILE = 'wal'
+
+# Full-text indexes of video titles, by tokenizer: (FTS5 table, trigger name
+# prefix, table options). Either or both can be built (see rebuild_fts):
+# - 'trigram': matches any substring of 3 or more characters, but is several
+#   times larger and cannot match shorter terms
+# - 'unicode61': matches whole words, and word prefixes of 2-3 characters from
+#   prefix indexes, accent-insensitive; much smaller
+FTS_INDEXES = {
+    'trigram': ('videos_fts', 'videos', 'tokenize="trigram"'),
+    'unicode61': (
+        'videos_words', 'videos_words',
+        'tokenize="unicode61 remove_diacritics 2", prefix="2 3"'
+    ),
+}
+# Shortest query term the trigram index can match
+TRIGRAM_MIN_LENGTH = 3
+
+# In-playlist searches index the playlist's own videos in a temporary FTS5 table
+# when the archive holds more than this many videos per playlist item, so their
+# cost follows the playlist's size. Indexing one video costs about as much as
+# searching 50 videos in the index of every video, which larger playlists use.
+PLAYLIST_INDEX_RATIO = 50
+
+# Default number of results or videos on a page (see search_videos, get_playlist_page)
+PAGE_SIZE = 50
+
+# Search results kept for repeated searches (see search_cache_stats); 0 disables
+# the cache
+SEARCH_CACHE_SIZE = 256
+
+# Discovery documents are cached in this directory next to the database, trimmed
+# to the resources the archiver uses
+DISCOVERY_CACHE_DIR = 'discovery_cache'
+DISCOVERY_RESOURCES = ('playlistItems', 'playlists', 'videos')
+DISCOVERY_URL = 'https://www.googleapis.com/discovery/v1/apis/{api}/{apiVersion}/rest'
+
+# playlist_items.position holds a sort key rather than the displayed position:
+# keys are spaced POSITION_GAP apart, so videos can be inserted between others
+# without renumbering the rest of the playlist. Displayed positions are row
+# numbers in key order.
+POSITION_GAP = 1024
+
+# Pages fetched ahead while the current page is stored or printed (0 = serial)
+PREFETCH_DEPTH = 2
+
 # Table columns
 PLAYLIST_ITEMS_COLS = ['p_id', 'vid_id', 'position', 'added']
 VIDEOS_COLS = ['vid_id', 'title', 'status']
 
+class QuotaBudgetExceeded(Exception):
+    """Raised instead of sending a request that would exceed the daily quota budget."""
+
+
+class _TransferCounter:
+    """Thread-safe tally of API requests sent and response bytes received."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, n_bytes):
+        """Record one completed request and the size of its response body."""
+        with self._lock:
+            self.requests += 1
+            self.bytes += n_bytes
+
+
+class _QuotaTracker:
+    """Thread-safe tally of YouTube Data API quota units spent today.
+
+    Units already stored in the database for today are loaded into `persisted`;
+    units charged since are kept in `pending` until flushed to the database.
+    Units of replayed requests are moved to `replayed` instead, as they were
+    never spent and are not stored.
+    """
+
+    def __init__(self):
+        self.budget = DAILY_QUOTA
+        self.day = _quota_day()
+        self.persisted = 0
+        self.pending = {}
+        self.replayed = {}
+        self._lock = threading.Lock()
+
+    def used(self) -> int:
+        """Return the units spent today, stored or pending."""
+        with self._lock:
+            return self.persisted + sum(
+                units for (day, _), units in self.pending.items() if day == self.day
+            )
+
+    def check(self, units):
+        """Raise QuotaBudgetExceeded if spending `units` more would exceed the budget."""
+        used = self.used()
+        if used + units > self.budget:
+            raise QuotaBudgetExceeded(
+                f"{units} unit(s) needed, {max(self.budget - used, 0)} of " +
+                f"{self.budget} left today"
+            )
+
+    def charge(self, method):
+        """Record a request to an API method, refusing it if over budget."""
+        cost = QUOTA_COSTS.get(method, 1)
+        today = _quota_day()
+
+        with self._lock:
+            if today != self.day:
+                self.day = today
+                self.persisted = 0
+            used = self.persisted + sum(
+                units for (day, _), units in self.pending.items() if day == today
+            )
+            if used + cost > self.budget:
+                raise QuotaBudgetExceeded(
+                    f"{method} needs {cost} unit(s), {max(self.budget - used, 0)} of " +
+                    f"{self.budget} left today"
+                )
+            self.pending[(today, method)] = self.pending.get((today, method), 0) + cost
+
+    def drain(self, replayed=False) -> dict:
+        """Return and clear the pending units, keyed by (day, method).
+
+        With replayed=True the units are added to `replayed` rather than stored.
+        """
+        with self._lock:
+            pending = self.pending
+            self.pending = {}
+            self.persisted += sum(
+                units for (day, _), units in pending.items() if day == self.day
+            )
+            if replayed:
+                for key, units in pending.items():
+                    self.replayed[key] = self.replayed.get(key, 0) + units
+            return pending
+
+    def unstored(self) -> tuple[dict, int]:
+        """Return today's pending units per method and the total of replayed units."""
+        with self._lock:
+            pending = {}
+            for (day, method), units in self.pending.items():
+                if day == self.day:
+                    pending[method] = pending.get(method, 0) + units
+            replayed = sum(
+                units for (day, _), units in self.replayed.items() if day == self.day
+            )
+            return (pending, replayed)
+
+
+def _quota_day() -> str:
+    """Return the current quota day; Google resets quotas at midnight Pacific Time."""
+    try:
+        now = datetime.datetime.now(ZoneInfo(QUOTA_TIMEZONE))
+    except ZoneInfoNotFoundError:
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+    return now.date().isoformat()
+
+
+def _increasing_run(values) -> set:
+    """Return the indices of a longest strictly increasing subsequence of values.
+
+    Used to find the stored videos that are still in playlist order, so that they
+    keep their sort keys while only the others are given new ones. O(n log n).
+    """
+    tails = []
+    tail_indices = []
+    previous = [None] * len(values)
+
+    for (i, value) in enumerate(values):
+        j = bisect.bisect_left(tails, value)
+        if j == len(tails):
+            tails.append(value)
+            tail_indices.append(i)
+        else:
+            tails[j] = value
+            tail_indices[j] = i
+        previous[i] = tail_indices[j - 1] if j > 0 else None
+
+    indices = set()
+    i = tail_indices[-1] if tail_indices else None
+    while i is not None:
+        indices.add(i)
+        i = previous[i]
+
+    return indices
+
+
+def _fill_sort_keys(keys):
+    """Fill the gaps (None) in an increasing list of sort keys.
+
+    Missing keys before the first known key or after the last one are spaced
+    POSITION_GAP apart; missing keys between two known keys are spread evenly
+    between them.
+
+    Args:
+        keys (list): Sort keys in playlist order, None where a key is needed.
+
+    Returns:
+        list[int] | None: The completed keys, or None if two known keys are too
+            close together to fit the missing ones (the playlist needs rebalancing).
+    """
+    keys = list(keys)
+    known = [i for (i, key) in enumerate(keys) if key is not None]
+
+    if not known:
+        return [i * POSITION_GAP for i in range(len(keys))]
+
+    for i in range(known[0]):
+        keys[i] = keys[known[0]] - (known[0] - i) * POSITION_GAP
+    for i in range(known[-1] + 1, len(keys)):
+        keys[i] = keys[known[-1]] + (i - known[-1]) * POSITION_GAP
+
+    for (lo, hi) in zip(known, known[1:]):
+        if hi - lo == 1:
+            continue
+        step = (keys[hi] - keys[lo]) // (hi - lo)
+        if step < 1:
+            return None
+        for i in range(lo + 1, hi):
+            keys[i] = keys[lo] + (i - lo) * step
+
+    return keys
+
+
+def _encode_video_id(vid_id) -> int:
+    """Return the signed 64-bit integer a YouTube video ID encodes.
+
+    Video IDs are 11 base64url characters holding 64 bits; the last character
+    only carries 4 of its 6 bits, so canonical IDs round-trip exactly.
+
+    Raises:
+        ValueError: If vid_id is not a canonical 11-character video ID.
+    """
+    if len(vid_id) == 11:
+        key = int.from_bytes(base64.urlsafe_b64decode(vid_id + "="), "big", signed=True)
+        if _decode_video_id(key) == vid_id:
+            return key
+    raise ValueError(f"Not a YouTube video ID: {vid_id}")
+
+
+def _decode_video_id(key) -> str:
+    """Return the YouTube video ID of an integer made by _encode_video_id."""
+    return base64.urlsafe_b64encode(key.to_bytes(8, "big", signed=True))[:11].decode()
+
+
+def _encode_cursor(values) -> str:
+    """Return an opaque page cursor holding the sort key of the last row of a page."""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode()
+
+
+def _decode_cursor(cursor, length) -> list:
+    """Return the sort key held by a cursor made by _encode_cursor.
+
+    Raises:
+        ValueError: If cursor does not hold a sort key of the given length.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (AttributeError, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError(f"Not a page cursor: {cursor!r}")
+    return values
+
+
+class _MeteredHttp:
+    """HTTP wrapper that meters YouTube Data API traffic.
+
+    Every YouTube API request is charged to a _QuotaTracker before it is passed to
+    the wrapped HTTP object, and every response body size is reported to a
+    _TransferCounter. Sizes are counted after httplib2 has decompressed the body,
+    i.e. they reflect the amount of JSON that has to be parsed. Token refreshes
+    also pass through here but are free. Other attributes are read from the
+    wrapped object, so any httplib2.Http-compatible transport (such as a
+    cassette) can be metered.
+    """
+
+    def __init__(self, http, counter, quota):
+        self.http = http
+        self.counter = counter
+        self.quota = quota
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        path = urlparse(uri).path
+        if f"/{API_SERVICE_NAME}/{API_VERSION}/" in path:
+            resource = path.rsplit("/", 1)[-1]
+            self.quota.charge(f"{resource}.{API_METHODS.get(method, method.lower())}")
+
+        resp, content = self.http.request(uri, method, *args, **kwargs)
+        self.counter.add(len(content or b""))
+        return resp, content
+
+class _SearchCache:
+    """Least recently used search results of one database.
+
+    Each entry holds the database version it was read at (see
+    _ConnectionManager.data_version) and only counts as a hit while the version
+    is unchanged, so writes invalidate the whole cache without visiting it.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.hits = 0
+        self.misses = 0
+        self._results = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """Return the cached results of key at version, or None."""
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, result, size):
+        """Cache result, evicting the least recently used entries beyond size."""
+        with self._lock:
+            self._results[key] = (version, result)
+            self._results.move_to_end(key)
+            while len(self._results) > size:
+                self._results.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return the hits, misses and number of entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._results)}
+
+
+class _ConnectionManager:
+    """Per-thread SQLite connections to one database file.
+
+    Every thread that touches the database gets its own connection (and cursor),
+    opened on first use, so readers in different threads never share a cursor
+    and can read while another thread writes (see DB_PROFILES). Write
+    transactions are serialized by `write_lock`, so a single writer holds the
+    database at a time and the others wait in-process rather than on SQLite's
+    busy timeout. Holding it through writing() also tells readers that the
+    database changed (see data_version).
+
+    Connections are opened with check_same_thread=False only so that they can be
+    closed from another thread; each one is used by its own thread alone.
+    """
+
+    def __init__(self, path, connect):
+        """Initialize the manager.
+
+        Args:
+            path (str): Absolute path of the database file.
+            connect (Callable[[], sqlite3.Connection]): Opens a configured connection.
+        """
+        self.path = path
+        self.write_lock = threading.RLock()
+        self._connect = connect
+        self._local = threading.local()
+        self._connections = {}
+        self._lock = threading.Lock()
+        # Changes after every write transaction and commit of another connection
+        self._version = 0
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.cursor = conn.cursor()
+            with self._lock:
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    def cursor(self) -> sqlite3.Cursor:
+        """Return the cursor of the calling thread's connection."""
+        self.connection()
+        return self._local.cursor
+
+    @contextlib.contextmanager
+    def writing(self):
+        """Hold write_lock for a write transaction, then record that the database changed."""
+        with self.write_lock:
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._version += 1
+
+    def data_version(self) -> int:
+        """Return a number that changes whenever the database may have changed.
+
+        Write transactions in this process are counted by writing(). Commits of
+        other connections, including other processes, change the calling
+        connection's PRAGMA data_version. Its values can only be compared within
+        one connection, so each connection compares with the value it saw last,
+        and its first check counts as a change.
+
+        Returns:
+            int: The database version.
+        """
+        conn = self.connection()
+        (data_version,) = conn.execute('''PRAGMA data_version''').fetchone()
+        with self._lock:
+            if data_version != getattr(self._local, "data_version", None):
+                self._local.data_version = data_version
+                self._version += 1
+            return self._version
+
+    def close_finished(self):
+        """Close the connections of threads that have exited."""
+        with self._lock:
+            finished = [thread for thread in self._connections if not thread.is_alive()]
+            for thread in finished:
+                self._connections.pop(thread).close()
+
+    def close(self):
+        """Close every connection. Threads that use the manager again reconnect."""
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
 # NOTE: Consider renaming to InfoManager (more accurate and descriptive)
 class Archiver:
-    """Singleton class for managing YouTube playlist archival operations.
+    """Per-database singleton class for managing YouTube playlist archival operations.
 
     The Archiver class provides a singleton interface for interacting with the
     YouTube Data API v3, storing data in SQLite, and performing various archival
     operations on YouTube playlists including adding, updating, deleting, and searching.
+    There is one instance per database file, so archivers for different databases
+    can be used side by side.
 
     Attributes:
-        _instance (Archiver): Singleton instance of the class.
-        _youtube: Cached YouTube API service object.
-        _conn: SQLite database connection.
-        _cursor: SQLite database cursor.
+        _instances (dict): The instance of each database file, keyed by absolute path.
+        _service: Cached YouTube API service object, built on first use (see _youtube).
+        _discovery (str): The YouTube API discovery document, loaded on first use
+            (see _get_discovery_document).
+        _cassette (cassette.Cassette): Cassette the API traffic goes through, if
+            any (see use_cassette).
+        prefetch_depth (int): Pages fetched ahead while the current page is handled.
+        db_path (str): Absolute path of the SQLite database file.
+        db_profile (str): Key of DB_PROFILES applied to every connection.
+        _db (_ConnectionManager): Per-thread connections to the database.
+        _conn: SQLite database connection of the calling thread.
+        _cursor: SQLite database cursor of the calling thread.
 
     Example:
         >>> archiver = Archiver()
@@ -65,42 +566,80 @@ class Archiver:
         >>> archiver.archive_playlist("PLxxx")
     """
 
-    _instance = None
-    _instance = None
+    _instances = {}
 
     # Global YouTube API variables
-    _youtube = None
+    _service = None
+    prefetch_depth = PREFETCH_DEPTH
 
     # Global SQLite3 variables
-    _conn = None
-    _cursor = None
-
-    def __init__(self):
+    _db = None
+    # True when the database stores video IDs as integers (see convert_video_ids)
+    _integer_ids = False
+    # Keys of FTS_INDEXES built in the database (see rebuild_fts)
+    _fts_indexes = ('trigram',)
+    # Recent search results, shared with the workers (see _cached_search)
+    _search_cache = None
+    search_cache_size = SEARCH_CACHE_SIZE
+    # True for the per-thread copies made by _spawn_worker, which share _db
+    _worker = False
+
+    # Requests sent, bytes received and quota spent by the services of this
+    # database, shared with the workers
+    _transfer = None
+    _quota = None
+
+    def __init__(self, db_path=DB_PATH, db_profile=DB_PROFILE):
         """Initialize the Archiver singleton and create database tables.
 
-        Called after singleton instance creation to set up the database connection
+        Called after singleton instance creation to set up the connection manager
         and create required tables (playlist_data, playlist_items, videos, videos_fts)
         with triggers for full-text search synchronization.
 
         Note: This method is automatically called when creating a new Archiver instance
-            via __new__. The singleton pattern ensures only one Archiver exists.
+            via __new__. The singleton pattern ensures only one Archiver exists per
+            database file; an existing instance is not initialized again, and keeps
+            its database profile.
+
+        Args:
+            db_path (str): Path of the SQLite database file (default DB_PATH).
+            db_profile (str): Key of DB_PROFILES applied to every connection
+                (default DB_PROFILE).
         """
+        if self._db is not None:
+            return
+
+        self.db_path = os.path.abspath(db_path)
+        self.db_profile = db_profile
+        self._discovery = None
+        self._cassette = None
+        self._db = _ConnectionManager(
+            self.db_path, lambda: self._connect(check_same_thread=False)
+        )
+        self._search_cache = _SearchCache()
+        self._transfer = _TransferCounter()
+        self._quota = _QuotaTracker()
         self._instantiate_db()
 
-    def __new__(cls):
-        """Create or return the singleton instance of the class.
+    def __new__(cls, db_path=DB_PATH, db_profile=DB_PROFILE):
+        """Create or return the singleton instance of a database file.
 
         Implements the singleton pattern by ensuring only one instance of Archiver
-        ever exists. Subsequent calls to create an Archiver will return the same
-        cached instance instead of creating a new one.
+        exists per database file. Subsequent calls to create an Archiver for the
+        same file will return the same cached instance instead of creating a new one.
+
+        Args:
+            db_path (str): Path of the SQLite database file (default DB_PATH).
+            db_profile (str): Key of DB_PROFILES, used by __init__.
 
         Returns:
-            Archiver: The existing singleton instance if it exists, otherwise creates a new one.
+            Archiver: The existing instance of the file if it exists, otherwise creates a new one.
         """
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-    
+        path = os.path.abspath(db_path)
+        if path not in cls._instances:
+            cls._instances[path] = super().__new__(cls)
+        return cls._instances[path]
+
     def __del__(self):
         """Destructor called when the Archiver instance is being garbage collected.
 
@@ -113,12 +652,27 @@ class Archiver:
             # ... use archiver ...
             del archiver  # Triggers this method
         """
+        if self._worker or self._db is None:
+            return
         print("Closing database...")
-        if self._conn:
-            self._conn.close()
+        self.close()
 
-    def _get_authenticated_service(self):
-        """Authenticate with Google OAuth 2.0 and return a YouTube API service object.
+    def close(self):
+        """Close the database connections of every thread.
+
+        The instance can no longer be used and is forgotten, so the next Archiver
+        for the same database file creates and initializes a new one.
+
+        Returns:
+            None
+        """
+        self._db.close()
+        self._db = None
+        if type(self)._instances.get(self.db_path) is self:
+            del type(self)._instances[self.db_path]
+
+    def _get_credentials(self):
+        """Load, refresh or request OAuth 2.0 credentials for the YouTube API.
 
         This method handles the OAuth 2.0 authentication flow, including:
         - Loading existing credentials from token.json if available
@@ -126,17 +680,23 @@ class Archiver:
         - Prompting for browser authorization when no valid credentials exist
         - Saving new credentials to token.json for subsequent use
 
-        Args:
-            _self: Unused first argument required by non-static method definition.
-
         Returns:
-            googleapiclient.discovery.Resource: The YouTube API v3 service object ready for API calls.
+            google.oauth2.credentials.Credentials: Valid user credentials.
 
         Note:
             OAuth 2.0 client credentials must be configured in client_secret.json before first use.
         """
+        from google.oauth2.credentials import Credentials
+        from google.auth.credentials import AnonymousCredentials
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         credentials = None
 
+        # Replayed requests are never sent, so they need no credentials
+        if self._cassette and self._cassette.offline:
+            return AnonymousCredentials()
+
         # Load token if it exists
         if os.path.exists("token.json"):
             credentials = Credentials.from_authorized_user_file("token.json", SCOPES)
@@ -153,14 +713,124 @@ class Archiver:
             with open("token.json", "w") as token:
                 token.write(credentials.to_json())
 
-        return build(API_SERVICE_NAME, API_VERSION, credentials = credentials)
+        return credentials
+
+    def _get_authenticated_service(self, credentials=None):
+        """Authenticate with Google OAuth 2.0 and return a YouTube API service object.
+
+        Each service object owns its own HTTP connection, which is not thread-safe,
+        so worker threads build their own service from shared credentials.
+
+        Args:
+            credentials (Credentials, optional): Previously loaded credentials. When
+                omitted, credentials are loaded via _get_credentials.
+
+        Returns:
+            googleapiclient.discovery.Resource: The YouTube API v3 service object ready for API calls.
+        """
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.discovery import build_from_document
+
+        if credentials is None:
+            credentials = self._get_credentials()
+
+        # Same settings as googleapiclient.http.build_http, plus metering
+        if self._cassette:
+            http = self._cassette.http(timeout=60)
+        else:
+            http = httplib2.Http(timeout=60)
+        http.redirect_codes = http.redirect_codes - {308}
+
+        return build_from_document(
+            self._get_discovery_document(),
+            http=AuthorizedHttp(
+                credentials, http=_MeteredHttp(http, self._transfer, self._quota)
+            )
+        )
+
+    def _get_discovery_document(self) -> str:
+        """Return the YouTube API discovery document, cached on disk per API version.
+
+        The document is trimmed to the resources the archiver uses, which keeps the
+        cached file small and service construction fast. It is taken from the copy
+        bundled with googleapiclient, or downloaded if the library has none, and
+        written to DISCOVERY_CACHE_DIR, next to the database file, on first use.
+
+        Returns:
+            str: The discovery document as JSON.
+        """
+        if self._discovery:
+            return self._discovery
+
+        directory = os.path.join(os.path.dirname(self.db_path), DISCOVERY_CACHE_DIR)
+        path = os.path.join(directory, f"{API_SERVICE_NAME}.{API_VERSION}.json")
+        try:
+            with open(path) as f:
+                self._discovery = f.read()
+            return self._discovery
+        except OSError:
+            pass
+
+        import httplib2
+        from googleapiclient import discovery_cache
+
+        document = discovery_cache.get_static_doc(API_SERVICE_NAME, API_VERSION)
+        if document is None:
+            resp, document = httplib2.Http(timeout=60).request(
+                DISCOVERY_URL.format(api=API_SERVICE_NAME, apiVersion=API_VERSION)
+            )
+            if resp.status >= 300:
+                raise HttpError(resp, document, uri=DISCOVERY_URL)
+
+        document = json.loads(document)
+        document["resources"] = {
+            name: document["resources"][name] for name in DISCOVERY_RESOURCES
+        }
+        self._discovery = json.dumps(document)
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(f"{path}.tmp", "w") as f:
+                f.write(self._discovery)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"Could not cache the discovery document: {e}")
+
+        return self._discovery
+
+    def use_cassette(self, cassette):
+        """Route API traffic of services built from now on through a cassette.
+
+        Call before the first remote call. Applies to this Archiver and the workers
+        it spawns from now on. A recording cassette stores the traffic
+        of live requests; a replaying cassette serves recorded responses and needs
+        neither network access nor credentials (see cassette.Cassette).
+
+        Args:
+            cassette (cassette.Cassette | None): The cassette, or None to go live again.
+
+        Returns:
+            None
+        """
+        self._cassette = cassette
+
+    def get_transfer_stats(self) -> dict:
+        """Return the number of API requests sent and response bytes received.
+
+        Counts cover every service built by this Archiver, including worker services.
+
+        Returns:
+            dict: {'requests': int, 'bytes': int}
+        """
+        return {"requests": self._transfer.requests, "bytes": self._transfer.bytes}
     
     def authenticate(self):
         """Authenticate with YouTube API and cache the service object.
 
         This method initializes the cached YouTube API service by calling _get_authenticated_service,
-        storing the result in self._youtube for subsequent use. Call this method before
-        performing any archival operations to ensure the YouTube API is properly connected.
+        storing the result in self._service for subsequent use. Remote operations call it
+        on first use, so calling it beforehand is only needed to authenticate eagerly.
 
         Example:
             archiver = Archiver()
@@ -170,7 +840,18 @@ class Archiver:
         Note:
             Requires that client_secret.json is configured in the current directory.
         """
-        self._youtube = self._get_authenticated_service()
+        self._service = self._get_authenticated_service()
+        self._load_quota_usage()
+
+    @property
+    def _youtube(self):
+        """The YouTube API service, authenticated on first use.
+
+        Local operations never touch it, so they run without credentials or network.
+        """
+        if self._service is None:
+            self.authenticate()
+        return self._service
 
     '''
     # Get the API key from the specified text file
@@ -184,20 +865,47 @@ class Archiver:
             return None
     '''
 
-    def _get_playlist_page(self, playlist_id, n_items=50, next_page=None):
+    @staticmethod
+    def _execute(request):
+        """Execute an API request, retrying transient failures.
+
+        5xx and 429 responses and dropped connections are retried up to API_RETRIES
+        times with exponential backoff and jitter.
+
+        Args:
+            request (googleapiclient.http.HttpRequest): The request to execute.
+
+        Returns:
+            dict: The decoded API response.
+
+        Raises:
+            HttpError: If the request fails permanently or retries run out.
+        """
+        return request.execute(num_retries=API_RETRIES)
+
+    def _get_playlist_page(self, playlist_id, n_items=50, next_page=None, etag=None,
+                           fields=PAGE_ARCHIVE_FIELDS):
         """Retrieve a page of items from a YouTube playlist.
 
         Makes an API request to fetch up to `n_items` (maximum 50 per Google's limits)
         from the specified playlist. If a next_page token is provided, continues fetching
         from that point in the playlist.
 
+        When the ETag of a previous copy of the page is given, it is sent as an
+        If-None-Match header. If the page has not changed, Google answers 304 with no
+        body and a placeholder response is returned instead.
+
         Args:
             playlist_id (str): The YouTube playlist ID.
             n_items (int): Maximum number of items to retrieve (1-50). Defaults to 50.
             next_page (str, optional): The nextPageToken from a previous response for pagination.
+            etag (str, optional): The ETag of the cached copy of this page.
+            fields (str): Partial response mask naming the fields the caller uses.
+                Defaults to PAGE_ARCHIVE_FIELDS.
 
         Returns:
             dict or None: The API response containing 'items' key if successful, None otherwise.
+                An unchanged page is returned as {'etag': etag, 'items': [], 'notModified': True}.
         """
         if n_items < 1 or n_items > 50:
             print(f"Cannot retrieve {n_items} list items (range 1 - 50)...")
@@ -207,19 +915,26 @@ class Archiver:
             request = self._youtube.playlistItems().list(
                 part="snippet,contentDetails,status",
                 playlistId=playlist_id,
-                maxResults=n_items
+                maxResults=n_items,
+                fields=fields
             )
         else:
             request = self._youtube.playlistItems().list(
                 part="snippet,contentDetails,status",
                 playlistId=playlist_id,
                 maxResults=n_items,
-                pageToken=next_page
+                pageToken=next_page,
+                fields=fields
             )
 
+        if etag:
+            request.headers["If-None-Match"] = etag
+
         try:
-            response = request.execute()
-        except HttpError:
+            response = self._execute(request)
+        except HttpError as e:
+            if etag and e.resp.status == 304:
+                return {"etag": etag, "items": [], "notModified": True}
             raise
         return response
 
@@ -245,54 +960,187 @@ class Archiver:
             position = item['snippet']['position']
             print(f"{position}: Video Title: {video_title}, Video ID: {video_id}")
 
-    def _archive_playlist_response(self, playlist_id, response):
+    def _archive_playlist_response(self, playlist_id, response) -> dict:
         """Archive items from a YouTube playlist API response to SQLite database.
 
-        Processes each item in the response, extracting video metadata and inserting
-        it into both the playlist_items table and videos table (avoiding duplicates).
+        All rows of the page are prepared in memory and written with two executemany
+        calls (see _store_playlist_rows). Items and videos that are already stored
+        are skipped by the database rather than through exceptions.
+
+        Does not commit; the caller owns the transaction.
 
         Args:
             playlist_id (str): The YouTube playlist ID for which items are being archived.
             response (dict): The API response containing 'items' key with video data.
 
-        Raises:
-            sqlite3.IntegrityError: Caught when a video already exists in the database,
-                printing a message and skipping that video.
+        Returns:
+            dict: {'items': int, 'videos': int, 'skipped': int}, the playlist items
+                and videos added and the items that were already stored.
         """
+        now = int(datetime.datetime.now().timestamp())
+        item_rows = []
+        video_rows = []
+
         for item in response['items']:
-            video_title = item['snippet']['title']
-            video_id = item['contentDetails']['videoId']
-            position = item['snippet']['position']
-            status = item['status']['privacyStatus']
-            print(f"{position}: Video Title: {video_title}, Video ID: {video_id}")
-            now = datetime.datetime.now() 
-            try:
-                self._cursor.execute(
-                    '''
-                        INSERT INTO playlist_items
-                        (p_id, vid_id, position, added) 
-                        VALUES (?, ?, ?, ?) 
-                    ''', 
-                    (playlist_id, video_id, position, int(now.timestamp()))
-                )
-            except sqlite3.IntegrityError as e:
-                print("Video already in playlist. Skipping...")
+            video_id = self._video_key(item['contentDetails']['videoId'])
+            item_rows.append(
+                (playlist_id, video_id, item['snippet']['position'] * POSITION_GAP, now)
+            )
+            video_rows.append(
+                (video_id, item['snippet']['title'], item['status']['privacyStatus'])
+            )
+
+        return self._store_playlist_rows(item_rows, video_rows)
+
+    def _store_playlist_rows(self, item_rows, video_rows) -> dict:
+        """Insert playlist_items and videos rows, skipping rows that already exist.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            item_rows (list[tuple]): (p_id, vid_id, position, added) rows, where
+                vid_id is a database key (see _video_key).
+            video_rows (list[tuple]): (vid_id, title, status) rows.
+
+        Returns:
+            dict: {'items': int, 'videos': int, 'skipped': int}, the rows inserted
+                into each table and the item rows that were already stored.
+        """
+        self._cursor.executemany('''
+            INSERT INTO playlist_items (p_id, vid_id, position, added)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT DO NOTHING
+            ''',
+            item_rows
+        )
+        items = max(self._cursor.rowcount, 0)
+        self._cursor.executemany('''
+            INSERT INTO videos (vid_id, title, status)
+            VALUES (?, ?, ?)
+            ON CONFLICT DO NOTHING
+            ''',
+            video_rows
+        )
+        videos = max(self._cursor.rowcount, 0)
+
+        return {"items": items, "videos": videos, "skipped": len(item_rows) - items}
+
+    def _iter_playlist_pages(self, playlist_id, page_cache=None, fields=PAGE_ARCHIVE_FIELDS,
+                             start_token=""):
+        """Yield every page of a YouTube playlist, following nextPageToken.
+
+        With a page cache (see _load_page_cache), each request carries the cached
+        page's ETag. Unchanged pages are yielded as empty placeholders marked
+        'notModified', with their nextPageToken and the video IDs of their items
+        ('videoIds') restored from the cache so pagination can continue. Cached
+        pages whose video IDs are unknown are fetched without their ETag. The cache
+        is updated in place with the entry of every page fetched (see _page_entry).
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            page_cache (dict, optional): Maps page token ('' for the first page) to a
+                (etag, next_page_token, video_ids) tuple.
+            fields (str): Partial response mask passed to _get_playlist_page. Cached
+                ETags are only valid for the mask they were fetched with.
+            start_token (str): Page token to start from, e.g. a resumed checkpoint.
+                Defaults to the first page.
+
+        Yields:
+            dict: Each playlistItems.list() API response in playlist order.
+        """
+        token = start_token
+
+        while True:
+            cached = page_cache.get(token) if page_cache is not None else None
+            # A 304 is only useful if the page's items are known without it
+            if cached and cached[2] is None:
+                cached = None
+            response = self._get_playlist_page(
+                playlist_id,
+                next_page=token,
+                etag=cached[0] if cached else None,
+                fields=fields
+            )
+            if not response:
+                print("No response received...")
+                return
+
+            if response.get("notModified"):
+                response["videoIds"] = cached[2]
+                if cached[1]:
+                    response["nextPageToken"] = cached[1]
+            elif page_cache is not None:
+                page_cache[token] = self._page_entry(response)
+
+            yield response
+
+            # Get the next page if possible, otherwise end iteration
+            if "nextPageToken" not in response:
+                return
+            token = response["nextPageToken"]
+
+    def _prefetch(self, pages):
+        """Iterate over API pages while a background thread fetches the next ones.
+
+        A fetcher thread drives `pages` and keeps up to prefetch_depth pages waiting
+        in a bounded queue, so the network request for the next page overlaps with
+        the caller storing or printing the current one. The caller must not use the
+        YouTube service itself until iteration ends, since the fetcher is using it.
+        Errors raised while fetching are re-raised in the caller. When the caller
+        stops early, at most prefetch_depth + 1 pages have been requested needlessly.
+
+        Args:
+            pages (Iterator[dict]): Page iterator, e.g. from _iter_playlist_pages.
+
+        Yields:
+            dict: The pages of `pages`, in order.
+        """
+        if self.prefetch_depth < 1:
+            yield from pages
+            return
+
+        buffer = queue.Queue(maxsize=self.prefetch_depth)
+        stop = threading.Event()
+        done = object()
+
+        def fetch():
+            error = None
             try:
-                self._cursor.execute(
-                    '''
-                        INSERT INTO videos
-                        (vid_id, title, status) VALUES (?, ?, ?)
-                    ''',
-                    (video_id, video_title, status)
-                )
-            except sqlite3.IntegrityError as e:
-                print("Video has been stored previously. Skipping...")
+                for page in pages:
+                    buffer.put((page, None))
+                    if stop.is_set():
+                        return
+            except BaseException as e:
+                error = e
+            buffer.put((done, error))
+
+        fetcher = threading.Thread(target=fetch, daemon=True)
+        fetcher.start()
+
+        try:
+            while True:
+                (page, error) = buffer.get()
+                if page is done:
+                    if error:
+                        raise error
+                    return
+                yield page
+        finally:
+            # Unblock the fetcher if the caller stopped early, then wait for it
+            stop.set()
+            while fetcher.is_alive():
+                try:
+                    buffer.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            fetcher.join()
 
     def get_entire_playlist(self, playlist_id, behavior):
         """Retrieve or print all items from a YouTube playlist with pagination.
 
         Fetches the complete contents of a playlist by paginating through results until
-        no more pages remain. The `behavior` parameter determines how each page is handled:
+        no more pages remain, prefetching the next page while the current one is
+        handled. The `behavior` parameter determines how each page is handled:
         - "print": Prints video titles and IDs to console
         - "archive": Stores items in the SQLite database via _archive_playlist_response
 
@@ -303,35 +1151,32 @@ class Archiver:
         Returns:
             None
         """
-        end_reached = False
-
-        try:
-            response = self._get_playlist_page(playlist_id)
-
-            while not end_reached:
-                if not response:
-                    print("No response received...")
-                    return
+        if behavior not in ("print", "archive"):
+            print(f"Unknown behavior specified: {behavior}")
+            return
 
-                # Handle the response
-                if behavior == "print":
-                    self.print_playlist_response(response)
-                elif behavior == "archive":
-                    self._archive_playlist_response(playlist_id, response)
-                else:
-                    print(f"Unknown behavior specified: {behavior}")
-                    return
+        stored = 0
+        run = None
 
-                # Get the next page if possible, otherwise end loop
-                if "nextPageToken" in response:
-                    nextPageToken = response["nextPageToken"]
-                    response = self._get_playlist_page(
-                        playlist_id, 
-                        next_page=nextPageToken
-                    )
-                else:
-                    end_reached = True
-                    continue
+        try:
+            fields = PAGE_PRINT_FIELDS if behavior == "print" else PAGE_ARCHIVE_FIELDS
+            pages = self._prefetch(self._iter_playlist_pages(playlist_id, fields=fields))
+            try:
+                for response in pages:
+                    # Handle the response
+                    if behavior == "print":
+                        self.print_playlist_response(response)
+                    else:
+                        # One transaction per page
+                        with self._write_lock:
+                            run = self._tag_changes("archive", playlist_id, run)
+                            counts = self._archive_playlist_response(playlist_id, response)
+                            stored += counts["items"]
+                            self._conn.commit()
+            finally:
+                pages.close()
+            if behavior == "archive":
+                print(f"Stored {stored} new playlist item(s)")
         except HttpError as e:
             print(f"YouTube API error ({e.status_code}): {e.reason}")
             raise
@@ -356,14 +1201,18 @@ class Archiver:
             if n_items < 0:
                 return
             elif n_items <= 50:
-                response = self._get_playlist_page(playlist_id, n_items=n_items)
+                response = self._get_playlist_page(
+                    playlist_id,
+                    n_items=n_items,
+                    fields=PAGE_PRINT_FIELDS
+                )
                 self.print_playlist_response(response)
                 return
 
             # Getting more than 50 items
             end_reached = False
 
-            response = self._get_playlist_page(playlist_id)
+            response = self._get_playlist_page(playlist_id, fields=PAGE_PRINT_FIELDS)
             n_items -= 50
             while not end_reached:
                 if not response:
@@ -377,10 +1226,10 @@ class Archiver:
                     nextPageToken = response["nextPageToken"]
                     # Get max items (50) at a time while n > 50
                     response = self._get_playlist_page(
-                        self._youtube, 
                         playlist_id,
                         n_items=50 if n_items >= 50 else n_items,
-                        next_page=nextPageToken
+                        next_page=nextPageToken,
+                        fields=PAGE_PRINT_FIELDS
                     )
                     if n_items >= 50:
                         n_items -= 50
@@ -422,78 +1271,385 @@ class Archiver:
 
         return ids
 
-    def retrieve_items_from_playlists(self, path, n_items=None):
-        """Process multiple playlists according to configuration options.
+    def _spawn_worker(self, credentials):
+        """Create a non-singleton Archiver that owns its own API client.
 
-        Reads playlist IDs from the specified file and processes each playlist based
-        on how many items to retrieve:
-        - If n_items is None or 0: Archives each entire playlist
-        - If n_items is an int: Retrieves exactly n_items items per playlist
-        - If n_items is a list: Each element specifies items for corresponding playlist
+        The shared YouTube service cannot be used from several threads, so each worker
+        thread gets a private copy. Workers share the singleton's connection manager,
+        which gives each thread its own connection and serializes write transactions.
 
         Args:
-            path (str): Path to file containing one playlist ID per line.
-            n_items (int or list or None): Number of items per playlist, or list of counts,
-                or None for entire playlists.
+            credentials (Credentials): OAuth 2.0 credentials shared by all workers.
 
         Returns:
-            None
+            Archiver: A worker instance bound to the calling thread.
         """
-        playlist_ids = []
-
-        playlist_ids = self._get_playlist_ids(path)
-            
-        for i, p_id in enumerate(playlist_ids):
-            try:
-                if not n_items:
-                    print(f"\nGetting entire playlist with ID {p_id}\n")
-                    self.archive_playlist(p_id)
-                elif type(n_items) is int:
-                    print(f"\nGetting {n_items} items from playlist with ID {p_id}\n")
-                    self.get_n_playlist_items(p_id, n_items)
-                elif type(n_items) is list:
-                    if len(n_items) != len(playlist_ids):
-                        n = len(n_items)
-                        p = len(playlist_ids)
-                        print(
-                            f"Error: n_list size ({n}) != number of " +
-                            f"playlists ({p}). Returning..."
-                        )
-                        return
-                    print(f"\nGetting {n_items[i]} items from playlist with ID {p_id}\n")
-                    self.get_n_playlist_items(p_id, n_items[i])
-            except Exception as e:
-                print(f"An error occured: {e}")
+        worker = super().__new__(Archiver)
+        worker._worker = True
+        worker.prefetch_depth = self.prefetch_depth
+        worker.db_path = self.db_path
+        worker.db_profile = self.db_profile
+        worker._db = self._db
+        worker._integer_ids = self._integer_ids
+        worker._fts_indexes = self._fts_indexes
+        worker._search_cache = self._search_cache
+        worker._transfer = self._transfer
+        worker._quota = self._quota
+        worker._discovery = self._get_discovery_document()
+        worker._cassette = self._cassette
+        worker._service = self._get_authenticated_service(credentials)
+
+        return worker
+
+    def _process_playlist(self, playlist_id, n_items=None) -> dict:
+        """Archive, update or print a single playlist and report the outcome.
 
-        return
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            n_items (int, optional): Number of items to print. When None or 0 the
+                playlist is archived if new, or updated if already archived.
 
-    def _get_etag(self, playlist_id) -> str:
-        """Retrieve the ETag for a YouTube playlist.
+        Returns:
+            dict: Result summary with keys 'p_id', 'action', 'success' and 'error'.
+        """
+        result = {"p_id": playlist_id, "action": None, "success": False, "error": None}
 
-        The ETag is an opaque identifier that Google uses to represent resource states.
-        It changes whenever the playlist contents change, making it useful for detecting
-        updates without fetching full playlist data.
+        try:
+            if not n_items:
+                self._cursor.execute(
+                    '''SELECT 1 FROM playlist_data WHERE p_id = ?''',
+                    (playlist_id,)
+                )
+                if self._cursor.fetchall():
+                    result["action"] = "update"
+                    print(f"\nUpdating playlist with ID {playlist_id}\n")
+                    result["success"] = self.update_playlist(playlist_id)
+                else:
+                    result["action"] = "archive"
+                    print(f"\nGetting entire playlist with ID {playlist_id}\n")
+                    result["success"] = self.archive_playlist(playlist_id)
+            else:
+                result["action"] = "print"
+                print(f"\nGetting {n_items} items from playlist with ID {playlist_id}\n")
+                self.get_n_playlist_items(playlist_id, n_items)
+                result["success"] = True
+        except HttpError as e:
+            result["error"] = f"YouTube API error ({e.status_code}): {e.reason}"
+        except QuotaBudgetExceeded as e:
+            result["error"] = f"deferred, quota budget exceeded ({e})"
+        except Exception as e:
+            result["error"] = str(e)
+
+        return result
+
+    def retrieve_items_from_playlists(self, path, n_items=None, workers=1) -> list[dict]:
+        """Process multiple playlists according to configuration options.
+
+        Reads playlist IDs from the specified file and processes each playlist based
+        on how many items to retrieve:
+        - If n_items is None or 0: Archives each new playlist, updates archived ones
+        - If n_items is an int: Retrieves exactly n_items items per playlist
+        - If n_items is a list: Each element specifies items for corresponding playlist
+
+        With workers > 1, playlists are processed concurrently by a thread pool in
+        which every thread owns its own API client and database connection.
 
         Args:
-            playlist_id (str): The YouTube playlist ID.
+            path (str): Path to file containing one playlist ID per line.
+            n_items (int or list or None): Number of items per playlist, or list of counts,
+                or None for entire playlists.
+            workers (int): Number of playlists processed at once (default 1).
 
         Returns:
-            str: The ETag string from the API response.
+            list[dict]: One result summary per playlist (see _process_playlist), in
+                file order. Empty if the n_items list does not match the file.
+        """
+        playlist_ids = [p_id for p_id in self._get_playlist_ids(path) if p_id]
+
+        if type(n_items) is list:
+            if len(n_items) != len(playlist_ids):
+                n = len(n_items)
+                p = len(playlist_ids)
+                print(
+                    f"Error: n_list size ({n}) != number of " +
+                    f"playlists ({p}). Returning..."
+                )
+                return []
+            jobs = list(zip(playlist_ids, n_items))
+        else:
+            jobs = [(p_id, n_items) for p_id in playlist_ids]
 
-        Raises:
-            KeyError: If the playlist has no items (etag not present in response).
+        if workers <= 1:
+            try:
+                return [self._process_playlist(p_id, n) for p_id, n in jobs]
+            finally:
+                self.record_quota_usage()
+
+        # Give every pool thread its own worker, created on first use
+        credentials = self._get_credentials()
+        self._load_quota_usage()
+        local = threading.local()
+
+        def run(job):
+            worker = getattr(local, "worker", None)
+            if worker is None:
+                worker = local.worker = self._spawn_worker(credentials)
+            return worker._process_playlist(*job)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(run, jobs))
+        finally:
+            self._db.close_finished()
+            self.record_quota_usage()
+
+        return results
+
+    @staticmethod
+    def print_playlist_results(results):
+        """Print a per-playlist summary of a multi-playlist run.
+
+        Args:
+            results (list[dict]): Result summaries from retrieve_items_from_playlists.
+
+        Returns:
+            None
+        """
+        failed = [r for r in results if not r["success"]]
+
+        print(f"\nProcessed {len(results)} playlist(s), {len(failed)} failed")
+        for r in results:
+            if r["success"]:
+                outcome = "ok"
+            else:
+                outcome = "failed: " + (r["error"] or "nothing stored")
+            print(f"{r['p_id']} [{r['action']}]: {outcome}")
+
+        return
+
+    def _get_playlist_summary(self, playlist_id) -> tuple[str, int]:
+        """Retrieve the ETag and item count of a YouTube playlist in one request.
+
+        Requests zero items, so the response only carries the ETag and pageInfo.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            tuple[str, int]: The ETag string and pageInfo.totalResults.
         """
         request = self._youtube.playlistItems().list(
             part="contentDetails",
             playlistId=playlist_id,
-            maxResults=0
+            maxResults=0,
+            fields=ETAG_FIELDS
         )
 
         try:
-            response = request.execute()
+            response = self._execute(request)
         except HttpError:
             raise
-        return response["etag"]
+        return (response["etag"], response["pageInfo"]["totalResults"])
+
+    def _get_etag(self, playlist_id) -> str:
+        """Retrieve the ETag for a YouTube playlist.
+
+        The ETag is an opaque identifier that Google uses to represent resource states.
+        It changes whenever the playlist contents change, making it useful for detecting
+        updates without fetching full playlist data.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            str: The ETag string from the API response.
+
+        Raises:
+            KeyError: If the playlist has no items (etag not present in response).
+        """
+        return self._get_playlist_summary(playlist_id)[0]
+
+    @staticmethod
+    def _archive_cost(n_items) -> int:
+        """Return the quota units archive_playlist spends on a playlist of n_items.
+
+        One playlistItems.list call for the ETag and item count, one per page of 50
+        items, and one playlists.list call for the title.
+        """
+        pages = max(1, math.ceil(n_items / 50))
+
+        return (
+            QUOTA_COSTS['playlistItems.list'] * (pages + 1) +
+            QUOTA_COSTS['playlists.list']
+        )
+
+    def estimate_archive_cost(self, playlist_id) -> dict:
+        """Estimate the quota cost of archiving a playlist without archiving it.
+
+        Spends one quota unit on the same zero-item request _get_etag makes, and uses
+        its pageInfo.totalResults to count the pages a full archive would fetch.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            dict: Estimate with keys 'p_id', 'items', 'pages' and 'units'.
+        """
+        (_, n_items) = self._get_playlist_summary(playlist_id)
+
+        return {
+            "p_id": playlist_id,
+            "items": n_items,
+            "pages": max(1, math.ceil(n_items / 50)),
+            "units": self._archive_cost(n_items)
+        }
+
+    def estimate_archive_costs(self, path=None, playlist_ids=None) -> list[dict]:
+        """Estimate the quota cost of a run over several playlists without running it.
+
+        New playlists are estimated with estimate_archive_cost (one quota unit each).
+        Archived playlists would be updated instead; their estimate is the minimum
+        cost of an update (ETag check, one page and the playlist resource) and costs
+        nothing to compute.
+
+        Args:
+            path (str, optional): Path to a file containing one playlist ID per line.
+            playlist_ids (list[str], optional): Playlist IDs, used when path is omitted.
+
+        Returns:
+            list[dict]: One estimate per playlist with keys 'p_id', 'action', 'items',
+                'pages' and 'units' ('items' and 'pages' are None for updates).
+        """
+        if path:
+            playlist_ids = [p_id for p_id in self._get_playlist_ids(path) if p_id]
+
+        estimates = []
+        for p_id in playlist_ids:
+            self._cursor.execute(
+                '''SELECT 1 FROM playlist_data WHERE p_id = ?''',
+                (p_id,)
+            )
+            if self._cursor.fetchall():
+                estimates.append({
+                    "p_id": p_id, "action": "update", "items": None, "pages": None,
+                    "units": 2 * QUOTA_COSTS['playlistItems.list'] + QUOTA_COSTS['playlists.list']
+                })
+            else:
+                estimate = self.estimate_archive_cost(p_id)
+                estimate["action"] = "archive"
+                estimates.append(estimate)
+
+        return estimates
+
+    def print_cost_estimates(self, estimates):
+        """Print quota estimates next to today's remaining quota budget.
+
+        Args:
+            estimates (list[dict]): Estimates from estimate_archive_costs.
+
+        Returns:
+            None
+        """
+        for e in estimates:
+            if e["action"] == "archive":
+                print(
+                    f"{e['p_id']} [archive]: {e['items']} item(s), {e['pages']} page(s), " +
+                    f"{e['units']} unit(s)"
+                )
+            else:
+                print(f"{e['p_id']} [update]: at least {e['units']} unit(s)")
+
+        usage = self.get_quota_usage()
+        total = sum(e["units"] for e in estimates)
+        remaining = usage["budget"] - usage["used"]
+        print(
+            f"\nEstimated cost: {total} unit(s). Used today ({usage['day']}): " +
+            f"{usage['used']} of {usage['budget']}, {remaining} left"
+        )
+        if total > remaining:
+            print("This run would exceed the daily quota budget; some playlists would be deferred.")
+
+        return
+
+    def set_quota_budget(self, units):
+        """Set the number of quota units runs may spend per day (default DAILY_QUOTA).
+
+        Requests that would take today's usage past the budget are not sent; a
+        QuotaBudgetExceeded error is raised instead.
+
+        Args:
+            units (int): Daily quota budget.
+
+        Returns:
+            None
+        """
+        self._quota.budget = units
+
+    def _load_quota_usage(self):
+        """Load the quota units already stored for today into the quota tracker."""
+        self._cursor.execute(
+            '''SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ?''',
+            (self._quota.day,)
+        )
+        self._quota.persisted = self._cursor.fetchall()[0][0]
+
+    def _store_quota_usage(self):
+        """Add the tracker's pending quota units to the quota_usage table.
+
+        Does not commit; the caller owns the transaction. Units of replayed
+        requests are counted for the run but not stored, as nothing was spent.
+        """
+        replayed = bool(self._cassette and self._cassette.offline)
+        pending = self._quota.drain(replayed)
+        if replayed:
+            return
+        self._cursor.executemany('''
+            INSERT INTO quota_usage (day, method, units) VALUES (?, ?, ?)
+            ON CONFLICT (day, method) DO UPDATE SET units = units + excluded.units
+            ''',
+            [(day, method, units) for (day, method), units in pending.items()]
+        )
+
+    def record_quota_usage(self):
+        """Persist the quota units spent since the last write to the database.
+
+        Returns:
+            None
+        """
+        with self._write_lock:
+            self._store_quota_usage()
+            self._conn.commit()
+
+    def get_quota_usage(self) -> dict:
+        """Return today's quota usage per API method, stored and pending.
+
+        Units of requests replayed from a cassette are not spent, so they are
+        reported separately in 'replayed' rather than in 'used'.
+
+        Returns:
+            dict: {'day': str, 'budget': int, 'used': int, 'by_method': dict[str, int],
+                'replayed': int}
+        """
+        self._cursor.execute(
+            '''SELECT method, units FROM quota_usage WHERE day = ?''',
+            (self._quota.day,)
+        )
+        by_method = dict(self._cursor.fetchall())
+        (pending, replayed) = self._quota.unstored()
+        if self._cassette and self._cassette.offline:
+            # Not yet drained, but never stored either
+            replayed += sum(pending.values())
+            pending = {}
+        for method, units in pending.items():
+            by_method[method] = by_method.get(method, 0) + units
+
+        return {
+            "day": self._quota.day,
+            "budget": self._quota.budget,
+            "used": sum(by_method.values()),
+            "by_method": by_method,
+            "replayed": replayed
+        }
 
     def check_playlist_for_changes(self, playlist_id) -> tuple[bool, str]:
         """Check whether a playlist has changed since last archived.
@@ -530,9 +1686,46 @@ class Archiver:
                 return (False, "")
             else:
                 return (True, etag)
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             print(f"Error when checking playlist for changes: {e}")
 
+    def _get_playlist_resources(self, playlist_ids, fields=PLAYLIST_RESOURCE_FIELDS) -> dict:
+        """Retrieve playlist resources for many playlists with batched API requests.
+
+        Google accepts up to 50 comma-separated IDs per playlists.list() call, so
+        checking N playlists costs ceil(N / 50) requests instead of N.
+
+        Args:
+            playlist_ids (list[str]): The YouTube playlist IDs.
+            fields (str): Partial response mask naming the fields the caller uses.
+                Defaults to PLAYLIST_RESOURCE_FIELDS.
+
+        Returns:
+            dict: Maps each playlist ID found to its playlist resource (with 'etag',
+                'snippet' and 'contentDetails'). Missing or private playlists are absent.
+        """
+        resources = {}
+
+        for i in range(0, len(playlist_ids), 50):
+            batch = playlist_ids[i:i + 50]
+            request = self._youtube.playlists().list(
+                part='snippet,contentDetails',
+                id=','.join(batch),
+                maxResults=50,
+                fields=fields
+            )
+            try:
+                response = self._execute(request)
+            except HttpError:
+                raise
+
+            for item in response["items"]:
+                resources[item["id"]] = item
+
+        return resources
+
     def _get_playlist_info(self, playlist_id):
         """Retrieve the title of a YouTube playlist from the API.
 
@@ -544,30 +1737,257 @@ class Archiver:
         Returns:
             str: The playlist's title, or raises KeyError if not found.
         """
-        request = self._youtube.playlists().list(
-            part='snippet',
-            id=playlist_id
+        resources = self._get_playlist_resources([playlist_id], fields=PLAYLIST_INFO_FIELDS)
+
+        return resources[playlist_id]["snippet"]["title"]
+
+    def _record_playlist_state(self, playlist_id, resource):
+        """Store the playlist resource ETag and item count used by check_all_playlists.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            resource (dict): The playlist resource from _get_playlist_resources.
+
+        Returns:
+            None
+        """
+        now = datetime.datetime.now()
+        self._cursor.execute('''
+            INSERT OR REPLACE INTO playlist_state
+            (p_id, etag, item_count, checked)
+            VALUES (?, ?, ?, ?)
+            ''',
+            (
+                playlist_id, resource["etag"],
+                resource["contentDetails"]["itemCount"], int(now.timestamp())
+            )
         )
-        try:
-            response = request.execute()
-        except HttpError:
-            raise
-        
-        return response["items"][0]["snippet"]["title"]
+
+    def _tag_changes(self, kind, playlist_id=None, run_id=None) -> int:
+        """Start a sync run, or continue one, and tag the changes written with it.
+
+        Every change the triggers record in the change log (see
+        _change_log_triggers) is tagged with the run in current_run. Call this in
+        each write transaction of a run before writing, while holding the write
+        lock, so that runs of other threads cannot take over the tag. The run's
+        start time is what get_playlist_as_of compares timestamps with.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            kind (str): What the run does, e.g. 'archive', 'update' or 'refresh'.
+            playlist_id (str, optional): The playlist the run syncs, if only one.
+            run_id (int, optional): A run started earlier by this operation.
+
+        Returns:
+            int: The ID of the run.
+        """
+        if run_id is None:
+            self._cursor.execute(
+                '''INSERT INTO sync_runs (p_id, kind, started) VALUES (?, ?, ?)''',
+                (playlist_id, kind, int(datetime.datetime.now().timestamp()))
+            )
+            run_id = self._cursor.lastrowid
+        self._cursor.execute('''UPDATE current_run SET run_id = ?''', (run_id,))
+
+        return run_id
+
+    def check_all_playlists(self) -> list[dict]:
+        """Check every archived playlist for changes using batched API requests.
+
+        Fetches the playlist resources of all archived playlists 50 at a time and
+        compares each resource's ETag and item count with the state recorded when
+        the playlist was last archived or updated. Playlists archived before that
+        state was recorded are compared by item count against playlist_items.
+
+        Returns:
+            list[dict]: One dict per changed playlist with keys 'p_id', 'title',
+                'item_count' (remote, None if unavailable) and 'reason'.
+        """
+        self._cursor.execute('''
+            SELECT d.p_id, d.title, s.etag, s.item_count,
+                (SELECT COUNT(*) FROM playlist_items i WHERE i.p_id = d.p_id)
+            FROM playlist_data d
+            LEFT JOIN playlist_state s ON s.p_id = d.p_id
+        ''')
+        rows = self._cursor.fetchall()
+
+        resources = self._get_playlist_resources([row[0] for row in rows])
+
+        changed = []
+        for p_id, title, etag, item_count, local_count in rows:
+            resource = resources.get(p_id)
+            if resource is None:
+                changed.append({
+                    "p_id": p_id, "title": title, "item_count": None,
+                    "reason": "playlist unavailable"
+                })
+                continue
+
+            remote_count = resource["contentDetails"]["itemCount"]
+            if etag is None:
+                known_count = local_count
+            else:
+                known_count = item_count
+
+            if remote_count != known_count:
+                reason = f"item count {known_count} -> {remote_count}"
+            elif etag is not None and resource["etag"] != etag:
+                reason = "etag changed"
+            else:
+                continue
+
+            changed.append({
+                "p_id": p_id, "title": title, "item_count": remote_count,
+                "reason": reason
+            })
+
+        return changed
+
+    @staticmethod
+    def print_changed_playlists(changed):
+        """Print the playlists reported by check_all_playlists.
+
+        Args:
+            changed (list[dict]): Changed playlists from check_all_playlists.
+
+        Returns:
+            None
+        """
+        if not changed:
+            print("No changes since last update")
+            return
+
+        for playlist in changed:
+            print(f"{playlist['title']} ({playlist['p_id']}): {playlist['reason']}")
+        print(f"\n{len(changed)} playlist(s) changed")
+
+        return
+
+    def _get_video_statuses(self, video_ids) -> dict:
+        """Retrieve the privacy status of up to 50 videos with one videos.list() call.
+
+        Args:
+            video_ids (list[str]): Up to 50 YouTube video IDs.
+
+        Returns:
+            dict: Maps each video ID returned by the API to its privacyStatus. Deleted
+                videos, and private videos of other channels, are absent.
+        """
+        request = self._youtube.videos().list(
+            part='status',
+            id=','.join(video_ids),
+            maxResults=50,
+            fields=VIDEO_STATUS_FIELDS
+        )
+        response = self._execute(request)
+
+        return {item["id"]: item["status"]["privacyStatus"] for item in response["items"]}
+
+    def refresh_video_statuses(self, playlist_id=None) -> dict:
+        """Refresh the stored status of archived videos, 50 videos per request.
+
+        Video IDs are streamed from the videos table in chunks of 50 and each chunk
+        is looked up with a single videos.list() call (1 quota unit), so refreshing
+        N videos costs ceil(N / 50) units instead of re-archiving every playlist.
+        Only rows whose status changed are written, and every chunk is committed,
+        so a run stopped by the quota budget keeps its progress. Videos the API no
+        longer returns are marked UNAVAILABLE_STATUS.
+
+        Args:
+            playlist_id (str, optional): Only refresh the videos of this playlist.
+
+        Returns:
+            dict: {'checked': int, 'changed': int}
+
+        Raises:
+            QuotaBudgetExceeded: If the refresh would exceed the daily quota budget.
+        """
+        if playlist_id:
+            query = '''
+                SELECT v.vid_id, v.status FROM videos v
+                JOIN playlist_items p ON p.vid_id = v.vid_id
+                WHERE p.p_id = ? AND v.vid_id > ?
+                ORDER BY v.vid_id LIMIT 50
+            '''
+            count_query = '''SELECT COUNT(*) FROM playlist_items WHERE p_id = ?'''
+            params = (playlist_id,)
+        else:
+            query = '''
+                SELECT vid_id, status FROM videos
+                WHERE vid_id > ? ORDER BY vid_id LIMIT 50
+            '''
+            count_query = '''SELECT COUNT(*) FROM videos'''
+            params = ()
+
+        self._cursor.execute(count_query, params)
+        self._quota.check(math.ceil(self._cursor.fetchall()[0][0] / 50))
+
+        checked = 0
+        changed = 0
+        run = None
+        # Sorts before every key: text keys sort after "" and integer keys after -inf
+        last_id = float("-inf") if self._integer_ids else ""
+
+        while True:
+            self._cursor.execute(query, params + (last_id,))
+            chunk = self._cursor.fetchall()
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+
+            statuses = self._get_video_statuses([self._video_id(key) for key, _ in chunk])
+            updates = [
+                (statuses.get(self._video_id(key), UNAVAILABLE_STATUS), key)
+                for (key, status) in chunk
+                if statuses.get(self._video_id(key), UNAVAILABLE_STATUS) != status
+            ]
+
+            with self._write_lock:
+                run = self._tag_changes("refresh", playlist_id, run)
+                self._cursor.executemany(
+                    '''UPDATE videos SET status = ? WHERE vid_id = ?''',
+                    updates
+                )
+                self._store_quota_usage()
+                self._conn.commit()
+
+            checked += len(chunk)
+            changed += len(updates)
+
+        print(f"Checked {checked} video(s), {changed} status change(s)")
+
+        return {"checked": checked, "changed": changed}
 
     def archive_playlist(self, playlist_id) -> bool:
         """Archive a YouTube playlist to the SQLite database.
 
         This method handles adding a new playlist to storage by:
-        1. Fetching all items from the playlist (archiving them to database)
-        2. Retrieving the playlist's title from the API
-        3. Recording metadata including creation timestamp, last update timestamp, and ETag
+        1. Retrieving the playlist's ETag and item count, and checking the cost of
+           the archive against the daily quota budget
+        2. Fetching the playlist page by page, committing every page together with
+           a checkpoint of the next page token and last stored position, while the
+           next page is already being fetched (see _prefetch)
+        3. Retrieving the playlist's title and recording metadata including creation
+           timestamp, last update timestamp, and ETag
+
+        If an earlier attempt was interrupted, archiving resumes from its checkpoint
+        instead of the first page. When the playlist changed since the checkpoint was
+        written, the rows of the earlier attempt are discarded (see
+        _discard_partial_archive) and the playlist is archived from the start.
 
         Args:
             playlist_id (str): The YouTube playlist ID to archive.
 
         Returns:
-            bool: True if the playlist was successfully archived, False if already exists.
+            bool: True if the playlist was successfully archived, False if it already
+                exists or an error interrupted it (a retry resumes from the checkpoint).
+
+        Raises:
+            QuotaBudgetExceeded: If archiving would exceed the daily quota budget.
+                Pages stored before that point are kept and resumed later.
         """
         success = False
 
@@ -578,44 +1998,266 @@ class Archiver:
             result = self._cursor.fetchall()
 
             if not result:
-                # Archive new playlist
-                self.get_entire_playlist(playlist_id, "archive")
-                playlist_title = self._get_playlist_info(playlist_id)
-                now = datetime.datetime.now()
-                etag = self._get_etag(playlist_id)
-                self._cursor.execute('''
-                    INSERT INTO playlist_data 
-                    (p_id, title, created, last_update, etag) 
-                    VALUES (?, ?, ?, ?, ?)
-                    ''',
-                    (
-                        playlist_id, playlist_title, int(now.timestamp()), 
-                        int(now.timestamp()), etag
+                (etag, n_items) = self._get_playlist_summary(playlist_id)
+                checkpoint = self._load_checkpoint(playlist_id)
+
+                run = None
+                if checkpoint and checkpoint[2] == etag:
+                    (token, position, _) = checkpoint
+                    print(f"Resuming archive after position {position}")
+                else:
+                    (token, position) = ("", -1)
+                    if checkpoint:
+                        print("Playlist changed since the interrupted archive, starting over")
+                        run = self._discard_partial_archive(playlist_id)
+
+                # Check the cost of the remaining pages and the title request
+                remaining = n_items - (position + 1)
+                if token is None:
+                    self._quota.check(QUOTA_COSTS['playlists.list'])
+                else:
+                    self._quota.check(
+                        self._archive_cost(remaining) - QUOTA_COSTS['playlistItems.list']
                     )
+
+                # Fetch and store the playlist one page (and one commit) at a time
+                page_cache = {}
+                stored = {"items": 0, "videos": 0, "skipped": 0}
+                # A None token means every page was stored before the interruption
+                pages = self._prefetch(
+                    self._iter_playlist_pages(playlist_id, page_cache, start_token=token)
+                    if token is not None else iter(())
+                )
+                try:
+                    for response in pages:
+                        next_token = response.get("nextPageToken")
+                        if response["items"]:
+                            position = response["items"][-1]["snippet"]["position"]
+
+                        with self._write_lock:
+                            run = self._tag_changes("archive", playlist_id, run)
+                            counts = self._archive_playlist_response(playlist_id, response)
+                            for key in stored:
+                                stored[key] += counts[key]
+                            self._store_page_entry(playlist_id, token, page_cache[token])
+                            self._store_checkpoint(playlist_id, next_token, position, etag)
+                            self._store_quota_usage()
+                            self._conn.commit()
+                        token = next_token
+                finally:
+                    pages.close()
+
+                resource = self._get_playlist_resources([playlist_id])[playlist_id]
+                playlist_title = resource["snippet"]["title"]
+
+                # Record the completed playlist
+                with self._write_lock:
+                    now = datetime.datetime.now()
+                    self._cursor.execute('''
+                        INSERT INTO playlist_data
+                        (p_id, title, created, last_update, etag)
+                        VALUES (?, ?, ?, ?, ?)
+                        ''',
+                        (
+                            playlist_id, playlist_title, int(now.timestamp()),
+                            int(now.timestamp()), etag
+                        )
+                    )
+                    self._record_playlist_state(playlist_id, resource)
+                    self._cursor.execute(
+                        '''DELETE FROM archive_checkpoints WHERE p_id = ?''',
+                        (playlist_id,)
+                    )
+                    self._store_quota_usage()
+                    self._conn.commit()
+                print(
+                    f"Playlist successfully archived: {stored['items']} item(s) and " +
+                    f"{stored['videos']} new video(s) stored, " +
+                    f"{stored['skipped']} duplicate item(s) skipped"
                 )
-                self._conn.commit()
-                print("Playlist successfully archived")
                 success = True
         except sqlite3.Error as e:
+            self._conn.rollback()
             print(f"Archive failed: SQLite3 error: {e}")
         except HttpError as e:
             print(f"Archive failed: YouTube API error ({e.status_code}): {e.reason}")
             return success # Here in case code is placed before final return
 
-        return success
+        return success
+
+    def _store_fetched_playlist(self, playlist_id, etag, pages, resource):
+        """Store a new playlist whose pages were all fetched beforehand.
+
+        Writes every page, the page cache entries, the playlist metadata and state in
+        a single transaction, for engines that fetch playlists without the page by
+        page checkpoints of archive_playlist (see async_archiver). Rows left behind
+        by an interrupted archive are reconciled with the fetched playlist (see
+        _reconcile_playlist), so stale, moved and repeated videos end up as in a
+        fresh archive.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            etag (str): The playlist ETag from _get_playlist_summary or equivalent.
+            pages (list[dict]): Every playlistItems.list() response, in order.
+            resource (dict): The playlist resource from _get_playlist_resources.
+
+        Returns:
+            None
+        """
+        with self._write_lock:
+            self._tag_changes("archive", playlist_id)
+            if self._load_checkpoint(playlist_id) is not None:
+                self._reconcile_playlist(playlist_id, [
+                    (self._video_key(item['contentDetails']['videoId']), item)
+                    for response in pages for item in response['items']
+                ])
+            else:
+                for response in pages:
+                    self._archive_playlist_response(playlist_id, response)
+            token = ""
+            for response in pages:
+                self._store_page_entry(playlist_id, token, self._page_entry(response))
+                token = response.get("nextPageToken")
+
+            now = datetime.datetime.now()
+            self._cursor.execute('''
+                INSERT INTO playlist_data
+                (p_id, title, created, last_update, etag)
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                (
+                    playlist_id, resource["snippet"]["title"], int(now.timestamp()),
+                    int(now.timestamp()), etag
+                )
+            )
+            self._record_playlist_state(playlist_id, resource)
+            self._cursor.execute(
+                '''DELETE FROM archive_checkpoints WHERE p_id = ?''',
+                (playlist_id,)
+            )
+            self._store_quota_usage()
+            self._conn.commit()
+
+    def _load_checkpoint(self, playlist_id):
+        """Load the checkpoint of an interrupted archive.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            tuple or None: (next page token, last stored position, playlist ETag), where
+                a None token means every page was stored. None if there is no checkpoint.
+        """
+        self._cursor.execute('''
+            SELECT page_token, position, etag
+            FROM archive_checkpoints WHERE p_id = ?
+        ''', (playlist_id,))
+        result = self._cursor.fetchall()
+
+        return result[0] if result else None
+
+    def _store_checkpoint(self, playlist_id, page_token, position, etag):
+        """Record how far archiving a playlist has progressed.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            page_token (str or None): Token of the next page to fetch, None when done.
+            position (int): Position of the last stored item.
+            etag (str): The playlist ETag the archive started from.
+
+        Returns:
+            None
+        """
+        now = datetime.datetime.now()
+        self._cursor.execute('''
+            INSERT OR REPLACE INTO archive_checkpoints
+            (p_id, page_token, position, etag, updated)
+            VALUES (?, ?, ?, ?, ?)
+            ''',
+            (playlist_id, page_token, position, etag, int(now.timestamp()))
+        )
+
+    def _discard_partial_archive(self, playlist_id) -> int:
+        """Remove the rows stored by an interrupted archive of a playlist.
+
+        Deletes the playlist's items, the videos no other playlist references, its
+        page cache entries and its checkpoint, so that the playlist can be archived
+        again from the first page. The removals are recorded under a new 'archive'
+        run, which the caller continues while archiving.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            int: The ID of the run the removals were recorded under.
+        """
+        with self._write_lock:
+            run = self._tag_changes("archive", playlist_id)
+            self._cursor.execute(
+                '''SELECT vid_id FROM playlist_items WHERE p_id = ?''',
+                (playlist_id,)
+            )
+            candidates = {vid_id for (vid_id,) in self._cursor.fetchall()}
+            self._cursor.execute(
+                '''DELETE FROM playlist_items WHERE p_id = ?''',
+                (playlist_id,)
+            )
+            self._delete_orphan_videos(candidates)
+            self._cursor.execute(
+                '''DELETE FROM playlist_pages WHERE p_id = ?''',
+                (playlist_id,)
+            )
+            self._cursor.execute(
+                '''DELETE FROM archive_checkpoints WHERE p_id = ?''',
+                (playlist_id,)
+            )
+            self._conn.commit()
+
+        return run
+
+    def _delete_orphan_videos(self, candidates) -> int:
+        """Delete the videos among candidates that no playlist references anymore.
+
+        Each candidate is checked through the playlist_items vid_id index, so the
+        cost follows the number of candidates rather than the size of the archive.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            candidates (Iterable): Database keys of videos (see _video_key).
+
+        Returns:
+            int: The number of videos deleted.
+        """
+        self._cursor.executemany('''
+            DELETE FROM videos
+            WHERE vid_id = ?
+                AND NOT EXISTS (SELECT 1 FROM playlist_items WHERE vid_id = ?)
+            ''',
+            [(vid_id, vid_id) for vid_id in candidates]
+        )
+
+        return max(self._cursor.rowcount, 0)
 
     def update_playlist(self, playlist_id) -> bool:
         """Update existing playlist metadata after checking for content changes.
 
         This method determines whether a playlist has been modified since the last
-        archival by comparing ETags. If changes are detected, it updates the
-        last_update timestamp, ETag, and adds new videos into the database.
+        archival by comparing ETags. If changes are detected, the playlist is
+        reconciled with the stored copy (see _sync_playlist): new videos are added,
+        removed videos are deleted and moved videos get their new position.
 
         Args:
             playlist_id (str): The YouTube playlist ID to update.
 
         Returns:
             bool: True if the playlist was updated or no action needed, False if not found.
+
+        Raises:
+            QuotaBudgetExceeded: If the daily quota budget runs out before the update
+                is fetched. Nothing is written in that case.
         """
         success = False
 
@@ -631,86 +2273,346 @@ class Archiver:
             if changed and etag:
                 # Update existing playlist
                 try:
-                    self._peek_playlist_top(playlist_id)
+                    diff = self._sync_playlist(playlist_id, etag)
                 except HttpError as e:
                     print(f"YouTube API error ({e.status_code}): {e.reason}")
                     return success
-                now = datetime.datetime.now()
-                self._cursor.execute('''
-                    UPDATE playlist_data 
-                    SET last_update = ?, etag = ?
-                    WHERE p_id = ?
-                    ''',
-                    ((int(now.timestamp()), etag, playlist_id))
+                print(
+                    f"Playlist successfully updated: {diff['inserted']} added, " +
+                    f"{diff['deleted']} removed, {diff['moved']} moved"
                 )
-                self._conn.commit()
-                print("Playlist successfully updated")
             else:
                 print("No changes since last update")
 
             success = True
-            
+
         return success
 
-    def _peek_playlist_top(self, playlist_id):
-        """Check for newly added videos at the top of a playlist.
+    @staticmethod
+    def _page_entry(response) -> tuple:
+        """Return the page cache entry of a fetched playlistItems.list() page.
+
+        Args:
+            response (dict): The API response.
+
+        Returns:
+            tuple: (etag, next_page_token, video_ids), where video_ids lists the
+                video ID of every item on the page, repeats included.
+        """
+        return (
+            response["etag"],
+            response.get("nextPageToken"),
+            [item['contentDetails']['videoId'] for item in response['items']]
+        )
+
+    def _load_page_cache(self, playlist_id) -> dict:
+        """Load the per-page ETags, page tokens and video IDs stored for a playlist.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            dict: Maps page token ('' for the first page) to (etag, next_page_token,
+                video_ids). video_ids is None for pages cached before video IDs
+                were stored.
+        """
+        self._cursor.execute('''
+            SELECT page_token, etag, next_page_token, video_ids
+            FROM playlist_pages WHERE p_id = ?
+        ''', (playlist_id,))
 
-        Scans through the most recent items in the playlist to identify videos that
-        were not previously recorded in the database, and adds them until an existing 
-        video is encountered.
+        return {
+            token: (etag, next_token, json.loads(video_ids) if video_ids is not None else None)
+            for token, etag, next_token, video_ids in self._cursor.fetchall()
+        }
+
+    def _store_page_cache(self, playlist_id, page_cache):
+        """Replace the stored per-page ETags, page tokens and video IDs of a playlist.
+
+        Does not commit; the caller owns the transaction.
 
         Args:
-            playlist_id (str): The YouTube playlist ID to peek into.
+            playlist_id (str): The YouTube playlist ID.
+            page_cache (dict): Page cache as filled in by _iter_playlist_pages.
 
         Returns:
             None
         """
-        new_videos = { "items": [] } 
-        more = True 
-    
+        self._cursor.execute(
+            '''DELETE FROM playlist_pages WHERE p_id = ?''',
+            (playlist_id,)
+        )
+        self._cursor.executemany('''
+            INSERT INTO playlist_pages (p_id, page_token, etag, next_page_token, video_ids)
+            VALUES (?, ?, ?, ?, ?)
+            ''',
+            [
+                (
+                    playlist_id, token, etag, next_token,
+                    json.dumps(video_ids) if video_ids is not None else None
+                )
+                for token, (etag, next_token, video_ids) in page_cache.items()
+            ]
+        )
+
+    def _store_page_entry(self, playlist_id, page_token, entry):
+        """Store the ETag, next page token and video IDs of a single page of a playlist.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            page_token (str): Token the page was requested with ('' for the first page).
+            entry (tuple): (etag, next_page_token, video_ids) as stored in a page
+                cache (see _page_entry).
+
+        Returns:
+            None
+        """
+        (etag, next_token, video_ids) = entry
+        self._cursor.execute('''
+            INSERT OR REPLACE INTO playlist_pages
+            (p_id, page_token, etag, next_page_token, video_ids)
+            VALUES (?, ?, ?, ?, ?)
+            ''',
+            (
+                playlist_id, page_token, etag, next_token,
+                json.dumps(video_ids) if video_ids is not None else None
+            )
+        )
+
+    def resync_playlist(self, playlist_id) -> bool:
+        """Re-read an archived playlist, downloading only pages that changed.
+
+        Unlike update_playlist, the playlist is reconciled even if its ETag matches
+        the stored one, e.g. to repair a copy written by an older version.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID to re-sync.
+
+        Returns:
+            bool: True if the playlist was re-synced, False if it is not archived or
+                an error occurred.
+
+        Raises:
+            QuotaBudgetExceeded: If the re-sync would exceed the daily quota budget.
+        """
+        self._cursor.execute(
+            '''SELECT 1 FROM playlist_data WHERE p_id = ?''',
+            (playlist_id,)
+        )
+        if not self._cursor.fetchall():
+            print(f"Playlist {playlist_id} not archived.")
+            return False
+
         try:
-            response = self._get_playlist_page(playlist_id) 
-        
-            # Check if video is in playlist or not and handle accordingly 
-            while more: 
-                for item in response['items']: 
-                    video_id = item['contentDetails']['videoId'] 
-                    
-                    self._cursor.execute( 
-                        ''' 
-                            SELECT * FROM playlist_items  
-                            WHERE p_id = ? AND vid_id = ? 
-                        ''', 
-                        (playlist_id, video_id) 
-                    ) 
-                    result = self._cursor.fetchall() 
-                    if result: 
-                        print("Existing video encountered.")
-                        more = False 
-                        break 
-                    else: 
-                        print(f"New video found: {item['snippet']['title']}")
-                        new_videos['items'].append(item) 
-        
-                # Get the next page if necessary 
-                if more and "nextPageToken" in response: 
-                    token = response["nextPageToken"] 
-                    response = self._get_playlist_page(playlist_id, next_page = token) 
-        except HttpError:
-            raise
-        
-        # Add the new videos and increment positions of old videos 
-        if len(new_videos["items"]) > 0: 
-            self._cursor.execute(
-                '''
-                    UPDATE playlist_items SET position = position + ?
-                    WHERE p_id = ?
+            diff = self._sync_playlist(playlist_id, self._get_etag(playlist_id), "resync")
+        except HttpError as e:
+            print(f"Resync failed: YouTube API error ({e.status_code}): {e.reason}")
+            return False
+
+        print(
+            f"Resynced {diff['pages']} page(s): {diff['unchanged_pages']} unchanged, " +
+            f"{diff['writes']} row(s) written"
+        )
+
+        return True
+
+    def _sync_playlist(self, playlist_id, etag, kind="update") -> dict:
+        """Reconcile a stored playlist with its current remote contents.
+
+        Streams the remote item list (see _get_remote_items), then applies the
+        difference with the stored rows, the page cache, the playlist state and
+        the new ETag in a single transaction, recorded in the change log as one run.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            etag (str): The playlist's current ETag.
+            kind (str): The kind of the run in the change log (see _tag_changes).
+
+        Returns:
+            dict: The counts from _reconcile_playlist, plus 'pages' and
+                'unchanged_pages'.
+
+        Raises:
+            HttpError: If a request fails. Nothing is written in that case.
+            QuotaBudgetExceeded: If the sync would exceed the daily quota budget.
+        """
+        page_cache = self._load_page_cache(playlist_id)
+
+        # One request per cached page, plus the playlist resource
+        self._quota.check(max(len(page_cache), 1) + 1)
+
+        (remote, pages, unchanged) = self._get_remote_items(playlist_id, page_cache)
+        resource = self._get_playlist_resources([playlist_id]).get(playlist_id)
+
+        with self._write_lock:
+            self._tag_changes(kind, playlist_id)
+            diff = self._reconcile_playlist(playlist_id, remote)
+            self._store_page_cache(playlist_id, page_cache)
+            if resource:
+                self._record_playlist_state(playlist_id, resource)
+            now = datetime.datetime.now()
+            self._cursor.execute('''
+                UPDATE playlist_data
+                SET last_update = ?, etag = ?
+                WHERE p_id = ?
                 ''',
-                (len(new_videos["items"]), playlist_id)
+                (int(now.timestamp()), etag, playlist_id)
             )
-            self._archive_playlist_response(playlist_id, new_videos) 
-    
-        return
+            self._store_quota_usage()
+            self._conn.commit()
+
+        diff["pages"] = pages
+        diff["unchanged_pages"] = unchanged
+
+        return diff
+
+    def _get_remote_items(self, playlist_id, page_cache) -> tuple[list, int, int]:
+        """Stream the current item list of a playlist.
+
+        Pages are requested with their cached ETags (see _iter_playlist_pages).
+        A page answered with 304 Not Modified still holds the videos it held at the
+        last sync, so its items are taken from the video IDs cached with the page.
+        Stored positions cannot be used for this: a video repeated in the playlist
+        is stored once, which shifts every later page.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            page_cache (dict): Page cache from _load_page_cache, updated in place.
+
+        Returns:
+            tuple: (items, pages, unchanged_pages), where items is a list of
+                (vid_id, item) tuples in playlist order. vid_id is the database key
+                of the video (see _video_key) and item is the API playlist item,
+                or None for items of unchanged pages.
+        """
+        items = []
+        n_pages = 0
+        unchanged = 0
+
+        pages = self._prefetch(self._iter_playlist_pages(playlist_id, page_cache))
+
+        try:
+            for response in pages:
+                n_pages += 1
+
+                if response.get("notModified"):
+                    unchanged += 1
+                    items.extend(
+                        (self._video_key(vid_id), None) for vid_id in response["videoIds"]
+                    )
+                    continue
+
+                for item in response['items']:
+                    items.append((self._video_key(item['contentDetails']['videoId']), item))
+        finally:
+            pages.close()
+
+        return (items, n_pages, unchanged)
+
+    def _reconcile_playlist(self, playlist_id, remote) -> dict:
+        """Apply the difference between a remote item list and the stored playlist.
+
+        Computes the inserts (videos not stored yet), deletes (stored videos no
+        longer in the playlist) and moves (stored videos out of order) and writes
+        only those rows, plus video titles and statuses that changed. A video that
+        appears more than once in the playlist is stored at its first position.
+
+        Stored videos that are still in order, i.e. the longest run of videos whose
+        sort keys already increase in playlist order, keep their keys. New and
+        moved videos get keys in the gaps between them (see _fill_sort_keys), so
+        the number of rows written follows the size of the edit rather than the
+        size of the playlist. Only when a gap is too small for the videos that go
+        into it is the whole playlist renumbered POSITION_GAP apart.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            remote (list[tuple]): (vid_id, item) tuples in playlist order, as
+                returned by _get_remote_items.
+
+        Returns:
+            dict: {'inserted': int, 'deleted': int, 'moved': int, 'videos': int,
+                'writes': int, 'rebalanced': bool}, where 'moved' counts stored
+                videos given a new sort key, 'videos' counts video rows added or
+                changed and 'writes' is the total number of rows written.
+        """
+        now = int(datetime.datetime.now().timestamp())
+
+        self._cursor.execute(
+            '''SELECT vid_id, position FROM playlist_items WHERE p_id = ?''',
+            (playlist_id,)
+        )
+        local = dict(self._cursor.fetchall())
+
+        wanted = {}
+        for (vid_id, item) in remote:
+            if vid_id not in wanted:
+                wanted[vid_id] = item
+        order = list(wanted)
+
+        # Keep the keys of the stored videos that are still in order
+        stored = [i for (i, vid_id) in enumerate(order) if vid_id in local]
+        in_order = _increasing_run([local[order[i]] for i in stored])
+        keys = [None] * len(order)
+        for j in in_order:
+            keys[stored[j]] = local[order[stored[j]]]
+
+        new_keys = _fill_sort_keys(keys)
+        rebalanced = new_keys is None
+        if rebalanced:
+            new_keys = [i * POSITION_GAP for i in range(len(order))]
+
+        inserts = [
+            (playlist_id, vid_id, key, now)
+            for (vid_id, key) in zip(order, new_keys) if vid_id not in local
+        ]
+        deletes = [(playlist_id, vid_id) for vid_id in local if vid_id not in wanted]
+        moves = [
+            (key, playlist_id, vid_id)
+            for (vid_id, key) in zip(order, new_keys)
+            if vid_id in local and local[vid_id] != key
+        ]
+        videos = [
+            (vid_id, item['snippet']['title'], item['status']['privacyStatus'])
+            for (vid_id, item) in wanted.items() if item
+        ]
+
+        self._cursor.executemany(
+            '''DELETE FROM playlist_items WHERE p_id = ? AND vid_id = ?''',
+            deletes
+        )
+        self._cursor.executemany('''
+            INSERT INTO playlist_items (p_id, vid_id, position, added)
+            VALUES (?, ?, ?, ?)
+            ''',
+            inserts
+        )
+        self._cursor.executemany(
+            '''UPDATE playlist_items SET position = ? WHERE p_id = ? AND vid_id = ?''',
+            moves
+        )
+        self._cursor.executemany('''
+            INSERT INTO videos (vid_id, title, status)
+            VALUES (?, ?, ?)
+            ON CONFLICT (vid_id) DO UPDATE
+            SET title = excluded.title, status = excluded.status
+            WHERE title != excluded.title OR status != excluded.status
+            ''',
+            videos
+        )
+        changed_videos = max(self._cursor.rowcount, 0)
+
+        return {
+            "inserted": len(inserts),
+            "deleted": len(deletes),
+            "moved": len(moves),
+            "videos": changed_videos,
+            "writes": len(inserts) + len(deletes) + len(moves) + changed_videos,
+            "rebalanced": rebalanced
+        }
 
     def print_all_playlists(self):
         """Print details of all archived playlists to the console.
@@ -748,61 +2650,490 @@ class Archiver:
                     f"Last Updated: {last_update}\nEtag: {etag}\n"
             )
 
-    def print_videos_from_playlist(self, playlist_id, order="DESC"):
+    def get_playlist_page(self, playlist_id, page_size=PAGE_SIZE, after=None, order="ASC", count=False) -> dict:
+        """Return one page of a playlist's videos, in playlist order.
+
+        Each page starts after the (position, vid_id) of the last video of the
+        previous page, a range of the playlist_items_position index, instead of
+        skipping an OFFSET, so later pages cost no more than the first.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            page_size (int): Maximum number of videos on the page (default PAGE_SIZE).
+            after (str | None): The 'next' cursor of the previous page, or None
+                for the first page.
+            order (str): "ASC" for oldest first (default), "DESC" for newest first.
+            count (bool): Also count the videos of the playlist. The first page
+                in "DESC" order always counts them, to number the videos.
+
+        Returns:
+            dict: {'results': list of (position, vid_id, title, status, added)
+                tuples, where position is the displayed position,
+                'next': cursor of the next page, or None on the last page,
+                'total': number of videos, or None if not counted}.
+
+        Raises:
+            ValueError: If order is unknown or after is not a cursor returned by
+                this method.
+        """
+        if order not in ("ASC", "DESC"):
+            raise ValueError(f"Unknown order: {order}")
+
+        total = None
+        if count or (order == "DESC" and after is None):
+            self._cursor.execute(
+                '''SELECT COUNT(*) FROM playlist_items WHERE p_id = ?''', (playlist_id,)
+            )
+            total = self._cursor.fetchone()[0]
+
+        params = [playlist_id]
+        keyset = ''
+        if after is None:
+            number = 1 if order == "ASC" else total
+        else:
+            (number, position, vid_key) = _decode_cursor(after, 3)
+            comparison = '>' if order == "ASC" else '<'
+            keyset = f'''AND (pi.position, pi.vid_id) {comparison} (?, ?)'''
+            params.extend((position, vid_key))
+
+        # Stored positions are sort keys; the displayed position is the row number
+        self._cursor.execute(f'''
+            SELECT pi.position, pi.vid_id, v.title, v.status, pi.added
+            FROM playlist_items AS pi
+            INNER JOIN videos AS v ON v.vid_id = pi.vid_id
+            WHERE pi.p_id = ? {keyset}
+            ORDER BY pi.position {order}, pi.vid_id {order}
+            LIMIT ?
+        ''', [*params, page_size + 1])
+        rows = self._cursor.fetchall()
+        step = 1 if order == "ASC" else -1
+
+        next_page = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_page = _encode_cursor([number + step * page_size, *rows[-1][:2]])
+
+        return {
+            "results": [
+                (number + step * i, self._video_id(vid_key), title, status, added)
+                for (i, (_, vid_key, title, status, added)) in enumerate(rows)
+            ],
+            "next": next_page,
+            "total": total,
+        }
+
+    def print_videos_from_playlist(self, playlist_id, order="DESC", page_size=None, after=None):
         """Print video information from a playlist in specified order.
 
         Displays all videos stored for a given playlist with their position, title,
         URL, upload timestamp, and privacy status. The order parameter controls whether
-        videos are displayed newest-to-oldest or oldest-to-newest.
+        videos are displayed newest-to-oldest or oldest-to-newest. Videos are read a
+        page at a time (see get_playlist_page).
 
         Args:
             playlist_id (str): The YouTube playlist ID.
             order (str): "DESC" for newest first (default), "ASC" for oldest first.
+            page_size (int | None): Print only this many videos, then the cursor
+                of the next page. None prints every video.
+            after (str | None): The cursor of the page to print, or None for the first.
 
         Returns:
             None
         """
-        if order == "DESC":
-            self._cursor.execute(
-                '''SELECT * FROM playlist_items WHERE p_id = ? ORDER BY position DESC''', 
-                (playlist_id,)
-            )
-        elif order == "ASC":
-            self._cursor.execute(
-                '''SELECT * FROM playlist_items WHERE p_id = ? ORDER BY position ASC''', 
-                (playlist_id,)
-            )
-        else:
+        if order not in ("ASC", "DESC"):
             print(f"Unknown order {order}...")
-        result = self._cursor.fetchall()
+            return
+
+        while True:
+            page = self.get_playlist_page(playlist_id, page_size or PAGE_SIZE, after, order)
+            for (position, vid_id, title, status, added) in page["results"]:
+                print(
+                    f"\n{position}: {title}\n" +
+                    f"URL: https://www.youtube.com/watch?v={vid_id}" +
+                    f"\nAdded: {datetime.datetime.fromtimestamp(added)}\nStatus: {status}"
+                )
 
-        for video in result:
-            vid_id = video[1]
+            after = page["next"]
+            if after is None:
+                return
+            if page_size:
+                print(f"\nNext page: --after {after}")
+                return
 
-            # Get video-specific info
-            self._cursor.execute(
-            '''SELECT * FROM videos WHERE vid_id = ?''',
-            (vid_id,)
+    def get_playlist_as_of(self, playlist_id, timestamp) -> list[tuple]:
+        """Rebuild a playlist as it was stored at a past time, from the change log.
+
+        The latest run started at or before the timestamp is the cutoff. Each video
+        of the playlist is placed by its last membership change up to that run, and
+        its status is the one its status changes show at that run. History starts
+        with the baseline run of the change log; playlists stored before it appear
+        as they were then.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            timestamp (int or float): Unix timestamp to rebuild the playlist at.
+
+        Returns:
+            list[tuple]: (vid_id, title, status) of each video, in playlist order.
+                Titles are current (None for videos no longer stored). Empty if the
+                playlist had no stored items at that time.
+        """
+        self._cursor.execute(
+            '''SELECT MAX(run_id) FROM sync_runs WHERE started <= ?''',
+            (int(timestamp),)
+        )
+        run_id = self._cursor.fetchone()[0]
+        if run_id is None:
+            return []
+
+        self._cursor.execute('''
+            SELECT c.vid_id, v.title, COALESCE(
+                (
+                    SELECT s.status FROM video_status_changes s
+                    WHERE s.vid_id = c.vid_id AND s.run_id <= :run_id
+                    ORDER BY s.run_id DESC, s.change_id DESC LIMIT 1
+                ),
+                (
+                    SELECT s.old_status FROM video_status_changes s
+                    WHERE s.vid_id = c.vid_id AND s.run_id > :run_id
+                    ORDER BY s.run_id ASC, s.change_id ASC LIMIT 1
+                ),
+                v.status
+            )
+            FROM playlist_changes c
+            LEFT JOIN videos v ON v.vid_id = c.vid_id
+            WHERE c.change_id IN (
+                SELECT MAX(change_id) FROM playlist_changes
+                WHERE p_id = :p_id AND run_id <= :run_id
+                GROUP BY vid_id
+            ) AND c.change != 'remove'
+            ORDER BY c.position ASC
+            ''',
+            {"p_id": playlist_id, "run_id": run_id}
+        )
+
+        return [
+            (self._video_id(key), title, status)
+            for (key, title, status) in self._cursor.fetchall()
+        ]
+
+    def get_playlist_history(self, playlist_id) -> list[dict]:
+        """Summarize the change log of a playlist, one entry per run.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            list[dict]: {'run_id': int, 'kind': str, 'started': int, 'added': int,
+                'removed': int, 'moved': int} for each run that changed the
+                playlist, oldest first. A deleted playlist ends with its
+                'delete' run (see delete_playlists).
+        """
+        self._cursor.execute('''
+            SELECT r.run_id, r.kind, r.started,
+                SUM(c.change = 'add'), SUM(c.change = 'remove'), SUM(c.change = 'move')
+            FROM playlist_changes c
+            JOIN sync_runs r ON r.run_id = c.run_id
+            WHERE c.p_id = ?
+            GROUP BY r.run_id
+            ORDER BY r.run_id ASC
+            ''',
+            (playlist_id,)
+        )
+
+        return [
+            {
+                "run_id": run_id, "kind": kind, "started": started,
+                "added": added, "removed": removed, "moved": moved
+            }
+            for (run_id, kind, started, added, removed, moved) in self._cursor.fetchall()
+        ]
+
+    def print_playlist_history(self, playlist_id):
+        """Print the runs that changed a playlist and what each one changed.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            None
+        """
+        history = self.get_playlist_history(playlist_id)
+        if not history:
+            print(f"No recorded changes for playlist {playlist_id}")
+            return
+
+        for run in history:
+            started = datetime.datetime.fromtimestamp(run["started"])
+            print(
+                f"Run {run['run_id']} ({run['kind']}, {started}): " +
+                f"{run['added']} added, {run['removed']} removed, {run['moved']} moved"
             )
-            vid_res = self._cursor.fetchall()
-            title = vid_res[0][1]
-            status = vid_res[0][2]
 
-            position = video[2] + 1
-            added = datetime.datetime.fromtimestamp(video[3])
+    def print_playlist_as_of(self, playlist_id, timestamp, order="DESC"):
+        """Print a playlist as it was stored at a past time (see get_playlist_as_of).
 
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            timestamp (int or float): Unix timestamp to rebuild the playlist at.
+            order (str): "DESC" for newest first (default), "ASC" for oldest first.
+
+        Returns:
+            None
+        """
+        videos = self.get_playlist_as_of(playlist_id, timestamp)
+        when = datetime.datetime.fromtimestamp(timestamp)
+        if not videos:
+            print(f"Playlist {playlist_id} had no stored items at {when}")
+            return
+
+        print(f"Playlist {playlist_id} as of {when}: {len(videos)} video(s)")
+        numbered = list(enumerate(videos, 1))
+        if order == "DESC":
+            numbered.reverse()
+        for (position, (vid_id, title, status)) in numbered:
             print(
                 f"\n{position}: {title}\n" +
                 f"URL: https://www.youtube.com/watch?v={vid_id}" +
-                f"\nAdded: {added}\nStatus: {status}"
+                f"\nStatus: {status}"
+            )
+
+    @property
+    def min_search_length(self) -> int:
+        """Shortest query the full-text indexes can match (1 with a word index)."""
+        return 1 if 'unicode61' in self._fts_indexes else TRIGRAM_MIN_LENGTH
+
+    def _fts_query(self, query) -> tuple[str, str]:
+        """Choose the full-text index for a query and adapt the query to it.
+
+        Queries go to the trigram index, which matches substrings, unless one of
+        their terms is too short for it or it is not built. The word index then
+        answers them instead; plain queries (words and spaces only) are turned
+        into phrase terms whose last term matches as a prefix, so results appear
+        while a word is being typed. Queries using FTS5 syntax are passed as is.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            tuple[str, str]: The FTS5 table and the MATCH expression.
+        """
+        terms = query.split()
+        short = any(len(term) < TRIGRAM_MIN_LENGTH for term in terms)
+
+        if 'unicode61' in self._fts_indexes and (short or 'trigram' not in self._fts_indexes):
+            if terms and re.fullmatch(r'[\w\s]+', query):
+                query = ' '.join(f'"{term}"' for term in terms) + '*'
+            return (FTS_INDEXES['unicode61'][0], query)
+
+        return (FTS_INDEXES['trigram'][0], query)
+
+    def _index_playlist(self, playlist_id, table):
+        """Index the videos of a small playlist in a temporary full-text table.
+
+        The temporary table lives in this thread's connection, uses the tokenizer
+        of the given index and is refilled on every call. Playlists that hold at
+        least 1/PLAYLIST_INDEX_RATIO of the archive are not indexed; counting the
+        archive stops at that point, so the check also follows the playlist's size.
+
+        The table is filled inside a savepoint, so a transaction the caller has
+        open is neither committed nor rolled back. Only the temp schema changes,
+        which other connections never see, so the write lock is not taken and
+        cached searches stay valid.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+            table (str): The full-text index the query was routed to (see _fts_query).
+
+        Returns:
+            str | None: The temporary table, or None if the playlist is too large.
+        """
+        self._cursor.execute(
+            '''SELECT COUNT(*) FROM playlist_items WHERE p_id = ?''', (playlist_id,)
+        )
+        limit = self._cursor.fetchone()[0] * PLAYLIST_INDEX_RATIO
+        self._cursor.execute(
+            '''SELECT COUNT(*) FROM (SELECT 1 FROM videos LIMIT ?)''', (limit + 1,)
+        )
+        if self._cursor.fetchone()[0] <= limit:
+            return None
+
+        options = next(options for (name, _, options) in FTS_INDEXES.values() if name == table)
+        playlist_table = table + '_playlist'
+        # Integer IDs are not searchable text (see _fts_schema)
+        vid_id = 'NULL' if self._integer_ids else 'vids.vid_id'
+
+        # Released into the caller's transaction if there is one, else committed
+        self._cursor.execute('''SAVEPOINT index_playlist''')
+        try:
+            self._cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS temp.{playlist_table} USING fts5(
+                    vid_id, title, content='', {options}
+                )
+            ''')
+            self._cursor.execute(
+                f'''INSERT INTO temp.{playlist_table}({playlist_table}) VALUES ('delete-all')'''
+            )
+            self._cursor.execute(f'''
+                INSERT INTO temp.{playlist_table}(rowid, vid_id, title)
+                SELECT vids.rowid, {vid_id}, vids.title
+                FROM playlist_items
+                INNER JOIN videos AS vids ON vids.vid_id = playlist_items.vid_id
+                WHERE playlist_items.p_id = ?
+            ''', (playlist_id,))
+        except sqlite3.Error:
+            self._cursor.execute('''ROLLBACK TO index_playlist''')
+            raise
+        finally:
+            self._cursor.execute('''RELEASE index_playlist''')
+
+        return playlist_table
+
+    def _cached_search(self, key) -> tuple[int, dict | None]:
+        """Look up a page of search results in the search cache.
+
+        Repeated searches (e.g. the GUI switching between playlists and back) are
+        answered from memory until the database changes. The version the results
+        would be stored under is read before the search runs, so results of a
+        search that overlapped a write are never served (see _SearchCache).
+
+        Args:
+            key (tuple): The arguments of search_videos.
+
+        Returns:
+            tuple[int, dict | None]: The database version to store a new page
+                under (see _store_search), and a copy of the cached page, or None
+                if it is not cached.
+        """
+        if not self.search_cache_size:
+            return (None, None)
+
+        version = self._db.data_version()
+        page = self._search_cache.get(key, version)
+        if page is None:
+            return (version, None)
+
+        (results, next_page, total) = page
+        return (version, {"results": list(results), "next": next_page, "total": total})
+
+    def _store_search(self, key, version, page):
+        """Cache a page of search results under the version read before the search ran."""
+        if self.search_cache_size:
+            self._search_cache.put(
+                key, version, (tuple(page["results"]), page["next"], page["total"]),
+                self.search_cache_size
             )
 
+    def search_cache_stats(self) -> dict:
+        """Return the search cache's hits, misses, entries and size.
+
+        Returns:
+            dict: {'hits': int, 'misses': int, 'entries': int, 'size': int}.
+        """
+        return {**self._search_cache.stats(), "size": self.search_cache_size}
+
+    def search_videos(self, query, playlist_id=None, page_size=PAGE_SIZE, after=None, count=False) -> dict:
+        """Return one page of the videos matching a query, by relevance.
+
+        Uses SQLite's FTS5 virtual table to perform full-text search on video titles
+        (see _fts_query for the index used), across all videos or within one
+        playlist. Matches are ordered by relevance score, then rowid, and each page
+        starts after the (rank, rowid) of the last match of the previous page
+        instead of skipping an OFFSET, so later pages cost no more than the first.
+
+        Small playlists are searched through a temporary index of their own videos
+        (see _index_playlist), and ranked against those videos only, so the search
+        does not rank every match in the archive. Larger playlists are searched in
+        the index of every video and filtered by playlist. Pages are cached until
+        the database changes (see _cached_search).
+
+        Args:
+            query (str): The search term or phrase to match against video titles.
+            playlist_id (str | None): The playlist to search within, or None for all videos.
+            page_size (int): Maximum number of results on the page (default PAGE_SIZE).
+            after (str | None): The 'next' cursor of the previous page, or None
+                for the first page.
+            count (bool): Also count every match of the query.
+
+        Returns:
+            dict: {'results': list of (title, vid_id, status, rank) tuples,
+                'next': cursor of the next page, or None on the last page,
+                'total': number of matches, or None if not counted}.
+
+        Raises:
+            ValueError: If after is not a cursor returned by this method.
+        """
+        cache_key = (query, playlist_id, page_size, after, count)
+        (version, page) = self._cached_search(cache_key)
+        if page is not None:
+            return page
+
+        (table, query) = self._fts_query(query)
+        params = [query]
+        (fts_table, playlist_filter) = (table, '')
+        if playlist_id is not None:
+            playlist_table = self._index_playlist(playlist_id, table)
+            if playlist_table:
+                fts_table = playlist_table
+            else:
+                # Keep the videos that are in the playlist
+                playlist_filter = '''
+                    AND EXISTS (
+                        SELECT 1 FROM playlist_items
+                        WHERE playlist_items.vid_id = vids.vid_id AND playlist_items.p_id = ?
+                    )
+                '''
+                params.append(playlist_id)
+
+        total = None
+        if count:
+            self._cursor.execute(f'''
+                SELECT COUNT(*)
+                FROM {fts_table} AS v
+                INNER JOIN videos AS vids ON vids.rowid = v.rowid
+                WHERE v.{fts_table} MATCH ? {playlist_filter}
+            ''', params)
+            total = self._cursor.fetchone()[0]
+
+        keyset = ''
+        if after is not None:
+            keyset = '''AND (v.rank, v.rowid) > (?, ?)'''
+            params.extend(_decode_cursor(after, 2))
+
+        # One more row than the page shows whether there is a next page
+        self._cursor.execute(f'''
+            SELECT vids.title, vids.vid_id, vids.status, v.rank, v.rowid
+            FROM {fts_table} AS v
+            INNER JOIN videos AS vids ON vids.rowid = v.rowid
+            WHERE v.{fts_table} MATCH ? {playlist_filter} {keyset}
+            ORDER BY v.rank, v.rowid
+            LIMIT ?
+        ''', [*params, page_size + 1])
+        rows = self._cursor.fetchall()
+
+        next_page = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_page = _encode_cursor(rows[-1][3:])
+
+        page = {
+            "results": [
+                (title, self._video_id(key), status, rank)
+                for (title, key, status, rank, _) in rows
+            ],
+            "next": next_page,
+            "total": total,
+        }
+        self._store_search(cache_key, version, page)
+
+        return page
+
     def search_in_playlist_fts(self, playlist_id, query, n_results=10):
         """Search for videos matching a query within a specific playlist.
 
-        Uses SQLite's FTS5 virtual table to perform full-text search on video titles.
-        Only returns results that are members of the specified playlist, ordered by
-        relevance score. Useful for finding specific content within an archived playlist.
+        Only returns results that are members of the specified playlist, ordered
+        by relevance score. Useful for finding specific content within an archived
+        playlist. This is the first page of search_videos; use it to page further.
 
         Args:
             playlist_id (str): The YouTube playlist ID to search within.
@@ -812,26 +3143,13 @@ class Archiver:
         Returns:
             list[tuple]: List of tuples containing (title, vid_id, status, rank) for each match.
         """
-        # Query videos that are in the playlist and match the FTS5 search
-        self._cursor.execute('''
-            SELECT v.title, v.vid_id, vids.status, v.rank
-            FROM videos_fts AS v
-            INNER JOIN videos AS vids ON vids.vid_id = v.vid_id
-            INNER JOIN playlist_items ON playlist_items.vid_id = v.vid_id
-            WHERE v.videos_fts MATCH ?
-                AND playlist_items.p_id = ?
-            ORDER BY v.rank
-            LIMIT ?
-        ''', (query, playlist_id, n_results))
-        result = self._cursor.fetchall()
-
-        return result
+        return self.search_videos(query, playlist_id, n_results)["results"]
         
     def search_all_videos_fts(self, query, n_results=10):
         """Search for videos matching a query across all archived videos.
 
-        Performs full-text search using the FTS5 virtual table without filtering by playlist.
-        Returns results sorted by relevance across the entire database.
+        Returns results sorted by relevance across the entire database. This is
+        the first page of search_videos; use it to page further.
 
         Args:
             query (str): The search term or phrase to match against video titles.
@@ -840,20 +3158,10 @@ class Archiver:
         Returns:
             list[tuple]: List of tuples containing (title, vid_id, status, rank) for each match.
         """
-        self._cursor.execute('''
-            SELECT v.title, v.vid_id, v.status, f.rank
-            FROM videos_fts AS f
-            INNER JOIN videos as v ON v.vid_id = f.vid_id
-            WHERE videos_fts MATCH ?
-            ORDER BY f.rank
-            LIMIT ?
-        ''', (query, n_results))
-        result = self._cursor.fetchall()
-        
-        return result
+        return self.search_videos(query, None, n_results)["results"]
 
     @staticmethod
-    def print_search_results(result):
+    def print_search_results(result, total=None, next_page=None):
         """Print search results to the console.
 
         Formats and displays search results, showing a link to each matched video.
@@ -862,6 +3170,9 @@ class Archiver:
         Args:
             result (list[tuple]): List of tuples from search operation, each containing
                 (title, vid_id) that form a YouTube URL.
+            total (int | None): Number of matches of the search, printed first if given.
+            next_page (str | None): Cursor of the next page of results (see
+                search_videos), printed last if given.
 
         Returns:
             None
@@ -870,9 +3181,13 @@ class Archiver:
         if not result:
             print("No close matches found...")
         else:
+            if total is not None:
+                print(f"{total} match(es)")
             vid_dict = {row[0]: "https://www.youtube.com/watch?v=" + row[1] for row in result}
             for title, vid_id in vid_dict.items():
                 print(f"\n{title}: {vid_id}\n")
+            if next_page:
+                print(f"Next page: --after {next_page}")
 
         return
 
@@ -891,6 +3206,8 @@ class Archiver:
         Returns:
             None
         """
+        import pandas as pd
+
         META_COLS = ["p_id", "title", "created", "last_update", "etag"]
 
         # Export the playlist's metadata
@@ -914,7 +3231,13 @@ class Archiver:
         items_cols = ["playlist_items." + i[0] for i in self._cursor.fetchall()[1:]]
         self._cursor.execute('''SELECT name FROM pragma_table_info('videos')''')
         videos_cols = ["videos." + i[0] for i in self._cursor.fetchall()[1:]]
-        col_names = ', '.join(items_cols) + ', ' + ', '.join(videos_cols)
+        # Export displayed positions (row numbers) rather than sort keys
+        select_cols = [
+            "ROW_NUMBER() OVER (ORDER BY playlist_items.position) - 1"
+            if col == "playlist_items.position" else col
+            for col in items_cols
+        ]
+        col_names = ', '.join(select_cols) + ', ' + ', '.join(videos_cols)
 
         # Get the relevant playlist item and video data
         query = (
@@ -928,8 +3251,12 @@ class Archiver:
         )
         result = self._cursor.fetchall()
 
-        # Export the data
+        # Export the data, with video IDs in their string form
         playlist_df = pd.DataFrame(result, columns=(items_cols + videos_cols))
+        if self._integer_ids:
+            playlist_df["playlist_items.vid_id"] = playlist_df["playlist_items.vid_id"].map(
+                _decode_video_id
+            )
         playlist_df.to_csv(path, index=False)
         
         return
@@ -939,8 +3266,9 @@ class Archiver:
         """Import archived playlist data from CSV files into the SQLite database.
 
         Reads playlist metadata and video items from corresponding CSV files and inserts
-        them into the database tables. Prints a warning if the playlist already exists,
-        skipping insert to avoid duplicate key errors.
+        them into the database tables in one transaction, using the same bulk path as
+        archiving (see _store_playlist_rows). Rows that already exist are skipped and
+        counted.
 
         Args:
             file_name (str): Path to the CSV file containing video data. Corresponding
@@ -954,101 +3282,148 @@ class Archiver:
             successfully stored previously. Existing metadata will be protected from
             duplicate insert errors.
         """
+        import pandas as pd
+
         # Load playlist data and metadata from the relevant file
         try:
             meta_df = pd.read_csv(file_name + ".meta")
-            playlist_df = pd.read_csv(file_name)
+            playlist_df = pd.read_csv(file_name, dtype={"playlist_items.vid_id": str})
         except Exception as e:
-            print("Error when reading archive files: {e}")
+            print(f"Error when reading archive files: {e}")
             return
 
         # Store playlist metadata
         metadata = tuple(meta_df.values[0])
-        try:
+        playlist_id = metadata[0]
+        n_cols = len(PLAYLIST_ITEMS_COLS)
+        item_rows = []
+        video_rows = []
+        for row in playlist_df.itertuples():
+            (vid_id, position, added) = row[1:n_cols]
+            key = self._video_key(vid_id)
+            item_rows.append((playlist_id, key, int(position) * POSITION_GAP, added))
+            video_rows.append((key,) + row[n_cols:])
+
+        # Store the metadata and playlist data in one transaction
+        with self._write_lock:
+            self._tag_changes("import", playlist_id)
             self._cursor.execute('''
                 INSERT INTO playlist_data (p_id, title, created, last_update, etag)
-                VALUES (?, ?, ?, ?, ?)''',
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT DO NOTHING''',
                 metadata
             )
-        except sqlite3.IntegrityError as e:
-            print("Playlist metadata already stored. Skipping...")
-
-        # Store the playlist data
-        playlist_id = metadata[0]
-        for row in playlist_df.itertuples():
-            items_data = (playlist_id,) + row[1:len(PLAYLIST_ITEMS_COLS)]
-            videos_data = (items_data[1],) + row[len(PLAYLIST_ITEMS_COLS):]
-
-            # Storing playlist item data
-            try:
-                self._cursor.execute('''
-                    INSERT INTO playlist_items (p_id, vid_id, position, added)
-                    VALUES (?, ?, ?, ?)''',
-                    items_data
-                )
-            except sqlite3.IntegrityError as e:
-                print("Playlist item already exists. Skipping...")
-
-            # Storing video data
-            try:
-                self._cursor.execute('''
-                    INSERT INTO videos (vid_id, title, status)
-                    VALUES (?, ?, ?)''',
-                    videos_data
-                )
-            except sqlite3.IntegrityError as e:
-                print("Video already exists. Skipping...")
-
-        self._conn.commit()
+            if self._cursor.rowcount == 0:
+                print("Playlist metadata already stored. Skipping...")
+            counts = self._store_playlist_rows(item_rows, video_rows)
+            self._conn.commit()
+
+        print(
+            f"Imported {counts['items']} item(s) and {counts['videos']} new video(s), " +
+            f"{counts['skipped']} item(s) already stored"
+        )
 
         return
 
     def delete_playlist(self, playlist_id):
         """Remove a playlist and its associated data from the database.
 
-        This operation is not reversible. When called:
-        1. Deletes the playlist's metadata row from playlist_data table
-        2. Removes all items from playlist_items table for that playlist
-        3. Cleans up video records that were only referenced by this playlist,
-           preserving videos that appear in other playlists
+        This operation is not reversible. See delete_playlists.
 
         Args:
             playlist_id (str): The YouTube playlist ID to delete.
 
         Returns:
             None
+        """
+        self.delete_playlists([playlist_id])
 
-        Raises:
-            sqlite3.IntegrityError: If a referenced foreign key prevents deletion.
+        return
+
+    def delete_playlists(self, playlist_ids) -> dict:
+        """Remove playlists and their associated data from the database.
+
+        This operation is not reversible. In a single transaction:
+        1. Deletes each playlist's rows from playlist_data, playlist_state,
+           playlist_pages and archive_checkpoints
+        2. Removes all items of the playlists from playlist_items, recording the
+           removals in the change log under a 'delete' run per playlist
+        3. Cleans up video records that were only referenced by these playlists,
+           preserving videos that appear in other playlists
+
+        The change log is kept, so get_playlist_history shows the deletion and
+        get_playlist_as_of can still rebuild the playlist before it.
+
+        Orphan cleanup only looks at the videos of the deleted playlists (see
+        _delete_orphan_videos), so its cost follows the size of the deleted
+        playlists rather than of the archive.
+
+        Args:
+            playlist_ids (list[str]): The YouTube playlist IDs to delete.
+
+        Returns:
+            dict: {'playlists': int, 'items': int, 'videos': int}, the playlists,
+                playlist items and orphaned videos deleted.
         """
-        # Remove playlist metadata
-        self._cursor.execute(
-            '''DELETE FROM playlist_data WHERE p_id = ?''', 
-            (playlist_id,)
-        )
+        params = [(p_id,) for p_id in dict.fromkeys(playlist_ids)]
 
-        # Remove playlist
-        self._cursor.execute(
-            '''DELETE FROM playlist_items WHERE p_id = ?''', 
-            (playlist_id,)
-        )
+        with self._write_lock:
+            try:
+                # Remove playlist metadata
+                self._cursor.executemany(
+                    '''DELETE FROM playlist_data WHERE p_id = ?''',
+                    params
+                )
+                n_playlists = max(self._cursor.rowcount, 0)
+                self._cursor.executemany(
+                    '''DELETE FROM playlist_state WHERE p_id = ?''',
+                    params
+                )
+                self._cursor.executemany(
+                    '''DELETE FROM playlist_pages WHERE p_id = ?''',
+                    params
+                )
+                self._cursor.executemany(
+                    '''DELETE FROM archive_checkpoints WHERE p_id = ?''',
+                    params
+                )
 
-        # Remove video data from videos referenced only by the specified playlist
-        self._cursor.execute('''
-            DELETE FROM videos
-            WHERE vid_id IN (
-                SELECT v.vid_id
-                FROM videos v
-                LEFT JOIN playlist_items p
-                    ON v.vid_id = p.vid_id
-                WHERE p.vid_id IS NULL
-            )'''
+                # Remove playlists, collecting the videos that may be orphaned
+                candidates = set()
+                n_items = 0
+                for param in params:
+                    self._cursor.execute(
+                        '''SELECT vid_id FROM playlist_items WHERE p_id = ?''',
+                        param
+                    )
+                    vid_ids = [vid_id for (vid_id,) in self._cursor.fetchall()]
+                    if not vid_ids:
+                        continue
+                    candidates.update(vid_ids)
+                    self._tag_changes("delete", param[0])
+                    self._cursor.execute(
+                        '''DELETE FROM playlist_items WHERE p_id = ?''',
+                        param
+                    )
+                    n_items += max(self._cursor.rowcount, 0)
+
+                # Remove candidate videos no other playlist references
+                n_videos = self._delete_orphan_videos(candidates)
+
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+        print(
+            f"Deleted {n_playlists} playlist(s), {n_items} playlist item(s) " +
+            f"and {n_videos} video(s) not in any other playlist"
         )
+        if n_playlists < len(params):
+            print(f"{len(params) - n_playlists} playlist(s) were not found")
 
-        self._conn.commit()
+        return {"playlists": n_playlists, "items": n_items, "videos": n_videos}
 
-        return
-    
     def handle_query(self, query, params=None):
         """Execute an arbitrary SQL query and return results.
 
@@ -1076,84 +3451,640 @@ class Archiver:
         
         return self._cursor.fetchall()
 
+    def _video_key(self, vid_id):
+        """Return the database key of a YouTube video ID.
+
+        The key is the ID itself, or its integer encoding in a database whose video
+        IDs are stored as integers (see convert_video_ids).
+        """
+        return _encode_video_id(vid_id) if self._integer_ids else vid_id
+
+    def _video_id(self, key) -> str:
+        """Return the YouTube video ID of a database key (see _video_key)."""
+        return _decode_video_id(key) if self._integer_ids else key
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """The calling thread's database connection (see _ConnectionManager)."""
+        return self._db.connection()
+
+    @property
+    def _cursor(self) -> sqlite3.Cursor:
+        """The cursor of the calling thread's database connection."""
+        return self._db.cursor()
+
+    @property
+    def _write_lock(self) -> contextlib.AbstractContextManager:
+        """Serializes write transactions on the database across threads.
+
+        Leaving it invalidates cached search results (see _ConnectionManager.writing).
+        """
+        return self._db.writing()
+
+    def _connect(self, check_same_thread=True):
+        """Open a connection to the database with the PRAGMAs of the selected profile.
+
+        Journal mode is stored in the database file, so a profile that switches it
+        only takes effect once no other connection has the database open; the
+        current mode is kept (with a warning) until then.
+
+        Args:
+            check_same_thread (bool): False for connections handed to another thread.
+
+        Returns:
+            sqlite3.Connection: The configured connection.
+
+        Raises:
+            ValueError: If db_profile is not a key of DB_PROFILES.
+        """
+        if self.db_profile not in DB_PROFILES:
+            raise ValueError(
+                f"Unknown database profile: {self.db_profile} " +
+                f"(choose from {', '.join(DB_PROFILES)})"
+            )
+
+        conn = sqlite3.connect(
+            self.db_path, timeout=DB_TIMEOUT, check_same_thread=check_same_thread
+        )
+        for (pragma, value) in DB_PROFILES[self.db_profile].items():
+            try:
+                mode = conn.execute(f"PRAGMA {pragma} = {value}").fetchone()
+            except sqlite3.OperationalError as e:
+                print(f"Could not set {pragma} to {value}: {e}")
+                continue
+            if pragma == 'journal_mode' and mode[0].upper() != value:
+                print(f"Could not set journal_mode to {value}, database uses {mode[0]}")
+
+        return conn
+
     def _instantiate_db(self):
         """Create and/or connect to the SQLite database with schema.
 
-        Establishes connection to playlists.db, creates a cursor for query execution,
-        then defines all required tables:
+        Connects to the database file at db_path (playlists.db by default) with the
+        PRAGMAs of the db_profile (see DB_PROFILES), through the calling thread's
+        connection, then brings the schema up to date (see _migrate). The schema consists of these tables:
         - playlist_data: Stores playlist metadata (title, timestamps, etag)
-        - playlist_items: Stores individual video items per playlist
+        - playlist_state: Stores the playlist resource ETag and item count from the
+          last archive/update, used for batched change detection
+        - playlist_pages: Stores the ETag, page tokens and video IDs of every
+          playlist page, used for conditional re-sync requests
+        - archive_checkpoints: Stores the next page token and last stored position
+          of archives that have not finished yet, so they can be resumed
+        - quota_usage: Stores the quota units spent per day and API method
+        - playlist_items: Stores individual video items per playlist, ordered by a
+          gapped sort key in the position column (see POSITION_GAP)
         - videos: Stores unique video information across all playlists
         - videos_fts: FTS5 virtual table for efficient full-text search
+        - sync_runs, playlist_changes, video_status_changes: The change log of
+          playlist membership and video status (see _change_log_triggers)
 
         Also creates database triggers that automatically maintain the FTS5 index
-        whenever records are inserted, updated, or deleted in the videos table.
+        whenever records are inserted, updated, or deleted in the videos table, and
+        indexes on playlist_items by video and by playlist order.
 
         Returns:
             None
         """
-        self._conn = sqlite3.connect('playlists.db')
-        self._cursor = self._conn.cursor()
+        self._migrate()
 
-        # Create required tables if necessary
-        self._cursor.execute('''
-            CREATE TABLE IF NOT EXISTS playlist_data (
-                p_id VARCHAR(64) PRIMARY KEY,
-                title VARCHAR(256),
-                created INTEGER,
-                last_update INTEGER,
-                etag VARCHAR(32)
-            )
-        ''')
-        self._cursor.execute('''
-            CREATE TABLE IF NOT EXISTS playlist_items (
-                p_id VARCHAR(64),
-                vid_id VARCHAR(16),
-                position INTEGER,
-                added INTEGER,
-                PRIMARY KEY (p_id, vid_id)
-            )
-        ''')
-        self._cursor.execute('''
-            CREATE TABLE IF NOT EXISTS videos (
-                vid_id VARCHAR(16) PRIMARY KEY,
-                title VARCHAR(256),
-                status VARCHAR(16)
+        self._cursor.execute(
+            '''SELECT type FROM pragma_table_info('videos') WHERE name = ?''', ('vid_id',)
+        )
+        self._integer_ids = self._cursor.fetchone()[0].upper() == 'INTEGER'
+
+        self._cursor.execute('''SELECT name FROM sqlite_schema WHERE type = 'table' ''')
+        tables = {name for (name,) in self._cursor.fetchall()}
+        self._fts_indexes = tuple(
+            tokenizer for (tokenizer, (table, _, _)) in FTS_INDEXES.items() if table in tables
+        )
+
+    def _migrate(self):
+        """Bring the database schema up to date.
+
+        The schema is built by a list of migrations, each a list of DDL statements.
+        PRAGMA user_version holds the number of migrations applied to the database,
+        so only newer migrations run and a current database runs no DDL at all.
+        Each migration commits together with its version number. The first one
+        only uses IF NOT EXISTS, so databases created before versioning are
+        adopted as they are.
+
+        Migrations are append-only: never edit one that has been released. Those
+        that change videos or playlist_items must handle both video ID modes (see
+        _video_schema).
+
+        Returns:
+            None
+        """
+        migrations = [
+            # 1: Tables, the FTS5 index and the triggers that keep it in sync
+            [
+                '''
+                    CREATE TABLE IF NOT EXISTS playlist_data (
+                        p_id VARCHAR(64) PRIMARY KEY,
+                        title VARCHAR(256),
+                        created INTEGER,
+                        last_update INTEGER,
+                        etag VARCHAR(32)
+                    )
+                ''',
+                '''
+                    CREATE TABLE IF NOT EXISTS playlist_items (
+                        p_id VARCHAR(64),
+                        vid_id VARCHAR(16),
+                        position INTEGER,
+                        added INTEGER,
+                        PRIMARY KEY (p_id, vid_id)
+                    )
+                ''',
+                '''
+                    CREATE TABLE IF NOT EXISTS playlist_state (
+                        p_id VARCHAR(64) PRIMARY KEY,
+                        etag VARCHAR(32),
+                        item_count INTEGER,
+                        checked INTEGER
+                    )
+                ''',
+                '''
+                    CREATE TABLE IF NOT EXISTS playlist_pages (
+                        p_id VARCHAR(64),
+                        page_token VARCHAR(64),
+                        etag VARCHAR(32),
+                        next_page_token VARCHAR(64),
+                        PRIMARY KEY (p_id, page_token)
+                    )
+                ''',
+                '''
+                    CREATE TABLE IF NOT EXISTS archive_checkpoints (
+                        p_id VARCHAR(64) PRIMARY KEY,
+                        page_token VARCHAR(64),
+                        position INTEGER,
+                        etag VARCHAR(32),
+                        updated INTEGER
+                    )
+                ''',
+                '''
+                    CREATE TABLE IF NOT EXISTS quota_usage (
+                        day VARCHAR(10),
+                        method VARCHAR(64),
+                        units INTEGER,
+                        PRIMARY KEY (day, method)
+                    )
+                ''',
+                '''
+                    CREATE TABLE IF NOT EXISTS videos (
+                        vid_id VARCHAR(16) PRIMARY KEY,
+                        title VARCHAR(256),
+                        status VARCHAR(16)
+                    )
+                ''',
+
+                # Create FTS5 virtual table for full-text search
+                '''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+                        vid_id,
+                        title,
+                        content="videos",
+                        content_rowid="rowid",
+                        tokenize="trigram"
+                    )
+                ''',
+
+                # Create trigger to automatically sync FTS5 on INSERT
+                '''
+                    CREATE TRIGGER IF NOT EXISTS videos_ai AFTER INSERT ON videos BEGIN
+                        INSERT INTO videos_fts(rowid, vid_id, title)
+                        VALUES (NEW.rowid, NEW.vid_id, NEW.title);
+                    END;
+                ''',
+
+                # Create trigger to automatically sync FTS5 on UPDATE
+                '''
+                    CREATE TRIGGER IF NOT EXISTS videos_au AFTER UPDATE ON videos BEGIN
+                        INSERT INTO videos_fts(videos_fts, rowid, vid_id, title) VALUES('delete', OLD.rowid, OLD.vid_id, OLD.title);
+                        INSERT INTO videos_fts(rowid, vid_id, title) VALUES (NEW.rowid, NEW.vid_id, NEW.title);
+                    END;
+                ''',
+
+                # Create trigger to automatically sync FTS5 on DELETE
+                '''
+                    CREATE TRIGGER IF NOT EXISTS videos_ad AFTER DELETE ON videos BEGIN
+                        INSERT INTO videos_fts(videos_fts, rowid, vid_id, title) VALUES('delete', OLD.rowid, OLD.vid_id, OLD.title);
+                    END;
+                ''',
+            ],
+            # 2: Indexes for looking up playlist items by video (orphan cleanup,
+            # FTS joins) and for listing a playlist in order
+            [
+                '''
+                    CREATE INDEX IF NOT EXISTS playlist_items_vid_id
+                    ON playlist_items (vid_id, p_id)
+                ''',
+                '''
+                    CREATE INDEX IF NOT EXISTS playlist_items_position
+                    ON playlist_items (p_id, position, vid_id)
+                ''',
+            ],
+            # 3: Change log of playlist membership and video status. Triggers
+            # record every change with the run pointed to by current_run (see
+            # _tag_changes); the playlists stored so far form the baseline run
+            [
+                '''
+                    CREATE TABLE IF NOT EXISTS sync_runs (
+                        run_id INTEGER PRIMARY KEY,
+                        p_id VARCHAR(64),
+                        kind VARCHAR(16),
+                        started INTEGER
+                    )
+                ''',
+                '''CREATE INDEX IF NOT EXISTS sync_runs_p_id ON sync_runs (p_id, run_id)''',
+                '''
+                    CREATE TABLE IF NOT EXISTS current_run (
+                        id INTEGER PRIMARY KEY CHECK (id = 0),
+                        run_id INTEGER
+                    )
+                ''',
+                # vid_id has no declared type: it holds text or integer keys,
+                # like videos.vid_id (see convert_video_ids)
+                '''
+                    CREATE TABLE IF NOT EXISTS playlist_changes (
+                        change_id INTEGER PRIMARY KEY,
+                        run_id INTEGER,
+                        p_id VARCHAR(64),
+                        vid_id,
+                        change VARCHAR(8),
+                        position INTEGER
+                    )
+                ''',
+                '''
+                    CREATE INDEX IF NOT EXISTS playlist_changes_p_id
+                    ON playlist_changes (p_id, vid_id, run_id)
+                ''',
+                '''
+                    CREATE TABLE IF NOT EXISTS video_status_changes (
+                        change_id INTEGER PRIMARY KEY,
+                        run_id INTEGER,
+                        vid_id,
+                        old_status VARCHAR(16),
+                        status VARCHAR(16)
+                    )
+                ''',
+                '''
+                    CREATE INDEX IF NOT EXISTS video_status_changes_vid_id
+                    ON video_status_changes (vid_id, run_id)
+                ''',
+                '''
+                    INSERT INTO sync_runs (p_id, kind, started)
+                    VALUES (NULL, 'baseline', CAST(strftime('%s', 'now') AS INTEGER))
+                ''',
+                '''INSERT INTO current_run (id, run_id) VALUES (0, last_insert_rowid())''',
+                '''
+                    INSERT INTO playlist_changes (run_id, p_id, vid_id, change, position)
+                    SELECT (SELECT run_id FROM current_run), p_id, vid_id, 'add', position
+                    FROM playlist_items
+                ''',
+                *self._change_log_triggers(),
+            ],
+            # 4: Video IDs of every cached page, so the items of a page answered
+            # 304 Not Modified are known. Pages cached before have none and are
+            # fetched again in full by their next sync
+            [
+                '''ALTER TABLE playlist_pages ADD COLUMN video_ids TEXT''',
+            ],
+        ]
+
+        self._cursor.execute('''PRAGMA user_version''')
+        version = self._cursor.fetchone()[0]
+        if version > len(migrations):
+            print(
+                f"Database schema version {version} is newer than this program " +
+                f"supports ({len(migrations)}). Please update the program."
             )
-        ''')
-        
-        # Create FTS5 virtual table for full-text search
-        self._cursor.execute('''
-            CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
-                vid_id, 
-                title, 
-                content="videos",
-                content_rowid="rowid",
-                tokenize="trigram"
+            return
+        if version == len(migrations):
+            return
+
+        with self._write_lock:
+            # Another process may have migrated the database since it was read
+            self._cursor.execute('''BEGIN IMMEDIATE''')
+            self._cursor.execute('''PRAGMA user_version''')
+            version = self._cursor.fetchone()[0]
+            try:
+                for (number, statements) in enumerate(migrations[version:], version + 1):
+                    for statement in statements:
+                        self._cursor.execute(statement)
+                    self._cursor.execute(f'''PRAGMA user_version = {number}''')
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    @staticmethod
+    def _change_log_triggers() -> list[str]:
+        """Return the DDL of the triggers that write the change log.
+
+        Rows added to, removed from or moved within playlist_items are recorded in
+        playlist_changes, and status transitions of videos in video_status_changes,
+        tagged with the run in current_run (see _tag_changes). Bulk writes that
+        skip existing rows or leave them unchanged record nothing.
+
+        Returns:
+            list[str]: The statements, in execution order.
+        """
+        return [
+            '''
+                CREATE TRIGGER playlist_items_log_ai AFTER INSERT ON playlist_items BEGIN
+                    INSERT INTO playlist_changes (run_id, p_id, vid_id, change, position)
+                    VALUES ((SELECT run_id FROM current_run), NEW.p_id, NEW.vid_id, 'add', NEW.position);
+                END
+            ''',
+            '''
+                CREATE TRIGGER playlist_items_log_ad AFTER DELETE ON playlist_items BEGIN
+                    INSERT INTO playlist_changes (run_id, p_id, vid_id, change, position)
+                    VALUES ((SELECT run_id FROM current_run), OLD.p_id, OLD.vid_id, 'remove', NULL);
+                END
+            ''',
+            '''
+                CREATE TRIGGER playlist_items_log_au AFTER UPDATE OF position ON playlist_items
+                WHEN OLD.position IS NOT NEW.position BEGIN
+                    INSERT INTO playlist_changes (run_id, p_id, vid_id, change, position)
+                    VALUES ((SELECT run_id FROM current_run), NEW.p_id, NEW.vid_id, 'move', NEW.position);
+                END
+            ''',
+            '''
+                CREATE TRIGGER videos_log_au AFTER UPDATE OF status ON videos
+                WHEN OLD.status IS NOT NEW.status BEGIN
+                    INSERT INTO video_status_changes (run_id, vid_id, old_status, status)
+                    VALUES ((SELECT run_id FROM current_run), NEW.vid_id, OLD.status, NEW.status);
+                END
+            ''',
+        ]
+
+    @staticmethod
+    def _fts_schema(tokenizer, integer_ids) -> list[str]:
+        """Return the DDL of a full-text index of videos and the triggers that sync it.
+
+        Args:
+            tokenizer (str): A key of FTS_INDEXES.
+            integer_ids (bool): True for integer mode, where only titles are
+                indexed, since integer IDs are not searchable text.
+
+        Returns:
+            list[str]: The statements, in execution order.
+        """
+        (table, prefix, options) = FTS_INDEXES[tokenizer]
+        fts_columns = ['title'] if integer_ids else ['vid_id', 'title']
+
+        new_values = ', '.join('NEW.' + column for column in fts_columns)
+        old_values = ', '.join('OLD.' + column for column in fts_columns)
+        columns = ', '.join(fts_columns)
+
+        return [
+            f'''
+                CREATE VIRTUAL TABLE {table} USING fts5(
+                    {columns},
+                    content="videos",
+                    content_rowid="rowid",
+                    {options}
+                )
+            ''',
+            f'''
+                CREATE TRIGGER {prefix}_ai AFTER INSERT ON videos BEGIN
+                    INSERT INTO {table}(rowid, {columns}) VALUES (NEW.rowid, {new_values});
+                END
+            ''',
+            f'''
+                CREATE TRIGGER {prefix}_au AFTER UPDATE ON videos BEGIN
+                    INSERT INTO {table}({table}, rowid, {columns}) VALUES('delete', OLD.rowid, {old_values});
+                    INSERT INTO {table}(rowid, {columns}) VALUES (NEW.rowid, {new_values});
+                END
+            ''',
+            f'''
+                CREATE TRIGGER {prefix}_ad AFTER DELETE ON videos BEGIN
+                    INSERT INTO {table}({table}, rowid, {columns}) VALUES('delete', OLD.rowid, {old_values});
+                END
+            ''',
+        ]
+
+    def _drop_fts(self, tokenizer):
+        """Drop a full-text index of videos and its triggers. Does not commit."""
+        (table, prefix, _) = FTS_INDEXES[tokenizer]
+        for suffix in ('ai', 'au', 'ad'):
+            self._cursor.execute(f'''DROP TRIGGER IF EXISTS {prefix}_{suffix}''')
+        self._cursor.execute(f'''DROP TABLE IF EXISTS {table}''')
+
+    @staticmethod
+    def _video_schema(integer_ids, fts_indexes=('trigram',)) -> list[str]:
+        """Return the DDL of the tables, indexes and triggers keyed by video ID.
+
+        Text mode is the schema built by _migrate. Integer mode stores video IDs
+        as signed 64-bit integers (see _encode_video_id) and makes playlist_items
+        a WITHOUT ROWID table clustered on its primary key. videos keeps its own
+        sequential rowid rather than using the ID as one, since the FTS5 index
+        stores rowids delta-encoded and random 64-bit rowids would grow it by
+        half. The FTS5 indexes only cover titles, as integer IDs are not
+        searchable text.
+
+        Args:
+            integer_ids (bool): True for integer mode, False for text mode.
+            fts_indexes (tuple[str]): Keys of FTS_INDEXES to build (see _fts_schema).
+
+        Returns:
+            list[str]: The statements, in execution order.
+        """
+        if integer_ids:
+            (vid_type, vid_key, items_options) = ('INTEGER', 'NOT NULL UNIQUE', ' WITHOUT ROWID')
+        else:
+            (vid_type, vid_key, items_options) = ('VARCHAR(16)', 'PRIMARY KEY', '')
+
+        return [
+            f'''
+                CREATE TABLE videos (
+                    vid_id {vid_type} {vid_key},
+                    title VARCHAR(256),
+                    status VARCHAR(16)
+                )
+            ''',
+            f'''
+                CREATE TABLE playlist_items (
+                    p_id VARCHAR(64),
+                    vid_id {vid_type},
+                    position INTEGER,
+                    added INTEGER,
+                    PRIMARY KEY (p_id, vid_id)
+                ){items_options}
+            ''',
+            '''CREATE INDEX playlist_items_vid_id ON playlist_items (vid_id, p_id)''',
+            '''CREATE INDEX playlist_items_position ON playlist_items (p_id, position, vid_id)''',
+        ] + [
+            statement
+            for tokenizer in fts_indexes
+            for statement in Archiver._fts_schema(tokenizer, integer_ids)
+        ]
+
+    def convert_video_ids(self, encoding) -> bool:
+        """Convert the stored video IDs to integers, or back to text.
+
+        Integer keys take 8 bytes instead of an 11-character string in videos,
+        playlist_items and their indexes, and compare as integers in joins. Video
+        IDs are converted back to strings wherever they leave the database (API
+        requests, printed URLs, search results, exports), so the mode is invisible
+        outside of it. Playlist IDs are left as they are.
+
+        The videos and playlist_items tables are rebuilt with the schema of the
+        chosen mode (see _video_schema) in one transaction, the FTS indexes are
+        rebuilt by their triggers, the video IDs of the change log are converted in
+        place, and the database is vacuumed to reclaim the space.
+
+        Args:
+            encoding (str): 'integer' or 'text'.
+
+        Returns:
+            bool: True if the IDs were converted, False if nothing was done.
+
+        Raises:
+            ValueError: If the encoding is unknown.
+        """
+        if encoding not in ('integer', 'text'):
+            raise ValueError(f"Unknown video ID encoding: {encoding}")
+
+        integer_ids = encoding == 'integer'
+        if integer_ids == self._integer_ids:
+            print(f"Video IDs are already stored as {encoding}")
+            return False
+
+        # Integer keys can only hold canonical 11-character video IDs
+        if integer_ids:
+            self._cursor.execute('''
+                SELECT vid_id FROM videos UNION SELECT vid_id FROM playlist_items
+                UNION SELECT vid_id FROM playlist_changes
+                UNION SELECT vid_id FROM video_status_changes
+            ''')
+            invalid = []
+            for (vid_id,) in self._cursor.fetchall():
+                try:
+                    _encode_video_id(vid_id)
+                except (ValueError, TypeError):
+                    invalid.append(vid_id)
+            if invalid:
+                print(
+                    f"Cannot store {len(invalid)} video ID(s) as integers " +
+                    f"(e.g. {invalid[0]!r}). Nothing was converted."
+                )
+                return False
+
+        self._cursor.execute('''PRAGMA page_count''')
+        pages_before = self._cursor.fetchone()[0]
+
+        convert = _encode_video_id if integer_ids else _decode_video_id
+        self._conn.create_function("convert_video_id", 1, convert, deterministic=True)
+
+        with self._write_lock:
+            self._cursor.execute('''BEGIN IMMEDIATE''')
+            try:
+                # Drop the FTS indexes, the triggers and the indexes; the new schema
+                # and the change log triggers recreate them under the same names
+                for tokenizer in self._fts_indexes:
+                    self._drop_fts(tokenizer)
+                for name in (
+                    'videos_log_au',
+                    'playlist_items_log_ai', 'playlist_items_log_ad', 'playlist_items_log_au'
+                ):
+                    self._cursor.execute(f'''DROP TRIGGER {name}''')
+                for name in ('playlist_items_vid_id', 'playlist_items_position'):
+                    self._cursor.execute(f'''DROP INDEX {name}''')
+                self._cursor.execute('''ALTER TABLE videos RENAME TO videos_old''')
+                self._cursor.execute('''ALTER TABLE playlist_items RENAME TO playlist_items_old''')
+
+                for statement in self._video_schema(integer_ids, self._fts_indexes):
+                    self._cursor.execute(statement)
+
+                self._cursor.execute('''
+                    INSERT INTO videos (vid_id, title, status)
+                    SELECT convert_video_id(vid_id), title, status FROM videos_old
+                ''')
+                n_videos = self._cursor.rowcount
+                self._cursor.execute('''
+                    INSERT INTO playlist_items (p_id, vid_id, position, added)
+                    SELECT p_id, convert_video_id(vid_id), position, added
+                    FROM playlist_items_old
+                ''')
+                n_items = self._cursor.rowcount
+                self._cursor.execute(
+                    '''UPDATE playlist_changes SET vid_id = convert_video_id(vid_id)'''
+                )
+                self._cursor.execute(
+                    '''UPDATE video_status_changes SET vid_id = convert_video_id(vid_id)'''
+                )
+                # Created after copying, so that the copy is not logged as changes
+                for statement in self._change_log_triggers():
+                    self._cursor.execute(statement)
+                self._cursor.execute('''DROP TABLE videos_old''')
+                self._cursor.execute('''DROP TABLE playlist_items_old''')
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+            self._integer_ids = integer_ids
+            self._cursor.execute('''VACUUM''')
+
+        self._cursor.execute('''PRAGMA page_count''')
+        pages_after = self._cursor.fetchone()[0]
+        self._cursor.execute('''PRAGMA page_size''')
+        page_size = self._cursor.fetchone()[0]
+
+        print(
+            f"Converted {n_videos} video(s) and {n_items} playlist item(s) to {encoding} IDs. " +
+            f"Database size: {pages_before * page_size / 2**20:.1f} MiB -> " +
+            f"{pages_after * page_size / 2**20:.1f} MiB"
+        )
+
+        return True
+
+    def rebuild_fts(self, tokenizers) -> bool:
+        """Build the full-text indexes of video titles with the given tokenizers.
+
+        Indexes of other tokenizers are dropped, and those requested are built
+        anew from the videos table, in one transaction. The database is then
+        vacuumed to reclaim the space of dropped indexes. Searches use whichever
+        indexes exist (see _fts_query).
+
+        Args:
+            tokenizers (list[str]): Keys of FTS_INDEXES, e.g. ['trigram', 'unicode61'].
+
+        Returns:
+            bool: True if the indexes were rebuilt.
+
+        Raises:
+            ValueError: If no tokenizer or an unknown one is given.
+        """
+        tokenizers = tuple(dict.fromkeys(tokenizers))
+        unknown = [tokenizer for tokenizer in tokenizers if tokenizer not in FTS_INDEXES]
+        if unknown or not tokenizers:
+            raise ValueError(
+                f"Unknown FTS tokenizer(s): {', '.join(unknown) or 'none given'} " +
+                f"(choose from {', '.join(FTS_INDEXES)})"
             )
-        ''')
-        
-        # Create trigger to automatically sync FTS5 on INSERT
-        self._cursor.execute('''
-            CREATE TRIGGER IF NOT EXISTS videos_ai AFTER INSERT ON videos BEGIN
-                INSERT INTO videos_fts(rowid, vid_id, title) 
-                VALUES (NEW.rowid, NEW.vid_id, NEW.title);
-            END;
-        ''')
-        
-        # Create trigger to automatically sync FTS5 on UPDATE
-        self._cursor.execute('''
-            CREATE TRIGGER IF NOT EXISTS videos_au AFTER UPDATE ON videos BEGIN
-                INSERT INTO videos_fts(videos_fts, rowid, vid_id, title) VALUES('delete', OLD.rowid, OLD.vid_id, OLD.title);
-                INSERT INTO videos_fts(rowid, vid_id, title) VALUES (NEW.rowid, NEW.vid_id, NEW.title);
-            END;
-        ''')
-        
-        # Create trigger to automatically sync FTS5 on DELETE
-        self._cursor.execute('''
-            CREATE TRIGGER IF NOT EXISTS videos_ad AFTER DELETE ON videos BEGIN
-                INSERT INTO videos_fts(videos_fts, rowid, vid_id, title) VALUES('delete', OLD.rowid, OLD.vid_id, OLD.title);
-            END;
-        ''')
+        tokenizers = tuple(tokenizer for tokenizer in FTS_INDEXES if tokenizer in tokenizers)
+
+        with self._write_lock:
+            self._cursor.execute('''BEGIN IMMEDIATE''')
+            try:
+                for tokenizer in FTS_INDEXES:
+                    self._drop_fts(tokenizer)
+                for tokenizer in tokenizers:
+                    for statement in self._fts_schema(tokenizer, self._integer_ids):
+                        self._cursor.execute(statement)
+                    table = FTS_INDEXES[tokenizer][0]
+                    self._cursor.execute(f'''INSERT INTO {table}({table}) VALUES ('rebuild')''')
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+            self._fts_indexes = tokenizers
+            self._cursor.execute('''VACUUM''')
+
+        print(f"Rebuilt full-text index(es): {', '.join(tokenizers)}")
 
-        self._conn.commit()
\ No newline at end of file
+        return True
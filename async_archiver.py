@@ -0,0 +1,418 @@
+"""
+YouTube Playlist Archiver - Async Engine
+
+An optional asyncio engine for the YouTube Data API v3. Requests are sent from a
+single thread through a pooled httpx.AsyncClient, so hundreds of page fetches can
+be in flight at once without a thread (and an httplib2 connection) per request.
+OAuth credentials, quota and transfer accounting, the cassette set with
+Archiver.use_cassette and the database write path are shared with
+archiver.Archiver. Requests are sent in the same form as googleapiclient's, so
+a cassette recorded by either engine can be replayed by both.
+
+Usage:
+    import asyncio
+    from async_archiver import AsyncArchiver
+
+    async def main():
+        async with AsyncArchiver(concurrency=100) as engine:
+            return await engine.archive_playlists(["PLxxx", "PLyyy"])
+
+    results = asyncio.run(main())
+
+Requires httpx (poetry install --extras async, or pip install httpx).
+"""
+
+import asyncio
+import random
+import httplib2
+
+try:
+    import httpx
+except ImportError:
+    raise ImportError(
+        "The async engine requires httpx. Please install it with: " +
+        "poetry install --extras async (or pip install httpx)"
+    ) from None
+
+from google.auth.transport.requests import Request
+from googleapiclient.errors import HttpError
+
+import archiver
+from archiver import QuotaBudgetExceeded
+
+API_BASE_URL = f"https://www.googleapis.com/{archiver.API_SERVICE_NAME}/{archiver.API_VERSION}/"
+
+# Default number of API requests in flight at once
+DEFAULT_CONCURRENCY = 50
+
+# Responses retried with exponential backoff and jitter, like googleapiclient does
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """httpx transport that sends requests through a cassette (see cassette.Cassette).
+
+    A recording cassette sends each request live and stores the exchange, a
+    replaying one answers from its recording. The cassette's HTTP objects block,
+    so every request runs in a worker thread with its own HTTP object.
+    """
+
+    def __init__(self, cassette, timeout=60):
+        self.cassette = cassette
+        self.timeout = timeout
+
+    async def handle_async_request(self, request):
+        http = self.cassette.http(timeout=self.timeout)
+        (resp, content) = await asyncio.to_thread(
+            http.request,
+            str(request.url),
+            request.method,
+            headers={k.decode(): v.decode() for (k, v) in request.headers.raw}
+        )
+        # The body is already decoded; only its type and caching headers apply
+        headers = {
+            k: v for (k, v) in resp.items()
+            if k not in ("status", "content-encoding", "content-length", "transfer-encoding")
+        }
+        return httpx.Response(resp.status, headers=headers, content=content)
+
+
+class AsyncYouTubeClient:
+    """Asynchronous YouTube Data API client on a pooled HTTP connection.
+
+    Implements the list methods the archiver uses. Every request is charged to the
+    given quota tracker before it is sent and retried on 5xx/429 responses and
+    connection errors. Failures raise googleapiclient's HttpError, so callers can
+    handle them exactly like errors from the synchronous service.
+    """
+
+    def __init__(self, credentials, concurrency=DEFAULT_CONCURRENCY, quota=None, transfer=None,
+                 cassette=None):
+        """Initialize the client.
+
+        Args:
+            credentials (Credentials): OAuth 2.0 credentials, refreshed when expired.
+            concurrency (int): Maximum number of requests in flight at once.
+            quota (archiver._QuotaTracker, optional): Tracker charged for every request.
+            transfer (archiver._TransferCounter, optional): Counter of response bytes.
+            cassette (cassette.Cassette, optional): Cassette that records or replays
+                the requests (see CassetteTransport).
+        """
+        self._credentials = credentials
+        self._quota = quota
+        self._transfer = transfer
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._refresh_lock = asyncio.Lock()
+        self._client = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            timeout=60,
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency
+            ),
+            transport=CassetteTransport(cassette) if cassette else None
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the pooled connections."""
+        await self._client.aclose()
+
+    async def _authorization(self, force_refresh=False) -> str:
+        """Return the Authorization header value, refreshing the token if needed."""
+        async with self._refresh_lock:
+            if force_refresh or not self._credentials.valid:
+                await asyncio.to_thread(self._credentials.refresh, Request())
+
+        return f"Bearer {self._credentials.token}"
+
+    async def _list(self, resource, **params) -> dict:
+        """Send a list request for an API resource and return the decoded response.
+
+        Args:
+            resource (str): API resource name, e.g. 'playlistItems'.
+            **params: Query parameters; None values are omitted.
+
+        Returns:
+            dict: The decoded API response.
+
+        Raises:
+            HttpError: If the request fails permanently or retries run out.
+            QuotaBudgetExceeded: If the request would exceed the daily quota budget.
+        """
+        # googleapiclient always asks for JSON; sending the same makes cassettes match
+        params = {k: v for k, v in params.items() if v is not None}
+        params["alt"] = "json"
+        refreshed = False
+        response = None
+
+        for retry_num in range(archiver.API_RETRIES + 1):
+            if retry_num > 0:
+                await asyncio.sleep(random.random() * 2**retry_num)
+
+            if self._quota:
+                self._quota.charge(f"{resource}.list")
+            headers = {"Authorization": await self._authorization()}
+
+            async with self._semaphore:
+                try:
+                    response = await self._client.get(resource, params=params, headers=headers)
+                except httpx.TransportError:
+                    if retry_num == archiver.API_RETRIES:
+                        raise
+                    continue
+
+            if self._transfer:
+                self._transfer.add(len(response.content))
+
+            # An access token can expire while requests are queued; refresh once
+            if response.status_code == 401 and not refreshed:
+                await self._authorization(force_refresh=True)
+                refreshed = True
+                continue
+            if response.status_code not in RETRY_STATUSES:
+                break
+
+        if response.status_code >= 300:
+            raise HttpError(
+                httplib2.Response({"status": response.status_code}),
+                response.content,
+                uri=str(response.url)
+            )
+
+        return response.json()
+
+    async def playlist_items_list(self, **params) -> dict:
+        """Asynchronous playlistItems.list (same parameters as the API method)."""
+        return await self._list("playlistItems", **params)
+
+    async def playlists_list(self, **params) -> dict:
+        """Asynchronous playlists.list (same parameters as the API method)."""
+        return await self._list("playlists", **params)
+
+    async def videos_list(self, **params) -> dict:
+        """Asynchronous videos.list (same parameters as the API method)."""
+        return await self._list("videos", **params)
+
+
+class AsyncArchiver:
+    """Asyncio facade that archives many playlists concurrently from one thread.
+
+    Page requests of all playlists run concurrently on the event loop, limited to
+    `concurrency` requests in flight. Pages of a single playlist are still fetched
+    in order, since each page token comes from the previous page. Each playlist is
+    written through the Archiver once all of its pages have arrived, in a single
+    transaction on the event loop thread.
+
+    Example:
+        >>> async with AsyncArchiver(concurrency=200) as engine:
+        ...     results = await engine.archive_playlists(playlist_ids)
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, arch=None):
+        """Initialize the facade.
+
+        Args:
+            concurrency (int): Maximum number of API requests in flight at once.
+            arch (archiver.Archiver, optional): Archiver used for credentials, quota
+                accounting and database writes. Defaults to the singleton.
+        """
+        self.concurrency = concurrency
+        self._arch = arch or archiver.Archiver()
+        self._client = None
+
+    async def __aenter__(self):
+        credentials = await asyncio.to_thread(self._arch._get_credentials)
+        self._arch._load_quota_usage()
+        self._client = AsyncYouTubeClient(
+            credentials,
+            self.concurrency,
+            quota=self._arch._quota,
+            transfer=self._arch._transfer,
+            cassette=self._arch._cassette
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._arch.record_quota_usage()
+
+    async def get_playlist_summary(self, playlist_id) -> tuple[str, int]:
+        """Return the ETag and item count of a playlist (see Archiver._get_playlist_summary)."""
+        response = await self._client.playlist_items_list(
+            part="contentDetails",
+            playlistId=playlist_id,
+            maxResults=0,
+            fields=archiver.ETAG_FIELDS
+        )
+
+        return (response["etag"], response["pageInfo"]["totalResults"])
+
+    async def get_playlist_pages(self, playlist_id) -> list[dict]:
+        """Fetch every page of a playlist.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            list[dict]: Every playlistItems.list() response, in order.
+        """
+        pages = []
+        token = None
+
+        while True:
+            response = await self._client.playlist_items_list(
+                part="snippet,contentDetails,status",
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=token,
+                fields=archiver.PAGE_ARCHIVE_FIELDS
+            )
+            pages.append(response)
+
+            token = response.get("nextPageToken")
+            if not token:
+                return pages
+
+    async def get_playlist_resources(self, playlist_ids) -> dict:
+        """Fetch playlist resources, 50 IDs per request with all batches concurrent.
+
+        Args:
+            playlist_ids (list[str]): The YouTube playlist IDs.
+
+        Returns:
+            dict: Maps each playlist ID found to its playlist resource.
+        """
+        batches = [playlist_ids[i:i + 50] for i in range(0, len(playlist_ids), 50)]
+        responses = await asyncio.gather(*(
+            self._client.playlists_list(
+                part="snippet,contentDetails",
+                id=",".join(batch),
+                maxResults=50,
+                fields=archiver.PLAYLIST_RESOURCE_FIELDS
+            )
+            for batch in batches
+        ))
+
+        return {item["id"]: item for response in responses for item in response["items"]}
+
+    async def get_video_statuses(self, video_ids) -> dict:
+        """Fetch the privacy status of videos, 50 IDs per request with all batches concurrent.
+
+        Args:
+            video_ids (list[str]): YouTube video IDs.
+
+        Returns:
+            dict: Maps each video ID found to its privacyStatus. Deleted videos are absent.
+        """
+        batches = [video_ids[i:i + 50] for i in range(0, len(video_ids), 50)]
+        responses = await asyncio.gather(*(
+            self._client.videos_list(
+                part="status",
+                id=",".join(batch),
+                maxResults=50,
+                fields=archiver.VIDEO_STATUS_FIELDS
+            )
+            for batch in batches
+        ))
+
+        return {
+            item["id"]: item["status"]["privacyStatus"]
+            for response in responses for item in response["items"]
+        }
+
+    async def archive_playlist(self, playlist_id) -> dict:
+        """Fetch and store a new playlist.
+
+        A playlist that is already archived is skipped, which is not a failure;
+        archive_playlists_from_file updates those with the Archiver instead.
+
+        Args:
+            playlist_id (str): The YouTube playlist ID.
+
+        Returns:
+            dict: Result summary with keys 'p_id', 'action', 'success' and 'error',
+                as returned by Archiver.retrieve_items_from_playlists.
+        """
+        result = {"p_id": playlist_id, "action": "archive", "success": False, "error": None}
+
+        if self._arch.handle_query(
+            '''SELECT 1 FROM playlist_data WHERE p_id = ?''', (playlist_id,)
+        ):
+            result["action"] = "skip"
+            result["success"] = True
+            return result
+
+        try:
+            (etag, n_items) = await self.get_playlist_summary(playlist_id)
+            self._arch._quota.check(
+                self._arch._archive_cost(n_items) - archiver.QUOTA_COSTS['playlistItems.list']
+            )
+            (pages, resources) = await asyncio.gather(
+                self.get_playlist_pages(playlist_id),
+                self.get_playlist_resources([playlist_id])
+            )
+            self._arch._store_fetched_playlist(playlist_id, etag, pages, resources[playlist_id])
+            result["success"] = True
+        except HttpError as e:
+            result["error"] = f"YouTube API error ({e.status_code}): {e.reason}"
+        except QuotaBudgetExceeded as e:
+            result["error"] = f"deferred, quota budget exceeded ({e})"
+        except Exception as e:
+            result["error"] = str(e)
+
+        return result
+
+    async def archive_playlists(self, playlist_ids) -> list[dict]:
+        """Archive many new playlists concurrently.
+
+        Args:
+            playlist_ids (list[str]): The YouTube playlist IDs.
+
+        Returns:
+            list[dict]: One result summary per playlist, in the given order.
+        """
+        return list(await asyncio.gather(*(self.archive_playlist(p_id) for p_id in playlist_ids)))
+
+
+def archive_playlists_from_file(path, concurrency=DEFAULT_CONCURRENCY, arch=None) -> list[dict]:
+    """Archive the playlists listed in a file, updating those already archived.
+
+    New playlists are archived concurrently with the async engine. Playlists that
+    are already archived are then updated one at a time by the Archiver (see
+    Archiver.update_playlist), as Archiver.retrieve_items_from_playlists does.
+
+    Args:
+        path (str): Path to file containing one playlist ID per line.
+        concurrency (int): Maximum number of API requests in flight at once.
+        arch (archiver.Archiver, optional): Archiver of the target database.
+            Defaults to the singleton.
+
+    Returns:
+        list[dict]: One result summary per playlist, in file order.
+    """
+    arch = arch or archiver.Archiver()
+    playlist_ids = [p_id for p_id in arch._get_playlist_ids(path) if p_id]
+    archived = [
+        p_id for p_id in dict.fromkeys(playlist_ids)
+        if arch.handle_query('''SELECT 1 FROM playlist_data WHERE p_id = ?''', (p_id,))
+    ]
+    new = [p_id for p_id in playlist_ids if p_id not in archived]
+
+    async def run():
+        async with AsyncArchiver(concurrency, arch) as engine:
+            return await engine.archive_playlists(new)
+
+    results = dict(zip(new, asyncio.run(run()) if new else []))
+    try:
+        for p_id in archived:
+            results[p_id] = arch._process_playlist(p_id)
+    finally:
+        arch.record_quota_usage()
+
+    return [results[p_id] for p_id in playlist_ids]
@@ -0,0 +1,1708 @@
+#!/usr/bin/env python
+"""
+YouTube Playlist Archiver - Benchmarks
+
+Performance checks that run without network access or credentials.
+
+startup
+    Runs each local CLI command in a fresh interpreter with `python -X importtime`
+    against a small scratch database. Reports the median wall time and import
+    time of each command. Fails when a command imports a module it should not
+    load (e.g. PySide6 for --list) or when its import time exceeds the budget.
+
+reconcile
+    Reconciles a large stored playlist (10,000 items by default) with remote
+    item lists that differ by a small edit, as update_playlist does, and reports
+    the rows written per edit. Fails when an edit writes more rows than it must.
+
+write
+    Stores a large playlist (100,000 items by default) page by page through the
+    same bulk path as archive_playlist and import_playlist, then stores it again
+    to measure how fast duplicates are skipped. Fails when new rows are written
+    slower than the target rate.
+
+profiles
+    Archives a playlist under each SQLite connection profile (see DB_PROFILES in
+    archiver.py) while reader threads search the same database, and reports the
+    archive rate, search rate and longest search. Fails when a search errors,
+    e.g. with "database is locked".
+
+plans
+    Runs local operations (listing, searching, reconciling, exporting, deleting)
+    against a scratch database, captures the SQL they execute and runs it through
+    EXPLAIN QUERY PLAN. Fails when a statement scans a table or sorts without an
+    index where it should not.
+
+ids
+    Archives several playlists that share videos, then compares the size of
+    playlist_items and of the database, and the time of playlist listings and
+    in-playlist searches, before and after converting video IDs to integers.
+
+delete
+    Deletes 50-item playlists from a large archive (500,000 playlist items by
+    default) and checks that only the videos no other playlist references are
+    removed. Fails when the median deletion goes over its budget.
+
+history
+    Syncs a large playlist (10,000 items by default) many times with small
+    edits, then reports the size of the change log and rebuilds the playlist as
+    of every sync with get_playlist_as_of. Fails when a rebuilt playlist is wrong
+    or a rebuild goes over its budget.
+
+fts
+    Stores many videos with varied titles, then rebuilds the full-text index
+    with each tokenizer (trigram, unicode61, both) and reports the index size
+    and the p50/p99 latency of short, word and substring queries. Fails when a
+    query errors.
+
+search
+    Stores many videos and playlists of several sizes, then times in-playlist
+    searches as search_in_playlist_fts runs them (through a temporary index of
+    the playlist's videos when the playlist is small) and always filtering the
+    index of every video. Fails when the two find different videos.
+
+cache
+    Runs the same searches in several playlists twice, as the GUI does when the
+    user switches between them, and reports the time of searches that fill the
+    search cache and of searches answered by it. Fails when a write does not
+    invalidate a cached search or the median cached search goes over its budget.
+
+pages
+    Walks every page of a large playlist and of a search with their cursors,
+    then times the first, middle and last pages against the same pages read
+    with LIMIT/OFFSET. Fails when a walk does not return every video once, in
+    order.
+
+replay
+    Archives a playlist served by a simulated API, interrupted by a failed
+    request and resumed, then updates it, while recording the traffic to a
+    cassette; then replays the cassette into a fresh database. Fails when a
+    stored playlist differs from the remote one, the checkpoint or the resumed
+    counts are wrong, or the requests, bytes or quota units of the replay differ
+    from the recording.
+
+Usage:
+    ./benchmark.py startup
+    ./benchmark.py startup --runs 10 --budget 100
+    ./benchmark.py reconcile --items 20000
+    ./benchmark.py write --rows 200000
+    ./benchmark.py profiles --rows 20000 --readers 4
+    ./benchmark.py plans
+    ./benchmark.py ids --playlists 50 --items 5000
+    ./benchmark.py delete --rows 2000000
+    ./benchmark.py history --items 10000 --syncs 500
+    ./benchmark.py fts --videos 200000
+    ./benchmark.py search --videos 1000000
+    ./benchmark.py cache --videos 100000 --playlists 20
+    ./benchmark.py pages --items 200000 --page-size 100
+    ./benchmark.py replay --items 1000
+
+Exits with status 1 when a check fails, so it can guard against regressions.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from urllib.parse import urlparse, parse_qsl
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yt-pa.py")
+
+# Default budget for the cumulative import time of a command, in milliseconds
+STARTUP_BUDGET_MS = 100
+
+# Heavy dependencies and the only commands allowed to load them
+HEAVY_MODULES = {
+    "pandas": {"export", "import"},
+    "PySide6": {"gui"},
+    "google.oauth2": set(),
+    "googleapiclient.discovery": set(),
+    "google_auth_oauthlib": set(),
+    "httplib2": set(),
+}
+
+# Local commands and their CLI arguments, run in this order (delete runs last)
+STARTUP_COMMANDS = {
+    "help": ["--help"],
+    "list": ["--list"],
+    "open": ["--open", "PLbenchmark"],
+    "history": ["--history", "PLbenchmark"],
+    "search": ["--search", "benchmark"],
+    "search-playlist": ["--search", "PLbenchmark", "benchmark"],
+    "export": ["--export", "PLbenchmark"],
+    "import": ["--import", "Benchmark.csv"],
+    "delete": ["--delete", "PLbenchmark"],
+}
+
+# Maximum rows _reconcile_playlist may write per edit, independent of the
+# playlist size. An added video writes a playlist_items row and a videos row.
+RECONCILE_BOUNDS = {
+    "unchanged": 0,
+    "append 1": 2,
+    "insert 1 at top": 2,
+    "delete 1 in middle": 1,
+    "move 1": 1,
+    "retitle 1": 1,
+}
+
+# Minimum rows per second for writing new playlist items in bulk, set below the
+# 10000-15000 rows/s measured on local disk: the trigram index trigger on videos
+# takes about three quarters of the write time
+WRITE_TARGET_ROWS_PER_S = 8000
+
+# Maximum median time to delete a 50-item playlist from a large archive, in ms
+DELETE_BUDGET_MS = 20
+
+# Maximum time to rebuild a past version of a playlist from the change log, in ms
+HISTORY_BUDGET_MS = 1000
+
+# Queries of the FTS benchmark: short terms (1-2 characters), whole and prefix
+# words, and substrings inside words
+FTS_QUERIES = {
+    "short": ["a", "tv", "4k", "ep 2"],
+    "words": ["live concert", "guitar less", "remix", "official video"],
+    "substrings": ["cert", "uitar", "fficia", "emix"],
+}
+
+# Words the titles of the FTS benchmark are drawn from
+FTS_WORDS = [
+    "official", "video", "live", "concert", "guitar", "lesson", "remix", "cover",
+    "tv", "4k", "ep", "part", "a", "how", "to", "review", "music", "trailer",
+    "interview", "documentary", "tutorial", "podcast", "highlights", "stream",
+]
+
+# Maximum median time of a search answered by the search cache, in ms
+CACHE_HIT_BUDGET_MS = 0.1
+
+# Search paged through by the pages benchmark (about 1 in 20 titles match)
+PAGES_QUERY = "documentary tutorial"
+
+# Playlist served by the simulated API of the replay benchmark
+REPLAY_PLAYLIST = "PLreplay"
+
+# Playlist sizes of the in-playlist search benchmark
+SEARCH_PLAYLIST_SIZES = (50, 200, 1000, 5000, 20000)
+
+# Search terms the readers of the profile benchmark cycle through
+SEARCH_TERMS = ["video 1", "PLseed", "video 4242", "benchmark"]
+
+# Local operations checked by benchmark_plans, and the query plan steps each may
+# contain. Listing all playlists reads every row; searches keep the best page of
+# matches by (rank, rowid), which FTS5 cannot return in order; in-playlist searches
+# count the archive's videos up to a limit to pick their index; a playlist rebuilt
+# from the change log is sorted by position after the latest change of each video
+# is found; deleting a playlist tags its run in current_run, which has one row.
+PLAN_CHECKS = {
+    "list playlists": {"SCAN playlist_data"},
+    "open playlist": set(),
+    "playlist page": set(),
+    "search playlist": {"SCAN videos", "USE TEMP B-TREE FOR ORDER BY"},
+    "search small playlist": {"SCAN videos", "USE TEMP B-TREE FOR ORDER BY"},
+    "search all": {"USE TEMP B-TREE FOR ORDER BY"},
+    "search page": {"SCAN videos", "USE TEMP B-TREE FOR ORDER BY"},
+    "reconcile": set(),
+    "export": set(),
+    "playlist as of": {"USE TEMP B-TREE FOR ORDER BY"},
+    "delete playlist": {"SCAN current_run"},
+}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _seed_database(directory, n_videos=500):
+    """Create a scratch playlists.db with one playlist of n_videos videos."""
+    subprocess.run(
+        [sys.executable, CLI, "--list"], cwd=directory, capture_output=True, check=True
+    )
+    conn = sqlite3.connect(os.path.join(directory, "playlists.db"))
+    now = int(time.time())
+    conn.execute(
+        '''INSERT OR REPLACE INTO playlist_data VALUES (?, ?, ?, ?, ?)''',
+        ("PLbenchmark", "Benchmark", now, now, "etag")
+    )
+    conn.executemany(
+        '''INSERT OR REPLACE INTO videos VALUES (?, ?, ?)''',
+        [(f"vid{i:08d}", f"Benchmark video {i}", "public") for i in range(n_videos)]
+    )
+    conn.executemany(
+        '''INSERT OR REPLACE INTO playlist_items VALUES (?, ?, ?, ?)''',
+        [("PLbenchmark", f"vid{i:08d}", i, now) for i in range(n_videos)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _run_command(directory, args) -> tuple[float, float, set]:
+    """Run the CLI once with -X importtime.
+
+    Returns:
+        tuple: (wall time in ms, cumulative import time in ms, imported module names)
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", CLI, *args],
+        cwd=directory,
+        capture_output=True,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    import_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        # Top-level imports (least indented) add up to the total import time;
+        # site runs before the program (including any .pth hooks) and is skipped
+        if len(match.group(3)) == 1 and match.group(4) != "site":
+            import_us += int(match.group(2))
+
+    return (wall_ms, import_us / 1000, modules)
+
+
+def benchmark_startup(runs=5, budget_ms=STARTUP_BUDGET_MS) -> bool:
+    """Measure the cold start of each local command.
+
+    Args:
+        runs (int): Runs per command; the median is reported.
+        budget_ms (float): Maximum cumulative import time per command.
+
+    Returns:
+        bool: True if every command stays within its module and time budgets.
+    """
+    ok = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'command':<16} {'wall (ms)':>10} {'imports (ms)':>13}  result")
+        for (name, args) in STARTUP_COMMANDS.items():
+            if name == "delete":
+                runs_for_command = 1
+            else:
+                runs_for_command = runs
+                _seed_database(directory)
+
+            samples = [_run_command(directory, args) for _ in range(runs_for_command)]
+            wall_ms = statistics.median(s[0] for s in samples)
+            import_ms = statistics.median(s[1] for s in samples)
+            modules = set().union(*(s[2] for s in samples))
+
+            problems = [
+                f"imports {module}"
+                for (module, allowed) in HEAVY_MODULES.items()
+                if name not in allowed and (
+                    module in modules or any(m.startswith(module + ".") for m in modules)
+                )
+            ]
+            # Commands that need a heavy module are only checked for stray imports
+            exempt = any(name in allowed for allowed in HEAVY_MODULES.values())
+            if import_ms > budget_ms and not exempt:
+                problems.append(f"import time over {budget_ms} ms budget")
+
+            ok = ok and not problems
+            result = ", ".join(problems) if problems else "ok"
+            print(f"{name:<16} {wall_ms:>10.1f} {import_ms:>13.1f}  {result}")
+
+    return ok
+
+
+def _remote_item(title):
+    """Return a minimal API playlist item as _reconcile_playlist reads it."""
+    return {"snippet": {"title": title}, "status": {"privacyStatus": "public"}}
+
+
+def _edit_playlist(videos, edit) -> list:
+    """Return a copy of a (vid_id, title) list with a small edit applied."""
+    videos = list(videos)
+    middle = len(videos) // 2
+
+    if edit == "append 1":
+        videos.append(("vidappend01", "Appended video"))
+    elif edit == "insert 1 at top":
+        videos.insert(0, ("vidinsert01", "Inserted video"))
+    elif edit == "delete 1 in middle":
+        del videos[middle]
+    elif edit == "move 1":
+        videos.insert(len(videos) - 10, videos.pop(10))
+    elif edit == "retitle 1":
+        videos[middle] = (videos[middle][0], "Retitled video")
+
+    return videos
+
+
+def benchmark_reconcile(n_items=10000) -> bool:
+    """Measure the rows written when reconciling a large playlist after small edits.
+
+    Every edit starts from the same stored playlist; each reconciliation is rolled
+    back afterwards. 'total changes' also counts rows written by triggers (the
+    FTS index), i.e. the full write cost of the edit.
+
+    Args:
+        n_items (int): Number of items in the stored playlist.
+
+    Returns:
+        bool: True if no edit writes more rows than RECONCILE_BOUNDS allows.
+    """
+    ok = True
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+
+            videos = [(f"vid{i:08d}", f"Benchmark video {i}") for i in range(n_items)]
+            arch._cursor.execute(
+                '''INSERT INTO playlist_data VALUES ('PLbenchmark', 'Benchmark', 0, 0, '')'''
+            )
+            arch._reconcile_playlist(
+                "PLbenchmark", [(vid_id, _remote_item(title)) for (vid_id, title) in videos]
+            )
+            arch._conn.commit()
+
+            print(f"Playlist of {n_items} items")
+            print(
+                f"{'edit':<20} {'added':>6} {'removed':>8} {'moved':>6} {'writes':>7} "
+                f"{'total changes':>14} {'ms':>8}  result"
+            )
+            for (edit, bound) in RECONCILE_BOUNDS.items():
+                remote = [
+                    (vid_id, _remote_item(title))
+                    for (vid_id, title) in _edit_playlist(videos, edit)
+                ]
+
+                changes = arch._conn.total_changes
+                start = time.perf_counter()
+                diff = arch._reconcile_playlist("PLbenchmark", remote)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                changes = arch._conn.total_changes - changes
+                arch._conn.rollback()
+
+                passed = diff["writes"] <= bound
+                ok = ok and passed
+                result = "ok" if passed else f"over bound of {bound}"
+                print(
+                    f"{edit:<20} {diff['inserted']:>6} {diff['deleted']:>8} {diff['moved']:>6} "
+                    f"{diff['writes']:>7} {changes:>14} {elapsed_ms:>8.1f}  {result}"
+                )
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    return ok
+
+
+def _playlist_page(playlist_id, start, size=50) -> dict:
+    """Return a playlistItems.list() page as _archive_playlist_response reads it."""
+    return {"items": [
+        {
+            "snippet": {"title": f"{playlist_id} video {i}", "position": i},
+            "contentDetails": {"videoId": f"{playlist_id}{i:08d}"},
+            "status": {"privacyStatus": "public"},
+        }
+        for i in range(start, start + size)
+    ]}
+
+
+def benchmark_write(n_rows=100000, target=WRITE_TARGET_ROWS_PER_S) -> bool:
+    """Measure the bulk write path used when archiving and importing playlists.
+
+    Writes n_rows playlist items (and as many new videos) in 50-item pages, one
+    transaction per page as get_entire_playlist does, then writes the same pages
+    again to measure how fast already stored rows are skipped. Pages are built
+    before timing starts, so only the database writes are measured.
+
+    Args:
+        n_rows (int): Number of playlist items to write.
+        target (float): Minimum rows per second for new rows.
+
+    Returns:
+        bool: True if new rows are written at target rows/second or faster.
+    """
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+
+            pages = [_playlist_page("PLbenchmark", start) for start in range(0, n_rows, 50)]
+
+            print(f"{'pass':<10} {'rows':>8} {'stored':>8} {'skipped':>8} {'s':>7} {'rows/s':>10}")
+            for name in ("new", "duplicate"):
+                stored = {"items": 0, "videos": 0, "skipped": 0}
+                start = time.perf_counter()
+                for page in pages:
+                    counts = arch._archive_playlist_response("PLbenchmark", page)
+                    arch._conn.commit()
+                    for key in stored:
+                        stored[key] += counts[key]
+                elapsed = time.perf_counter() - start
+
+                rate = n_rows / elapsed
+                if name == "new":
+                    new_rate = rate
+                print(
+                    f"{name:<10} {n_rows:>8} {stored['items']:>8} {stored['skipped']:>8} "
+                    f"{elapsed:>7.2f} {rate:>10.0f}"
+                )
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    passed = new_rate >= target
+    print("ok" if passed else f"below target of {target:.0f} rows/s")
+    return passed
+
+
+def benchmark_profiles(n_rows=20000, readers=4) -> bool:
+    """Compare archive and search throughput under each database profile.
+
+    For every profile in archiver.DB_PROFILES, a scratch database is seeded with
+    n_rows videos. Then n_rows new playlist items are archived page by page (one
+    commit per page) while reader threads search through the same Archiver, each
+    on its own connection (see archiver._ConnectionManager), until the archive
+    finishes.
+
+    Args:
+        n_rows (int): Videos seeded and playlist items archived per profile.
+        readers (int): Number of concurrent reader threads.
+
+    Returns:
+        bool: True if no search failed under any profile (e.g. database is locked).
+    """
+    ok = True
+    cwd = os.getcwd()
+
+    import archiver
+
+    print(f"{n_rows} rows archived with {readers} concurrent readers")
+    print(
+        f"{'profile':<10} {'archive rows/s':>15} {'searches/s':>11} "
+        f"{'max search ms':>14} {'errors':>7}"
+    )
+    for profile in archiver.DB_PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                arch = archiver.Archiver(db_profile=profile)
+                # Time the full-text index, not the search cache
+                arch.search_cache_size = 0
+
+                for start in range(0, n_rows, 50):
+                    arch._archive_playlist_response("PLseed", _playlist_page("PLseed", start))
+                arch._conn.commit()
+                pages = [_playlist_page("PLbenchmark", start) for start in range(0, n_rows, 50)]
+
+                stop = threading.Event()
+                searches = []
+                errors = []
+
+                def read():
+                    latencies = []
+                    while not stop.is_set():
+                        term = SEARCH_TERMS[len(latencies) % len(SEARCH_TERMS)]
+                        start = time.perf_counter()
+                        try:
+                            arch.search_all_videos_fts(term)
+                        except sqlite3.OperationalError as e:
+                            errors.append(str(e))
+                        latencies.append(time.perf_counter() - start)
+                    searches.append(latencies)
+
+                threads = [threading.Thread(target=read) for _ in range(readers)]
+                for thread in threads:
+                    thread.start()
+
+                start = time.perf_counter()
+                for page in pages:
+                    arch._archive_playlist_response("PLbenchmark", page)
+                    arch._conn.commit()
+                elapsed = time.perf_counter() - start
+
+                stop.set()
+                for thread in threads:
+                    thread.join()
+                arch.close()
+
+                latencies = [latency for reader in searches for latency in reader]
+                ok = ok and not errors
+                print(
+                    f"{profile:<10} {n_rows / elapsed:>15.0f} {len(latencies) / elapsed:>11.0f} "
+                    f"{max(latencies, default=0) * 1000:>14.1f} {len(errors):>7}"
+                )
+            finally:
+                os.chdir(cwd)
+
+    return ok
+
+
+def _exercise(arch, operation):
+    """Run one local operation of PLAN_CHECKS against the seeded database."""
+    if operation == "list playlists":
+        arch.print_all_playlists()
+    elif operation == "open playlist":
+        arch.print_videos_from_playlist("PLbenchmark")
+    elif operation == "playlist page":
+        for order in ("ASC", "DESC"):
+            page = arch.get_playlist_page("PLbenchmark", 100, order=order, count=True)
+            arch.get_playlist_page("PLbenchmark", 100, page["next"], order)
+    elif operation == "search playlist":
+        arch.search_in_playlist_fts("PLbenchmark", "video 1")
+    elif operation == "search small playlist":
+        arch.search_in_playlist_fts("PLother", "video 1")
+    elif operation == "search all":
+        arch.search_all_videos_fts("video 1")
+    elif operation == "search page":
+        page = arch.search_videos("video 1", page_size=10, count=True)
+        arch.search_videos("video 1", page_size=10, after=page["next"])
+        page = arch.search_videos("video 1", "PLbenchmark", page_size=10, count=True)
+        arch.search_videos("video 1", "PLbenchmark", page_size=10, after=page["next"])
+    elif operation == "reconcile":
+        arch._reconcile_playlist("PLbenchmark", [
+            (item["contentDetails"]["videoId"], item)
+            for start in range(0, 1000, 50)
+            for item in _playlist_page("PLbenchmark", start)["items"]
+        ])
+        arch._conn.rollback()
+    elif operation == "export":
+        arch.export_playlist("PLbenchmark")
+    elif operation == "playlist as of":
+        arch.get_playlist_as_of("PLbenchmark", time.time())
+    elif operation == "delete playlist":
+        arch.delete_playlist("PLother")
+
+
+def _plan_problems(steps, allowed) -> list:
+    """Return the query plan steps that scan, sort or build a transient index and are not allowed."""
+    problems = []
+    for step in steps:
+        full_scan = (
+            step.startswith("SCAN ")
+            and "VIRTUAL TABLE" not in step
+            and not step.startswith("SCAN (")
+        )
+        unindexed = step.startswith("USE TEMP B-TREE") or "AUTOMATIC" in step
+        if (full_scan or unindexed) and \
+                not any(step.startswith(a) for a in allowed):
+            problems.append(step)
+    return problems
+
+
+def benchmark_plans() -> bool:
+    """Check the query plans of local operations for full scans and unindexed sorts.
+
+    Each operation in PLAN_CHECKS runs against a scratch database with a trace
+    callback on the connection. Every statement it executes is then run through
+    EXPLAIN QUERY PLAN, so the check follows the SQL the archiver actually sends.
+
+    Returns:
+        bool: True if no plan contains a step its operation does not allow.
+    """
+    ok = True
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+
+            arch._cursor.execute(
+                '''INSERT INTO playlist_data VALUES ('PLbenchmark', 'Benchmark', 0, 0, '')'''
+            )
+            arch._cursor.execute(
+                '''INSERT INTO playlist_data VALUES ('PLother', 'Other', 0, 0, '')'''
+            )
+            for start in range(0, 1000, 50):
+                arch._archive_playlist_response("PLbenchmark", _playlist_page("PLbenchmark", start))
+            for start in range(0, 100, 50):
+                arch._archive_playlist_response("PLother", _playlist_page("PLother", start))
+            # Enough videos for PLother to be searched through its own index
+            for start in range(0, 5000, 50):
+                arch._archive_playlist_response("PLfiller", _playlist_page("PLfiller", start))
+            arch._conn.commit()
+
+            for (operation, allowed) in PLAN_CHECKS.items():
+                statements = []
+                arch._conn.set_trace_callback(statements.append)
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        _exercise(arch, operation)
+                finally:
+                    arch._conn.set_trace_callback(None)
+
+                problems = []
+                for sql in dict.fromkeys(statements):
+                    if sql.split()[0].upper() not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+                        continue
+                    # The archiver's own connection also sees its temporary tables
+                    steps = [row[3] for row in arch._conn.execute("EXPLAIN QUERY PLAN " + sql)]
+                    problems.extend(_plan_problems(steps, allowed))
+
+                ok = ok and not problems
+                result = ", ".join(dict.fromkeys(problems)) if problems else "ok"
+                print(f"{operation:<21} {result}")
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    return ok
+
+
+def _video_ids(n_videos, seed=0) -> list:
+    """Return n_videos random, canonical YouTube video IDs."""
+    import archiver
+    rng = random.Random(seed)
+    return [archiver._decode_video_id(rng.getrandbits(64) - 2**63) for _ in range(n_videos)]
+
+
+def benchmark_ids(n_playlists=20, n_items=5000, n_videos=20000) -> bool:
+    """Compare database size and join speed with text and integer video IDs.
+
+    Archives n_playlists playlists of n_items videos each, drawn from a pool of
+    n_videos, then measures the size of the playlist_items table and indexes and
+    of the whole database, the time to list every playlist with its videos (the
+    GUI's join) and the time of in-playlist searches. The database is then
+    converted with Archiver.convert_video_ids and measured again.
+
+    Returns:
+        bool: True if the integer IDs make the database smaller.
+    """
+    cwd = os.getcwd()
+    listing = '''
+        SELECT v.title, v.status, pi.position, pi.vid_id, pi.added
+        FROM videos v
+        JOIN playlist_items pi ON v.vid_id = pi.vid_id
+        WHERE pi.p_id = ?
+        ORDER BY pi.position ASC
+    '''
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+
+            rng = random.Random(0)
+            videos = _video_ids(n_videos)
+            # Playlist IDs are usually "PL" and 32 characters
+            playlists = [f"PL{rng.getrandbits(128):032X}" for _ in range(n_playlists)]
+            for p_id in playlists:
+                arch._cursor.execute(
+                    '''INSERT INTO playlist_data VALUES (?, 'Benchmark', 0, 0, '')''', (p_id,)
+                )
+                chosen = rng.sample(videos, n_items)
+                for start in range(0, n_items, 50):
+                    arch._archive_playlist_response(p_id, {"items": [
+                        {
+                            "snippet": {"title": f"Video number {rng.randrange(10**6)}",
+                                        "position": start + i},
+                            "contentDetails": {"videoId": vid_id},
+                            "status": {"privacyStatus": "public"},
+                        }
+                        for (i, vid_id) in enumerate(chosen[start:start + 50])
+                    ]})
+            arch._conn.commit()
+            arch._cursor.execute('''VACUUM''')
+
+            print(f"{n_playlists} playlists of {n_items} items, {n_videos} videos")
+            print(
+                f"{'video IDs':<10} {'items+indexes (MiB)':>20} {'database (MiB)':>15} "
+                f"{'listing (ms)':>13} {'search (ms)':>12}"
+            )
+            sizes = {}
+            for encoding in ("text", "integer"):
+                if encoding == "integer":
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        arch.convert_video_ids("integer")
+
+                (page_count,) = arch._conn.execute('''PRAGMA page_count''').fetchone()
+                (page_size,) = arch._conn.execute('''PRAGMA page_size''').fetchone()
+                (items_size,) = arch._conn.execute(
+                    '''SELECT SUM(pgsize) FROM dbstat WHERE name IN (
+                        SELECT name FROM sqlite_schema WHERE tbl_name = 'playlist_items'
+                    )'''
+                ).fetchone()
+                sizes[encoding] = page_count * page_size
+
+                start = time.perf_counter()
+                for p_id in playlists:
+                    [arch._video_id(row[3]) for row in arch.handle_query(listing, (p_id,))]
+                listing_ms = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                for p_id in playlists:
+                    arch.search_in_playlist_fts(p_id, '"number 12"')
+                search_ms = (time.perf_counter() - start) * 1000
+
+                print(
+                    f"{encoding:<10} {items_size / 2**20:>20.1f} {sizes[encoding] / 2**20:>15.1f} "
+                    f"{listing_ms:>13.1f} {search_ms:>12.1f}"
+                )
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    return sizes["integer"] < sizes["text"]
+
+
+def benchmark_delete(n_rows=500000, n_deletes=5, budget=DELETE_BUDGET_MS) -> bool:
+    """Time deleting 50-item playlists from a large archive.
+
+    Stores n_rows playlist items in 50-item playlists, one video per item, plus
+    n_deletes target playlists whose videos are half their own and half shared
+    with another playlist. Each target is then deleted with delete_playlist, which
+    must remove its 25 own videos and keep the shared ones.
+
+    Args:
+        n_rows (int): Number of playlist items in the archive.
+        n_deletes (int): Number of playlists deleted and timed.
+        budget (float): Maximum median time of a deletion in milliseconds.
+
+    Returns:
+        bool: True if orphans were cleaned up correctly and the median deletion
+            took at most budget milliseconds.
+    """
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+
+            for n in range(n_rows // 50):
+                p_id = f"PL{n:08d}"
+                arch._archive_playlist_response(p_id, _playlist_page(p_id, 0))
+            shared = _playlist_page("PL00000000", 0)["items"][:25]
+            targets = [f"PLtarget{n}" for n in range(n_deletes)]
+            for p_id in targets:
+                arch._cursor.execute(
+                    '''INSERT INTO playlist_data VALUES (?, 'Benchmark', 0, 0, '')''', (p_id,)
+                )
+                page = _playlist_page(p_id, 0)
+                page["items"][25:] = shared
+                arch._archive_playlist_response(p_id, page)
+            arch._conn.commit()
+            print(f"{n_rows} playlist items, {n_deletes} playlists of 50 items deleted")
+
+            ok = True
+            times = []
+            for p_id in targets:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    arch.delete_playlist(p_id)
+                times.append((time.perf_counter() - start) * 1000)
+
+                own = [f"{p_id}{i:08d}" for i in range(25)]
+                (remaining,) = arch._conn.execute(
+                    '''SELECT COUNT(*) FROM videos WHERE vid_id IN (%s)''' % ", ".join("?" * 25),
+                    own
+                ).fetchone()
+                ok = ok and remaining == 0
+            (kept,) = arch._conn.execute(
+                '''SELECT COUNT(*) FROM videos WHERE vid_id IN (%s)''' % ", ".join("?" * 25),
+                [item["contentDetails"]["videoId"] for item in shared]
+            ).fetchone()
+            ok = ok and kept == 25
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    median = statistics.median(times)
+    print(f"median {median:.1f} ms, max {max(times):.1f} ms")
+    if not ok:
+        print("orphaned videos were not cleaned up correctly")
+    elif median > budget:
+        print(f"over budget of {budget:.0f} ms")
+    return ok and median <= budget
+
+
+def benchmark_history(n_items=10000, n_syncs=200, budget=HISTORY_BUDGET_MS) -> bool:
+    """Measure the size of the change log and the time to rebuild past playlists.
+
+    Stores a playlist of n_items items, then syncs it n_syncs times through
+    _reconcile_playlist, one run an hour apart, each adding, removing, moving or
+    changing the status of a video. The change log is compared with the rows a
+    full snapshot per sync would take, and the playlist is rebuilt with
+    get_playlist_as_of at every run and compared with the expected contents.
+
+    Args:
+        n_items (int): Number of items in the playlist.
+        n_syncs (int): Number of syncs after the initial archive.
+        budget (float): Maximum time to rebuild the playlist in milliseconds.
+
+    Returns:
+        bool: True if every rebuilt playlist is correct and none took longer than
+            budget milliseconds.
+    """
+    cwd = os.getcwd()
+    rng = random.Random(0)
+    start_time = 1_000_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+
+            videos = [[f"vid{i:08d}", "public"] for i in range(n_items)]
+            snapshots = []
+            for sync in range(n_syncs + 1):
+                if sync:
+                    edit = sync % 4
+                    if edit == 0:
+                        videos.insert(rng.randrange(len(videos)), [f"new{sync:08d}", "public"])
+                    elif edit == 1:
+                        del videos[rng.randrange(len(videos))]
+                    elif edit == 2:
+                        videos.insert(rng.randrange(len(videos)), videos.pop(rng.randrange(len(videos))))
+                    else:
+                        video = rng.choice(videos)
+                        video[1] = "private" if video[1] == "public" else "public"
+                with arch._write_lock:
+                    run_id = arch._tag_changes("benchmark", "PLbenchmark")
+                    arch._reconcile_playlist("PLbenchmark", [
+                        (vid_id, {"snippet": {"title": vid_id}, "status": {"privacyStatus": status}})
+                        for (vid_id, status) in videos
+                    ])
+                    arch._cursor.execute(
+                        '''UPDATE sync_runs SET started = ? WHERE run_id = ?''',
+                        (start_time + sync * 3600, run_id)
+                    )
+                    arch._conn.commit()
+                snapshots.append([(vid_id, vid_id, status) for (vid_id, status) in videos])
+
+            (log_rows,) = arch._conn.execute(
+                '''SELECT (SELECT COUNT(*) FROM playlist_changes)
+                    + (SELECT COUNT(*) FROM video_status_changes)'''
+            ).fetchone()
+            (log_size,) = arch._conn.execute(
+                '''SELECT SUM(pgsize) FROM dbstat WHERE name IN (
+                    SELECT name FROM sqlite_schema
+                    WHERE tbl_name IN ('playlist_changes', 'video_status_changes')
+                )'''
+            ).fetchone()
+            print(f"Playlist of {n_items} items, {n_syncs} syncs")
+            print(
+                f"change log: {log_rows} rows, {log_size / 2**20:.1f} MiB "
+                f"(snapshots: {sum(len(s) for s in snapshots)} rows)"
+            )
+
+            ok = True
+            times = []
+            for (sync, expected) in enumerate(snapshots):
+                start = time.perf_counter()
+                rebuilt = arch.get_playlist_as_of("PLbenchmark", start_time + sync * 3600 + 1800)
+                times.append((time.perf_counter() - start) * 1000)
+                ok = ok and rebuilt == expected
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    times.sort()
+    print(
+        f"as of: p50 {statistics.median(times):.1f} ms, "
+        f"p99 {times[int(len(times) * 0.99)]:.1f} ms, max {times[-1]:.1f} ms"
+    )
+    if not ok:
+        print("a rebuilt playlist did not match")
+    elif times[-1] > budget:
+        print(f"over budget of {budget:.0f} ms")
+    return ok and times[-1] <= budget
+
+
+def benchmark_fts(n_videos=100000, n_rounds=5) -> bool:
+    """Compare the size and query latency of the full-text index tokenizers.
+
+    Stores n_videos videos with titles drawn from FTS_WORDS, then rebuilds the
+    index with each tokenizer choice (see FTS_INDEXES in archiver.py) and reports
+    its size and the p50/p99 latency of the FTS_QUERIES mix, run n_rounds times
+    through search_all_videos_fts.
+
+    Args:
+        n_videos (int): Number of videos in the database.
+        n_rounds (int): Number of times each query is run.
+
+    Returns:
+        bool: True if every query ran without an error.
+    """
+    cwd = os.getcwd()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+            # Time the full-text index, not the search cache
+            arch.search_cache_size = 0
+
+            videos = _video_ids(n_videos)
+            for start in range(0, n_videos, 50):
+                arch._archive_playlist_response("PLbenchmark", {"items": [
+                    {
+                        "snippet": {"title": " ".join(rng.choices(FTS_WORDS, k=6)),
+                                    "position": start + i},
+                        "contentDetails": {"videoId": vid_id},
+                        "status": {"privacyStatus": "public"},
+                    }
+                    for (i, vid_id) in enumerate(videos[start:start + 50])
+                ]})
+            arch._conn.commit()
+
+            print(f"{n_videos} videos, {n_rounds} rounds of {sum(map(len, FTS_QUERIES.values()))} queries")
+            print(
+                f"{'index':<10} {'size (MiB)':>11} " +
+                " ".join(f"{kind + ' p50/p99 (ms)':>25}" for kind in FTS_QUERIES)
+            )
+            ok = True
+            for choice in ("trigram", "unicode61", "both"):
+                tokenizers = list(archiver.FTS_INDEXES) if choice == "both" else [choice]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    arch.rebuild_fts(tokenizers)
+                tables = [archiver.FTS_INDEXES[tokenizer][0] for tokenizer in tokenizers]
+                (size,) = arch._conn.execute(
+                    '''SELECT SUM(pgsize) FROM dbstat WHERE %s''' %
+                    " OR ".join("name LIKE ? || '%'" for _ in tables),
+                    tables
+                ).fetchone()
+
+                latencies = []
+                for queries in FTS_QUERIES.values():
+                    times = []
+                    for _ in range(n_rounds):
+                        for query in queries:
+                            start = time.perf_counter()
+                            try:
+                                arch.search_all_videos_fts(query)
+                            except sqlite3.Error as e:
+                                print(f"{choice}: {query!r} failed: {e}")
+                                ok = False
+                            times.append((time.perf_counter() - start) * 1000)
+                    times.sort()
+                    latencies.append(
+                        f"{statistics.median(times):.2f} / {times[int(len(times) * 0.99)]:.2f}"
+                    )
+                print(f"{choice:<10} {size / 2**20:>11.1f} " + " ".join(f"{l:>25}" for l in latencies))
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    return ok
+
+
+def benchmark_search(n_videos=500000, sizes=SEARCH_PLAYLIST_SIZES, n_rounds=3) -> bool:
+    """Compare in-playlist search latency with and without a per-playlist index.
+
+    Stores n_videos videos with titles drawn from FTS_WORDS and one playlist of
+    each size in sizes, then runs the word and substring queries of FTS_QUERIES
+    n_rounds times in each playlist, once as search_in_playlist_fts chooses (see
+    PLAYLIST_INDEX_RATIO in archiver.py) and once always filtering the index of
+    every video by playlist.
+
+    Args:
+        n_videos (int): Number of videos in the database.
+        sizes (tuple[int]): Number of items of each playlist.
+        n_rounds (int): Number of times each query is run.
+
+    Returns:
+        bool: True if both ways found the same videos for every query.
+    """
+    cwd = os.getcwd()
+    rng = random.Random(0)
+    queries = FTS_QUERIES["words"] + FTS_QUERIES["substrings"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+            # Time the full-text index, not the search cache
+            arch.search_cache_size = 0
+
+            videos = _video_ids(n_videos)
+            titles = {}
+            playlists = {"PLbenchmark": videos}
+            playlists.update({f"PL{size:08d}": rng.sample(videos, size) for size in sizes})
+            for (p_id, members) in playlists.items():
+                for start in range(0, len(members), 50):
+                    arch._archive_playlist_response(p_id, {"items": [
+                        {
+                            "snippet": {
+                                "title": titles.setdefault(vid_id, " ".join(rng.choices(FTS_WORDS, k=6))),
+                                "position": start + i
+                            },
+                            "contentDetails": {"videoId": vid_id},
+                            "status": {"privacyStatus": "public"},
+                        }
+                        for (i, vid_id) in enumerate(members[start:start + 50])
+                    ]})
+            arch._conn.commit()
+
+            print(f"{n_videos} videos, {n_rounds} rounds of {len(queries)} queries per playlist")
+            print(f"{'items':>6} {'index':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'filtered p50 (ms)':>18}")
+            ok = True
+            ratio = archiver.PLAYLIST_INDEX_RATIO
+            for size in sizes:
+                p_id = f"PL{size:08d}"
+                times = {"chosen": [], "filtered": []}
+                for _ in range(n_rounds):
+                    for query in queries:
+                        found = {}
+                        for (way, way_ratio) in (("chosen", ratio), ("filtered", n_videos)):
+                            archiver.PLAYLIST_INDEX_RATIO = way_ratio
+                            start = time.perf_counter()
+                            found[way] = {row[1] for row in arch.search_in_playlist_fts(p_id, query, size)}
+                            times[way].append((time.perf_counter() - start) * 1000)
+                        ok = ok and found["chosen"] == found["filtered"]
+                archiver.PLAYLIST_INDEX_RATIO = ratio
+
+                index = "playlist" if size * ratio < n_videos else "all"
+                chosen = sorted(times["chosen"])
+                print(
+                    f"{size:>6} {index:>9} {statistics.median(chosen):>9.1f} "
+                    f"{chosen[int(len(chosen) * 0.99)]:>9.1f} "
+                    f"{statistics.median(times['filtered']):>18.1f}"
+                )
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    if not ok:
+        print("searches with and without the playlist index found different videos")
+    return ok
+
+
+def benchmark_cache(n_videos=100000, n_playlists=10, budget=CACHE_HIT_BUDGET_MS) -> bool:
+    """Time repeated searches answered by the search cache.
+
+    Stores n_videos videos in n_playlists playlists, then runs the word and
+    substring queries of FTS_QUERIES in every playlist and across all of them,
+    twice, as the GUI does when the user switches between playlists. The first
+    pass fills the cache and the second is answered from it. A video is then
+    retitled to match a cached query, which must find it.
+
+    Args:
+        n_videos (int): Number of videos in the database.
+        n_playlists (int): Number of playlists the videos are spread over.
+        budget (float): Maximum median time of a cached search in milliseconds.
+
+    Returns:
+        bool: True if the write invalidated the cache and the median cached
+            search took at most budget milliseconds.
+    """
+    cwd = os.getcwd()
+    rng = random.Random(0)
+    queries = FTS_QUERIES["words"] + FTS_QUERIES["substrings"]
+    playlists = [f"PL{n:08d}" for n in range(n_playlists)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+
+            videos = _video_ids(n_videos)
+            for start in range(0, n_videos, 50):
+                arch._archive_playlist_response(playlists[start // 50 % n_playlists], {"items": [
+                    {
+                        "snippet": {"title": " ".join(rng.choices(FTS_WORDS, k=6)),
+                                    "position": start + i},
+                        "contentDetails": {"videoId": vid_id},
+                        "status": {"privacyStatus": "public"},
+                    }
+                    for (i, vid_id) in enumerate(videos[start:start + 50])
+                ]})
+            arch._conn.commit()
+
+            times = {"miss": [], "hit": []}
+            for kind in ("miss", "hit"):
+                for p_id in playlists + [None]:
+                    for query in queries:
+                        start = time.perf_counter()
+                        if p_id:
+                            arch.search_in_playlist_fts(p_id, query)
+                        else:
+                            arch.search_all_videos_fts(query)
+                        times[kind].append((time.perf_counter() - start) * 1000)
+
+            arch.search_all_videos_fts("zebra")
+            with arch._write_lock:
+                arch._cursor.execute(
+                    '''UPDATE videos SET title = 'zebra' WHERE vid_id = ?''', (videos[0],)
+                )
+                arch._conn.commit()
+            invalidated = [row[1] for row in arch.search_all_videos_fts("zebra")] == [videos[0]]
+            stats = arch.search_cache_stats()
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{n_videos} videos, {len(times['hit'])} searches in {n_playlists} playlists and across all")
+    for (kind, kind_times) in times.items():
+        kind_times.sort()
+        print(
+            f"{kind:<5} p50 {statistics.median(kind_times):.3f} ms, "
+            f"p99 {kind_times[int(len(kind_times) * 0.99)]:.3f} ms, max {kind_times[-1]:.3f} ms"
+        )
+    print(f"cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+    if not invalidated:
+        print("a cached search was not invalidated by a write")
+    elif statistics.median(times["hit"]) > budget:
+        print(f"over budget of {budget:.2f} ms")
+    return invalidated and statistics.median(times["hit"]) <= budget
+
+
+def benchmark_pages(n_items=100000, page_size=50) -> bool:
+    """Time the first, middle and last pages of a large playlist and of a search.
+
+    Stores a playlist of n_items videos with titles drawn from FTS_WORDS, then
+    walks every page of the playlist (get_playlist_page) and of the matches of
+    PAGES_QUERY (search_videos) with their cursors. The first, middle and last
+    pages are then timed again, and compared with the same pages read with
+    LIMIT/OFFSET.
+
+    Args:
+        n_items (int): Number of items in the playlist.
+        page_size (int): Number of videos or results on a page.
+
+    Returns:
+        bool: True if both walks returned every video once, in order.
+    """
+    cwd = os.getcwd()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            arch = archiver.Archiver()
+            # Time the queries, not the search cache
+            arch.search_cache_size = 0
+
+            videos = _video_ids(n_items)
+            for start in range(0, n_items, 50):
+                arch._archive_playlist_response("PLbenchmark", {"items": [
+                    {
+                        "snippet": {"title": " ".join(rng.choices(FTS_WORDS, k=6)),
+                                    "position": start + i},
+                        "contentDetails": {"videoId": vid_id},
+                        "status": {"privacyStatus": "public"},
+                    }
+                    for (i, vid_id) in enumerate(videos[start:start + 50])
+                ]})
+            arch._conn.commit()
+
+            walks = {
+                "playlist": lambda after: arch.get_playlist_page("PLbenchmark", page_size, after),
+                "search": lambda after: arch.search_videos(PAGES_QUERY, None, page_size, after),
+            }
+            offset_queries = {
+                "playlist": ('''
+                    SELECT pi.vid_id FROM playlist_items AS pi
+                    INNER JOIN videos AS v ON v.vid_id = pi.vid_id
+                    WHERE pi.p_id = 'PLbenchmark'
+                    ORDER BY pi.position, pi.vid_id
+                    LIMIT ? OFFSET ?
+                ''', ()),
+                "search": ('''
+                    SELECT vids.vid_id FROM videos_fts AS v
+                    INNER JOIN videos AS vids ON vids.rowid = v.rowid
+                    WHERE v.videos_fts MATCH ?
+                    ORDER BY v.rank, v.rowid
+                    LIMIT ? OFFSET ?
+                ''', (PAGES_QUERY,)),
+            }
+            full = {
+                "playlist": [vid_id for (vid_id,) in arch.handle_query(offset_queries["playlist"][0], (-1, 0))],
+                "search": [
+                    vid_id for (vid_id,) in arch.handle_query(offset_queries["search"][0], (PAGES_QUERY, -1, 0))
+                ],
+            }
+
+            print(f"Playlist of {n_items} items, pages of {page_size}, search {PAGES_QUERY!r}")
+            print(f"{'walk':<9} {'pages':>6} {'page':>7} {'cursor (ms)':>12} {'offset (ms)':>12}")
+            ok = True
+            for (walk, fetch) in walks.items():
+                cursors = [None]
+                found = []
+                while True:
+                    page = fetch(cursors[-1])
+                    found.extend(row[1] for row in page["results"])
+                    if page["next"] is None:
+                        break
+                    cursors.append(page["next"])
+                found = [arch._video_key(vid_id) for vid_id in found]
+                ok = ok and found == full[walk]
+
+                (sql, params) = offset_queries[walk]
+                for (name, n) in (("first", 0), ("middle", len(cursors) // 2), ("last", len(cursors) - 1)):
+                    times = {"cursor": [], "offset": []}
+                    for _ in range(5):
+                        start = time.perf_counter()
+                        fetch(cursors[n])
+                        times["cursor"].append((time.perf_counter() - start) * 1000)
+                        start = time.perf_counter()
+                        arch.handle_query(sql, (*params, page_size + 1, n * page_size))
+                        times["offset"].append((time.perf_counter() - start) * 1000)
+                    print(
+                        f"{walk:<9} {len(cursors):>6} {name:>7} "
+                        f"{statistics.median(times['cursor']):>12.2f} "
+                        f"{statistics.median(times['offset']):>12.2f}"
+                    )
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    if not ok:
+        print("a walk through the pages did not return every video once, in order")
+    return ok
+
+
+class _SimulatedApi:
+    """A YouTube Data API stand-in that records its traffic to a cassette.
+
+    Serves playlistItems.list() pages (with page tokens and per-page ETags, and
+    304 Not Modified when If-None-Match matches) and playlists.list() for the
+    playlists it holds. Archiver uses it like a cassette (see use_cassette): it
+    needs no credentials, and every exchange is stored in the recording cassette
+    so the run can be replayed from it.
+
+    Attributes:
+        playlists (dict): Maps playlist ID to its (video ID, title) list; edit it
+            between calls to simulate changes.
+        failures (set): 1-based numbers of the requests answered with a 403
+            quotaExceeded error, which the client does not retry.
+        requests (int): Number of requests served.
+        not_modified (int): Number of 304 responses served.
+    """
+
+    offline = True
+
+    def __init__(self, cassette, playlists=None, failures=()):
+        self.cassette = cassette
+        self.playlists = playlists or {}
+        self.failures = set(failures)
+        self.requests = 0
+        self.not_modified = 0
+        self.timeout = None
+        self.connections = {}
+        self.follow_redirects = True
+        self.redirect_codes = {301, 302, 303, 307, 308}
+
+    def http(self, timeout=None):
+        return self
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _etag(value) -> str:
+        return hashlib.md5(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+    def _playlist_items(self, params, etag) -> tuple[int, dict | None]:
+        videos = self.playlists[params["playlistId"]]
+        if params["maxResults"] == "0":
+            return (200, {"etag": self._etag(videos), "pageInfo": {"totalResults": len(videos)}})
+
+        start = int(params.get("pageToken", 0))
+        page = {"items": [
+            {
+                "snippet": {"title": title, "position": position},
+                "contentDetails": {"videoId": vid_id},
+                "status": {"privacyStatus": "public"},
+            }
+            for (position, (vid_id, title)) in enumerate(videos[start:start + 50], start)
+        ]}
+        if start + 50 < len(videos):
+            page["nextPageToken"] = str(start + 50)
+        page["etag"] = self._etag(page)
+
+        if etag == page["etag"]:
+            self.not_modified += 1
+            return (304, None)
+        return (200, page)
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        import httplib2
+        from cassette import _request_key
+
+        parsed = urlparse(uri)
+        params = dict(parse_qsl(parsed.query))
+        etag = {k.lower(): v for k, v in (headers or {}).items()}.get("if-none-match")
+        self.requests += 1
+
+        if self.requests in self.failures:
+            (status, data) = (403, {"error": {
+                "code": 403,
+                "message": "Injected failure",
+                "errors": [{"reason": "quotaExceeded", "message": "Injected failure"}],
+            }})
+        elif parsed.path.endswith("/playlists"):
+            (status, data) = (200, {"items": [
+                {
+                    "id": p_id,
+                    "etag": self._etag(self.playlists[p_id]),
+                    "snippet": {"title": f"Playlist {p_id}"},
+                    "contentDetails": {"itemCount": len(self.playlists[p_id])},
+                }
+                for p_id in params["id"].split(",") if p_id in self.playlists
+            ]})
+        else:
+            (status, data) = self._playlist_items(params, etag)
+
+        resp = httplib2.Response({"status": status, "content-type": "application/json"})
+        resp.status = status
+        content = json.dumps(data).encode() if data is not None else b""
+        self.cassette._record(_request_key(method, uri, headers), resp, content, 0.0)
+        return (resp, content)
+
+
+def _replay_phases(arch, phases, api=None) -> list[dict]:
+    """Run the phases of the replay benchmark with one Archiver.
+
+    Args:
+        arch (Archiver): The archiver, with its cassette set.
+        phases (list[tuple]): (name, method, videos) tuples, where method is the
+            Archiver method run and videos the remote (video ID, title) list.
+        api (_SimulatedApi, optional): The simulated API while recording; its
+            playlist is set to each phase's videos.
+
+    Returns:
+        list[dict]: Per phase, the requests sent, bytes received and quota units
+            spent, whether the method succeeded, what it printed, the stored
+            (video ID, title) list and the archive checkpoint left behind.
+    """
+    results = []
+
+    for (name, method, videos) in phases:
+        if api:
+            api.playlists[REPLAY_PLAYLIST] = videos
+
+        before = arch.get_transfer_stats()
+        usage = arch.get_quota_usage()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            done = getattr(arch, method)(REPLAY_PLAYLIST)
+        after = arch.get_transfer_stats()
+        # Simulated and replayed requests are both counted as replayed units
+        units = arch.get_quota_usage()["replayed"] - usage["replayed"]
+
+        arch._cursor.execute('''
+            SELECT v.vid_id, v.title FROM playlist_items AS pi
+            INNER JOIN videos AS v ON v.vid_id = pi.vid_id
+            WHERE pi.p_id = ?
+            ORDER BY pi.position
+            ''',
+            (REPLAY_PLAYLIST,)
+        )
+        stored = [(arch._video_id(vid_id), title) for (vid_id, title) in arch._cursor.fetchall()]
+
+        results.append({
+            "phase": name,
+            "requests": after["requests"] - before["requests"],
+            "bytes": after["bytes"] - before["bytes"],
+            "units": units,
+            "done": done,
+            "output": output.getvalue(),
+            "stored": stored,
+            "checkpoint": arch._load_checkpoint(REPLAY_PLAYLIST),
+        })
+
+    return results
+
+
+def benchmark_replay(n_items=500) -> bool:
+    """Archive, resume and update a playlist, then do it again from a cassette.
+
+    A simulated API (see _SimulatedApi) serves a playlist of n_items videos, one
+    of them repeated on the first page. archive_playlist is interrupted by a
+    failed request halfway through. Ten videos are then removed from the first
+    page, so the next attempt must discard the stored pages and start over; it
+    is interrupted at the same page and run again, which must resume from its
+    checkpoint. update_playlist then reconciles an edited copy (one video
+    retitled on the first page, one appended), so unchanged pages are answered
+    304 Not Modified. The traffic is recorded to a cassette, which is then
+    replayed into a fresh database with the same calls.
+
+    Args:
+        n_items (int): Number of items in the playlist (at least 150).
+
+    Returns:
+        bool: True if every phase sent the expected number of requests and stored
+            what it should, the interrupted archives left a checkpoint at the
+            failed page, the resumed one reported the rows it stored, and the
+            replay fetched the same requests, bytes and quota units as the
+            recording.
+    """
+    cwd = os.getcwd()
+    ids = _video_ids(n_items + 1)
+    videos = [(vid_id, f"Replay video {i}") for (i, vid_id) in enumerate(ids[:n_items])]
+    # The first page repeats a video, so later pages hold fewer distinct videos
+    videos[10] = videos[3]
+    # Removed while the archive is interrupted, which changes the playlist ETag
+    changed = videos[:20] + videos[30:]
+    edited = list(changed)
+    edited[1] = (edited[1][0], "Retitled video")
+    edited.append((ids[n_items], "Appended video"))
+
+    phases = [
+        ("failed", "archive_playlist", videos),
+        ("changed", "archive_playlist", changed),
+        ("resume", "archive_playlist", changed),
+        ("update", "update_playlist", edited),
+    ]
+    interrupted = {"failed", "changed"}
+    # The request for this page fails, after the summary and the pages before it
+    failed_page = -(-n_items // 50) // 2
+    # The summary request, one request per page and the playlist resource
+    expected = {
+        "failed": failed_page + 2,
+        "changed": failed_page + 2,
+        "resume": -(-len(changed) // 50) - failed_page + 2,
+        "update": -(-len(edited) // 50) + 2,
+    }
+    before_failure = {
+        "failed": videos[:failed_page * 50],
+        "changed": changed[:failed_page * 50],
+    }
+    resumed = len(dict.fromkeys(changed)) - len(dict.fromkeys(before_failure["changed"]))
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            import archiver
+            from cassette import Cassette
+
+            path = os.path.join(directory, "replay.json")
+            runs = {}
+
+            arch = archiver.Archiver("record.db")
+            with Cassette(path, mode="record") as cassette:
+                api = _SimulatedApi(
+                    cassette, failures={failed_page + 2, 2 * (failed_page + 2)}
+                )
+                arch.use_cassette(api)
+                runs["record"] = _replay_phases(arch, phases, api)
+            arch.close()
+
+            arch = archiver.Archiver("replay.db")
+            arch.use_cassette(Cassette(path))
+            runs["replay"] = _replay_phases(arch, phases)
+            arch.use_cassette(None)
+            arch.close()
+        finally:
+            os.chdir(cwd)
+
+    ok = api.not_modified > 0
+    print(
+        f"Playlist of {n_items} items, archive interrupted at page {failed_page}, "
+        f"{api.not_modified} page(s) answered 304 on update"
+    )
+    print(f"{'run':<7} {'phase':<8} {'requests':>9} {'bytes':>9} {'units':>6}  result")
+    for (run, results) in runs.items():
+        for (i, result) in enumerate(results):
+            (phase, _, videos_then) = phases[i]
+            problems = []
+            if result["done"] != (phase not in interrupted):
+                problems.append("did not fail" if phase in interrupted else "failed")
+            if result["requests"] != expected[phase]:
+                problems.append(f"expected {expected[phase]} requests")
+
+            # A repeated video is stored once, at its first position
+            if phase in interrupted:
+                if result["stored"] != list(dict.fromkeys(before_failure[phase])):
+                    problems.append("stored pages differ")
+                if result["checkpoint"][:2] != (str(failed_page * 50), failed_page * 50 - 1):
+                    problems.append(f"checkpoint at {result['checkpoint'][:2]}")
+            else:
+                if result["stored"] != list(dict.fromkeys(videos_then)):
+                    problems.append("stored playlist differs")
+                if result["checkpoint"] is not None:
+                    problems.append("checkpoint left behind")
+            if phase == "resume":
+                report = re.search(r"(\d+) item\(s\) and (\d+) new video\(s\)", result["output"])
+                if not report or report.groups() != (str(resumed), str(resumed)):
+                    problems.append(f"expected {resumed} items and videos reported")
+
+            if run == "replay":
+                for key in ("requests", "bytes", "units"):
+                    if result[key] != runs["record"][i][key]:
+                        problems.append(f"{key} differ from the recording")
+            ok = ok and not problems
+            print(
+                f"{run:<7} {phase:<8} {result['requests']:>9} {result['bytes']:>9} "
+                f"{result['units']:>6}  {', '.join(problems) or 'ok'}"
+            )
+
+    return ok
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="YouTube Playlist Archiver benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    startup = subparsers.add_parser("startup", help="Cold-start time of local commands")
+    startup.add_argument("--runs", type=int, default=5, help="Runs per command (default 5)")
+    startup.add_argument(
+        "--budget",
+        type=float,
+        default=STARTUP_BUDGET_MS,
+        help="Import time budget per command in ms (default %d)" % STARTUP_BUDGET_MS
+    )
+
+    reconcile = subparsers.add_parser("reconcile", help="Rows written by playlist updates")
+    reconcile.add_argument(
+        "--items", type=int, default=10000, help="Items in the playlist (default 10000)"
+    )
+
+    write = subparsers.add_parser("write", help="Rows/second of bulk playlist writes")
+    write.add_argument(
+        "--rows", type=int, default=100000, help="Playlist items to write (default 100000)"
+    )
+    write.add_argument(
+        "--target",
+        type=float,
+        default=WRITE_TARGET_ROWS_PER_S,
+        help="Minimum rows/second (default %d)" % WRITE_TARGET_ROWS_PER_S
+    )
+
+    profiles = subparsers.add_parser(
+        "profiles", help="Archive and search throughput under each database profile"
+    )
+    profiles.add_argument(
+        "--rows", type=int, default=20000, help="Rows archived per profile (default 20000)"
+    )
+    profiles.add_argument(
+        "--readers", type=int, default=4, help="Concurrent reader threads (default 4)"
+    )
+
+    subparsers.add_parser("plans", help="Query plans of local operations")
+
+    ids = subparsers.add_parser("ids", help="Text vs integer video IDs")
+    ids.add_argument(
+        "--playlists", type=int, default=20, help="Playlists archived (default 20)"
+    )
+    ids.add_argument(
+        "--items", type=int, default=5000, help="Items per playlist (default 5000)"
+    )
+    ids.add_argument(
+        "--videos", type=int, default=20000, help="Distinct videos (default 20000)"
+    )
+
+    delete = subparsers.add_parser("delete", help="Time to delete a playlist from a large archive")
+    delete.add_argument(
+        "--rows", type=int, default=500000, help="Playlist items in the archive (default 500000)"
+    )
+    delete.add_argument(
+        "--deletes", type=int, default=5, help="Playlists deleted (default 5)"
+    )
+    delete.add_argument(
+        "--budget",
+        type=float,
+        default=DELETE_BUDGET_MS,
+        help="Median deletion time budget in ms (default %d)" % DELETE_BUDGET_MS
+    )
+
+    history = subparsers.add_parser("history", help="Change log size and point-in-time rebuilds")
+    history.add_argument(
+        "--items", type=int, default=10000, help="Items in the playlist (default 10000)"
+    )
+    history.add_argument(
+        "--syncs", type=int, default=200, help="Syncs after the archive (default 200)"
+    )
+    history.add_argument(
+        "--budget",
+        type=float,
+        default=HISTORY_BUDGET_MS,
+        help="Rebuild time budget in ms (default %d)" % HISTORY_BUDGET_MS
+    )
+
+    fts = subparsers.add_parser("fts", help="Full-text index size and query latency per tokenizer")
+    fts.add_argument(
+        "--videos", type=int, default=100000, help="Videos in the database (default 100000)"
+    )
+    fts.add_argument(
+        "--rounds", type=int, default=5, help="Times each query is run (default 5)"
+    )
+
+    search = subparsers.add_parser("search", help="In-playlist search latency by playlist size")
+    search.add_argument(
+        "--videos", type=int, default=500000, help="Videos in the database (default 500000)"
+    )
+    search.add_argument(
+        "--rounds", type=int, default=3, help="Times each query is run (default 3)"
+    )
+
+    cache = subparsers.add_parser("cache", help="Time of searches answered by the search cache")
+    cache.add_argument(
+        "--videos", type=int, default=100000, help="Videos in the database (default 100000)"
+    )
+    cache.add_argument(
+        "--playlists", type=int, default=10, help="Playlists searched (default 10)"
+    )
+    cache.add_argument(
+        "--budget",
+        type=float,
+        default=CACHE_HIT_BUDGET_MS,
+        help="Median cached search time budget in ms (default %.1f)" % CACHE_HIT_BUDGET_MS
+    )
+
+    pages = subparsers.add_parser("pages", help="Time of deep pages of a playlist and a search")
+    pages.add_argument(
+        "--items", type=int, default=100000, help="Items in the playlist (default 100000)"
+    )
+    pages.add_argument(
+        "--page-size", type=int, default=50, help="Videos or results per page (default 50)"
+    )
+
+    replay = subparsers.add_parser("replay", help="Archive and update a playlist from a cassette")
+    replay.add_argument(
+        "--items", type=int, default=500, help="Items in the playlist (default 500)"
+    )
+
+    args = parser.parse_args()
+
+    if args.benchmark == "startup":
+        passed = benchmark_startup(args.runs, args.budget)
+    elif args.benchmark == "reconcile":
+        passed = benchmark_reconcile(args.items)
+    elif args.benchmark == "write":
+        passed = benchmark_write(args.rows, args.target)
+    elif args.benchmark == "profiles":
+        passed = benchmark_profiles(args.rows, args.readers)
+    elif args.benchmark == "plans":
+        passed = benchmark_plans()
+    elif args.benchmark == "ids":
+        passed = benchmark_ids(args.playlists, args.items, args.videos)
+    elif args.benchmark == "delete":
+        passed = benchmark_delete(args.rows, args.deletes, args.budget)
+    elif args.benchmark == "history":
+        passed = benchmark_history(args.items, args.syncs, args.budget)
+    elif args.benchmark == "fts":
+        passed = benchmark_fts(args.videos, args.rounds)
+    elif args.benchmark == "search":
+        passed = benchmark_search(args.videos, n_rounds=args.rounds)
+    elif args.benchmark == "cache":
+        passed = benchmark_cache(args.videos, args.playlists, args.budget)
+    elif args.benchmark == "pages":
+        passed = benchmark_pages(args.items, args.page_size)
+    elif args.benchmark == "replay":
+        passed = benchmark_replay(args.items)
+
+    sys.exit(0 if passed else 1)
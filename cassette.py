@@ -0,0 +1,245 @@
+"""
+YouTube Playlist Archiver - Record/Replay Transport
+
+Cassettes capture the YouTube Data API traffic of a run so that it can be played
+back later without network access or credentials. A recording cassette sends
+requests as usual and stores every API request/response pair; a replaying
+cassette serves the stored responses, optionally with simulated latency and
+injected errors, so the number of requests, bytes transferred and wall time of a
+fetch can be measured offline.
+
+Usage:
+    from archiver import Archiver
+    from cassette import Cassette
+
+    # Record a live archive
+    with Cassette("archive.json", mode="record") as cassette:
+        arch = Archiver()
+        arch.use_cassette(cassette)
+        arch.authenticate()
+        arch.archive_playlist("PLxxx")
+
+    # Replay it offline with 100 ms per request and 5% of requests failing
+    arch.use_cassette(Cassette("archive.json", latency=0.1, error_rate=0.05))
+
+Only YouTube Data API requests are recorded; OAuth token requests are never stored.
+"""
+
+import json
+import random
+import threading
+import time
+import httplib2
+
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+CASSETTE_VERSION = 1
+
+# Part of the URI path that identifies YouTube Data API requests
+API_PATH = "/youtube/v3/"
+
+# Query parameters that may carry credentials and are never stored or matched
+SECRET_PARAMS = {"key", "access_token"}
+
+
+class CassetteMissError(Exception):
+    """Raised on replay when a request has no recorded response."""
+
+
+def _request_key(method, uri, headers) -> str:
+    """Return the key used to match a request with its recorded responses.
+
+    Query parameters are sorted so that parameter order does not matter. The
+    If-None-Match header is part of the key, since it decides whether the API
+    answers with a page or with 304 Not Modified.
+    """
+    parsed = urlparse(uri)
+    query = sorted(
+        (k, v) for (k, v) in parse_qsl(parsed.query, keep_blank_values=True)
+        if k not in SECRET_PARAMS
+    )
+    etag = {k.lower(): v for k, v in (headers or {}).items()}.get("if-none-match", "")
+
+    return f"{method} {parsed.path}?{urlencode(query)} {etag}"
+
+
+class _RecordingHttp(httplib2.Http):
+    """httplib2.Http that stores every YouTube API exchange in a cassette."""
+
+    def __init__(self, cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        start = time.perf_counter()
+        resp, content = super().request(uri, method, body, headers, *args, **kwargs)
+        if API_PATH in urlparse(uri).path:
+            self.cassette._record(
+                _request_key(method, uri, headers), resp, content, time.perf_counter() - start
+            )
+        return resp, content
+
+
+class _ReplayHttp:
+    """Stand-in for httplib2.Http that answers requests from a cassette."""
+
+    def __init__(self, cassette, timeout=None):
+        self.cassette = cassette
+        self.timeout = timeout
+        self.connections = {}
+        self.follow_redirects = True
+        self.redirect_codes = set(httplib2.REDIRECT_CODES)
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        return self.cassette._replay(_request_key(method, uri, headers), uri)
+
+    def close(self):
+        pass
+
+
+class Cassette:
+    """A file of recorded YouTube Data API exchanges.
+
+    Recorded responses are matched by method, URI (minus credentials) and
+    If-None-Match header. Identical requests are answered with their recorded
+    responses in order, and the last one is repeated once they run out.
+
+    Attributes:
+        path (str): Path of the cassette file.
+        mode (str): 'record' or 'replay'.
+        latency (float | None): Seconds added to each replayed request; None
+            replays the latency measured while recording.
+        errors (dict): Maps 1-based replayed request numbers to the HTTP status
+            returned instead of the recorded response.
+        error_rate (float): Fraction of replayed requests answered with error_status.
+        error_status (int): HTTP status of randomly injected errors.
+        requests (int): Number of requests recorded or replayed so far.
+    """
+
+    def __init__(self, path, mode="replay", latency=0.0, errors=None,
+                 error_rate=0.0, error_status=503, seed=None):
+        """Open a cassette.
+
+        Args:
+            path (str): Path of the cassette file.
+            mode (str): 'record' to capture live traffic, 'replay' to serve it.
+            latency (float | None): Seconds added to each replayed request; None
+                replays recorded latencies.
+            errors (dict, optional): Maps replayed request numbers to HTTP statuses.
+            error_rate (float): Fraction of replayed requests that fail.
+            error_status (int): HTTP status of randomly failed requests.
+            seed (int, optional): Seed for random error injection.
+
+        Raises:
+            ValueError: If the mode is unknown or the cassette version is unsupported.
+            FileNotFoundError: If a replay cassette does not exist.
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.errors = errors or {}
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._interactions = []
+        self._responses = {}
+        self._served = {}
+
+        if mode == "replay":
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+            self._interactions = data["interactions"]
+            for interaction in self._interactions:
+                self._responses.setdefault(interaction["key"], []).append(interaction)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.save()
+
+    @property
+    def offline(self) -> bool:
+        """True when requests are served from the cassette and need no credentials."""
+        return self.mode == "replay"
+
+    def http(self, timeout=None):
+        """Return a new HTTP object for one API service.
+
+        Args:
+            timeout (int, optional): Socket timeout in seconds (record mode).
+
+        Returns:
+            An httplib2.Http-compatible object bound to this cassette.
+        """
+        if self.mode == "record":
+            return _RecordingHttp(self, timeout=timeout)
+        return _ReplayHttp(self, timeout=timeout)
+
+    def save(self):
+        """Write recorded exchanges to the cassette file (no-op in replay mode)."""
+        if self.mode != "record":
+            return
+
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": list(self._interactions)}
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=1)
+
+    def _record(self, key, resp, content, elapsed):
+        """Store one exchange."""
+        with self._lock:
+            self.requests += 1
+            self._interactions.append({
+                "key": key,
+                "status": resp.status,
+                "headers": {k: v for (k, v) in resp.items() if k != "status"},
+                "body": (content or b"").decode("utf-8", errors="replace"),
+                "elapsed": round(elapsed, 4)
+            })
+
+    def _replay(self, key, uri) -> tuple:
+        """Return the (response, content) recorded for a request key.
+
+        Raises:
+            CassetteMissError: If the request was never recorded.
+        """
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+            status = self.errors.get(number)
+            if status is None and self.error_rate and self._random.random() < self.error_rate:
+                status = self.error_status
+
+            recorded = self._responses.get(key)
+            if recorded:
+                # A failed attempt leaves the recorded response for the retry
+                index = self._served.get(key, 0)
+                if status is None:
+                    self._served[key] = index + 1
+                interaction = recorded[min(index, len(recorded) - 1)]
+
+        if not recorded:
+            raise CassetteMissError(f"No recorded response for {uri}")
+
+        delay = interaction["elapsed"] if self.latency is None else self.latency
+        if delay:
+            time.sleep(delay)
+
+        if status is not None:
+            body = json.dumps({"error": {"code": status, "message": "Injected error"}})
+            return (
+                httplib2.Response({"status": status, "content-type": "application/json"}),
+                body.encode()
+            )
+
+        resp = httplib2.Response(interaction["headers"])
+        resp.status = interaction["status"]
+        return (resp, interaction["body"].encode())
@@ -23,7 +23,8 @@ except ImportError:
 # NOTE: This should probably be a field that main.py passes PlaylistArchiverGUI, 
 # which passes it to MainWindow
 import archiver
-arch = archiver.Archiver()
+# Set by create_gui_application, so importing this module has no side effects
+arch = None
 
 class PlaylistArchiverGUI:
     """Main GUI class for the YouTube Playlist Archiver."""
@@ -40,6 +41,7 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.app = app  # Store reference to QApplication
         self.search_timer = None  # Timer for debouncing search input
+        self.next_page = None  # Appends the next page of the details viewer's list
         self.init_ui()
 
     def init_ui(self):
@@ -165,6 +167,12 @@ class MainWindow(QMainWindow):
         self.details_viewer.setOpenExternalLinks(True)
 
         right_layout.addWidget(self.details_viewer, 1)
+
+        # Loads the next page of videos or search results (enabled when there is one)
+        self.more_btn = QPushButton("Show More")
+        self.more_btn.clicked.connect(self.show_more)
+        self.more_btn.setEnabled(False)
+        right_layout.addWidget(self.more_btn, alignment=Qt.AlignRight)
         playlist_splitter.addWidget(right_panel)
 
         # Add splitter to main layout
@@ -296,9 +304,10 @@ class MainWindow(QMainWindow):
     def show_all_videos_from_playlist(self):
         """Display all videos from the currently selected playlist in the details viewer.
 
-        Retrieves video data from the database, formats each entry with position number
-        and status color coding (green for public, yellow for unlisted, red for private).
-        Appends results to the QtTextBrowser details viewer widget.
+        Retrieves the first page of video data from the database, formats each entry
+        with position number and status color coding (green for public, yellow for
+        unlisted, red for private). Appends results to the QtTextBrowser details viewer
+        widget; "Show More" appends the next page.
         """
 
         row = self.playlist_table.currentRow()
@@ -309,43 +318,22 @@ class MainWindow(QMainWindow):
         title = self.playlist_table.item(row, 0).text()
 
         try:
-            query = """
-                SELECT v.title, v.status, pi.position, pi.vid_id, pi.added
-                FROM videos v
-                JOIN playlist_items pi ON v.vid_id = pi.vid_id
-                WHERE pi.p_id = ?
-                ORDER BY pi.position ASC
-            """
-            videos = arch.handle_query(query, (p_id,))
-
-            if not videos:
+            page = arch.get_playlist_page(p_id, count=True)
+
+            self._clear_details()
+            if not page["results"]:
                 self.details_viewer.append("<span>No videos found in this playlist.</span>")
                 return
 
-            self.details_viewer.clear()
             self.details_viewer.append(f"<span>=== {title} ===\n</span>")
-            self.details_viewer.append(f"<span>Total Videos: {len(videos)}\n</span>")
+            self.details_viewer.append(f"<span>Total Videos: {page['total']}\n</span>")
             self.details_viewer.append("<span>" + "-" * 50 + "\n</span>")
 
-            for title_text, status, position, vid_id, added_timestamp in videos:
-                try:
-                    added = datetime.fromtimestamp(int(added)).strftime("%Y-%m-%d %H:%M:%S")
-                except:
-                    added = str(added_timestamp)
-                
-                # Determine status color
-                color = self._determine_status_color(status)
-
-                self.details_viewer.append(
-                    f"{position + 1}. <font color='{color}'>[{status}]</font> "
-                    f"<a href=\"https://www.youtube.com/watch?v={vid_id}\">{title_text}</a>"
-                )
-
-            if len(videos) > 50:
-                self.details_viewer.append("<span>" + "-" * 50 + "\n</span>")
-                self.details_viewer.append(
-                    f"<span>(Showing all {len(videos)} videos. Use browser for full playlist view.)</span>"
-                )
+            self._append_page(
+                page,
+                lambda after: arch.get_playlist_page(p_id, after=after),
+                self._format_video
+            )
 
         except Exception as e:
             self.details_viewer.append(f"Error loading all videos: {e}")
@@ -355,8 +343,9 @@ class MainWindow(QMainWindow):
         """Search for videos within a specific playlist using SQLite FTS5 full-text search.
 
         Executes an FTS5 query against the current playlist to find matching videos,
-        displays up to 10 results with status color coding in the QtTextBrowser.
-        Results are ordered by relevance rank from highest to lowest.
+        displays the first page of results with status color coding in the QtTextBrowser.
+        Results are ordered by relevance rank from highest to lowest; "Show More"
+        appends the next page.
         """
 
         row = self.playlist_table.currentRow()
@@ -373,28 +362,25 @@ class MainWindow(QMainWindow):
 
         # Use the FTS5 search from archiver.py directly via cursor
         try:
-            search_results = arch.search_in_playlist_fts(p_id, query_text)
+            page = arch.search_videos(query_text, p_id, count=True)
 
-            if not search_results:
+            self._clear_details()
+            if not page["results"]:
                 self.details_viewer.append(f"<span>No results found for '{query_text}' in {title}.</span>")
                 return
 
-            self.details_viewer.clear()
             self.details_viewer.append(f"<span>=== Search Results in {title} ===\n</span>")
             self.details_viewer.append(f"<span>Search Term: {query_text}\n</span>")
-            self.details_viewer.append(f"<span>Found {len(search_results)} result(s):\n</span>")
+            self.details_viewer.append(f"<span>Found {page['total']} result(s):\n</span>")
+            self.details_viewer.append(
+                f"<span>(Click any video to open in browser.)\n</span>"
+            )
             self.details_viewer.append("<span>" + "-" * 50 + "\n</span>")
 
-            for title_text, vid_id, status, rank in search_results:
-                color = self._determine_status_color(status)
-                self.details_viewer.append(
-                    f"• <font color='{color}'>[{status}]</font> "
-                    f"<a href=\"https://www.youtube.com/watch?v={vid_id}\">{title_text}</a>\n"
-                )
-
-            self.details_viewer.append("<span>" + "-" * 50 + "\n</span>")
-            self.details_viewer.append(
-                f"<span>(Showing top 10 results. Click any video to open in browser.)\n</span>"
+            self._append_page(
+                page,
+                lambda after: arch.search_videos(query_text, p_id, after=after),
+                self._format_search_result
             )
 
         except Exception as e:
@@ -410,8 +396,8 @@ class MainWindow(QMainWindow):
 
         query_text = text if text is not None else self.video_search_input.text().strip()
 
-        # Don't search if empty or too short (at least 3 characters)
-        if not query_text or len(query_text) < 3:
+        # Don't search if empty or too short for the search index
+        if not query_text or len(query_text) < arch.min_search_length:
             return
 
         # Start timer to debounce - wait 200ms after user stops typing
@@ -437,7 +423,7 @@ class MainWindow(QMainWindow):
     
     @Slot()
     def search_videos_all_playlists(self):
-        """Search for videos across all playlists using FTS5."""
+        """Search for videos across all playlists using FTS5, a page at a time."""
 
         query_text = self.video_search_input.text().strip()
 
@@ -447,33 +433,89 @@ class MainWindow(QMainWindow):
 
         # Use the FTS5 search from archiver.py directly via cursor
         try:
-            search_results = arch.search_all_videos_fts(query_text)
+            page = arch.search_videos(query_text, count=True)
 
-            if not search_results:
+            self._clear_details()
+            if not page["results"]:
                 self.details_viewer.append(f"<span>No results found for '{query_text}' in all videos.</span>")
                 return
 
-            self.details_viewer.clear()
             self.details_viewer.append(f"<span>=== Search Results (All Videos) ===\n</span>")
             self.details_viewer.append(f"<span>Search Term: {query_text}\n</span>")
-            self.details_viewer.append(f"<span>Found {len(search_results)} result(s):\n</span>")
+            self.details_viewer.append(f"<span>Found {page['total']} result(s):\n</span>")
+            self.details_viewer.append(
+                f"<span>(Click any video to open in browser.)\n</span>"
+            )
             self.details_viewer.append("<span>" + "-" * 50 + "\n</span>")
 
-            for title_text, vid_id, status, rank in search_results:
-                color = self._determine_status_color(status)
-                self.details_viewer.append(
-                    f"• <font color='{color}'>[{status}]</font> "
-                    f"<a href=\"https://www.youtube.com/watch?v={vid_id}\">{title_text}</a>\n"
-                )
-
-            self.details_viewer.append("<span>" + "-" * 50 + "\n</span>")
-            self.details_viewer.append(
-                f"<span>(Showing top 10 results. Click any video to open in browser.)\n</span>"
+            self._append_page(
+                page,
+                lambda after: arch.search_videos(query_text, after=after),
+                self._format_search_result
             )
 
         except Exception as e:
             self.details_viewer.append(f"<span>Error searching videos: {e}</span>")
     
+    def _clear_details(self):
+        """Clear the details viewer and disable "Show More", whose next page belongs to the old list."""
+        self.details_viewer.clear()
+        self.next_page = None
+        self.more_btn.setEnabled(False)
+
+    def _append_page(self, page, fetch, format_row):
+        """Append a page of videos to the details viewer and arm "Show More" for the next one.
+
+        Args:
+            page: A page from arch.get_playlist_page or arch.search_videos.
+            fetch: Returns the page after a cursor.
+            format_row: Returns the HTML line of one video of the page.
+        """
+        for row in page["results"]:
+            self.details_viewer.append(format_row(row))
+
+        if page["next"]:
+            self.next_page = lambda: self._append_page(fetch(page["next"]), fetch, format_row)
+        else:
+            self.next_page = None
+        self.more_btn.setEnabled(self.next_page is not None)
+
+    @Slot()
+    def show_more(self):
+        """Append the next page of the videos or search results being shown."""
+
+        if not self.next_page:
+            return
+
+        # Keep the scrollbar where it is while the page is appended
+        v_bar = self.details_viewer.verticalScrollBar()
+        v_bar_pos = v_bar.value()
+        try:
+            self.next_page()
+        except Exception as e:
+            self.details_viewer.append(f"<span>Error loading more videos: {e}</span>")
+        v_bar.setValue(v_bar_pos)
+
+    def _format_video(self, video):
+        """Return the details viewer line of a video from arch.get_playlist_page."""
+
+        (position, vid_id, title_text, status, _) = video
+        color = self._determine_status_color(status)
+        return (
+            f"{position}. <font color='{color}'>[{status}]</font> "
+            f"<a href=\"https://www.youtube.com/watch?v={vid_id}\">{title_text}</a>"
+        )
+
+    def _format_search_result(self, result):
+        """Return the details viewer line of a search result from arch.search_videos."""
+
+        (title_text, vid_id, status, _) = result
+        color = self._determine_status_color(status)
+        return (
+            f"• <font color='{color}'>[{status}]</font> "
+            f"<a href=\"https://www.youtube.com/watch?v={vid_id}\">{title_text}</a>\n"
+        )
+
     def _determine_status_color(self, status):
         """Determine the display color for a given video status.
 
@@ -516,7 +558,11 @@ class MainWindow(QMainWindow):
         p_id = self.playlist_table.item(row, 3).text()
 
         # Check for changes to playlist and update local data.
-        success = arch.update_playlist(p_id)
+        try:
+            success = arch.update_playlist(p_id)
+        except archiver.QuotaBudgetExceeded as e:
+            self.details_viewer.append(f"<span>Update deferred: {e}</span>")
+            return
 
         # Refresh playlist list upon update
         if success:
@@ -550,6 +596,10 @@ class MainWindow(QMainWindow):
         # Instantiate popup
         popup = DeletePlaylistPopup(playlist_info, parent=self)
         popup.exec() # Blocks interaction with the main window
+
+        # The deleted playlist's videos may still be shown
+        if not arch.handle_query("SELECT 1 FROM playlist_data WHERE p_id = ?", (p_id,)):
+            self._clear_details()
         self.refresh_playlists()
 
 class AddPlaylistPopup(QDialog):
@@ -594,7 +644,11 @@ class AddPlaylistPopup(QDialog):
             id = text
 
         # Archive playlist
-        success = arch.archive_playlist(id)
+        try:
+            success = arch.archive_playlist(id)
+        except archiver.QuotaBudgetExceeded as e:
+            print(f"Archive deferred: {e}")
+            return
         if success:
             print("Archive successful")
             self.parent.refresh_playlists()
@@ -641,13 +695,18 @@ class DeletePlaylistPopup(QDialog):
         arch.delete_playlist(self.p_id)
         self.done(0)
 
-def create_gui_application():
+def create_gui_application(db_path=archiver.DB_PATH):
     """
     Factory function to create the GUI application.
 
+    Args:
+        db_path: Path of the SQLite database file to open
+
     Returns:
         The PlaylistArchiverGUI instance (which contains the MainWindow)
     """
+    global arch
+    arch = archiver.Archiver(db_path)
 
     app = QApplication([])
     gui = PlaylistArchiverGUI(app)
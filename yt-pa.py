@@ -1,10 +1,11 @@
 #!/usr/bin/env python
 
 import argparse
+import datetime
+import time
 import traceback
 
 import archiver
-from gui_archiver import create_gui_application
 
 if __name__ == '__main__':
 
@@ -33,10 +34,44 @@ if __name__ == '__main__':
         const="playlists.txt",
         help="Use playlist ID file (default 'playlists.txt')"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of playlists from --file processed concurrently (default 1)"
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Archive playlists from --file with the asyncio engine (requires httpx)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=50,
+        help="API requests in flight at once with --async (default 50)"
+    )
     parser.add_argument(
         "-c", "--check",
         help="Check playlist for changes by ID"
     )
+    parser.add_argument(
+        "--check-all",
+        action="store_true",
+        help="Check all archived playlists for changes (50 playlists per request)"
+    )
+    parser.add_argument(
+        "--resync",
+        help="Re-sync an archived playlist by ID, downloading only changed pages"
+    )
+    parser.add_argument(
+        "--refresh-status",
+        nargs="?",
+        const=True,
+        metavar="PLAYLIST_ID",
+        help="Refresh the status of archived videos, 50 per request (all videos, or one playlist)"
+    )
     parser.add_argument(
         "-a", "--archive",
         help="Archive an entire playlist by ID"
@@ -55,11 +90,34 @@ if __name__ == '__main__':
         action="store_true",
         help="Print playlist in ascending order"
     )
+    parser.add_argument(
+        "--as-of",
+        metavar="DATETIME",
+        type=datetime.datetime.fromisoformat,
+        help="With --open, show the playlist as it was at this time (e.g. '2026-01-31 18:00')"
+    )
+    parser.add_argument(
+        "--history",
+        metavar="PLAYLIST_ID",
+        help="List the recorded changes of an archived playlist"
+    )
     parser.add_argument(
         "--search",
         nargs='+',
         help="Search for videos using FTS5 full-text search (order: playlist ID (optional), query)"
     )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        metavar="N",
+        help="With --search or --open, print N results and the cursor of the next page " +
+             "(default 10 search results, all videos)"
+    )
+    parser.add_argument(
+        "--after",
+        metavar="CURSOR",
+        help="With --search or --open, print the page after this cursor"
+    )
     parser.add_argument(
         "--export",
         help="Export a playlist as a set of CSV files"
@@ -71,7 +129,76 @@ if __name__ == '__main__':
     )
     parser.add_argument(
         "--delete",
-        help="Delete a locally stored playlist by ID"
+        nargs="+",
+        metavar="PLAYLIST_ID",
+        help="Delete one or more locally stored playlists by ID"
+    )
+    parser.add_argument(
+        "--convert-ids",
+        choices=["integer", "text"],
+        help="Store video IDs as 64-bit integers (smaller database, faster joins) or as text"
+    )
+    parser.add_argument(
+        "--fts-rebuild",
+        choices=list(archiver.FTS_INDEXES) + ["both"],
+        help="Rebuild the video search index with this tokenizer ('both' keeps two indexes)"
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=archiver.PREFETCH_DEPTH,
+        help="Pages fetched ahead while the current page is stored (default %d, 0 = off)"
+             % archiver.PREFETCH_DEPTH
+    )
+    parser.add_argument(
+        "--db",
+        default=archiver.DB_PATH,
+        metavar="PATH",
+        help="SQLite database file (default '%s')" % archiver.DB_PATH
+    )
+    parser.add_argument(
+        "--db-profile",
+        choices=list(archiver.DB_PROFILES),
+        default=archiver.DB_PROFILE,
+        help="SQLite connection settings (default '%s'; 'default' for network drives)"
+             % archiver.DB_PROFILE
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Estimate the quota cost of --archive or --file without running it"
+    )
+    parser.add_argument(
+        "--quota-budget",
+        type=int,
+        help="Daily quota units remote commands may spend (default %d)" % archiver.DAILY_QUOTA
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print the number of API requests and bytes received after remote commands"
+    )
+    parser.add_argument(
+        "--record",
+        metavar="CASSETTE",
+        help="Record the API traffic of a remote command to a cassette file"
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        help="Serve API requests from a recorded cassette file (no network needed)"
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        help="Seconds added to each replayed request (-1 = recorded latency)"
+    )
+    parser.add_argument(
+        "--replay-errors",
+        type=float,
+        default=0.0,
+        help="Fraction of replayed requests answered with HTTP 503"
     )
     parser.add_argument(
         "--gui",
@@ -79,12 +206,28 @@ if __name__ == '__main__':
         help="Launch YouTube Playlist Archiver GUI"
     )
 
+    arch = None
+    cassette = None
+    start = time.perf_counter()
+
     try:
         # Get args
         args = parser.parse_args()
+        if args.use_async:
+            if args.number or args.n_list:
+                parser.error(
+                    "--async archives entire playlists and cannot be used " +
+                    "with -n or --n_list"
+                )
+            import importlib.util
+            if importlib.util.find_spec("httpx") is None:
+                parser.error(
+                    "--async requires httpx; install it with " +
+                    "'poetry install --extras async' (or 'pip install httpx')"
+                )
 
-        # Instantiate archiver
-        arch = archiver.Archiver()
+        # Instantiate archiver (the database profile applies to its connections)
+        arch = archiver.Archiver(args.db, args.db_profile)
 
         # Execute functions according to args
 
@@ -94,23 +237,33 @@ if __name__ == '__main__':
         if args.list:
             arch.print_all_playlists()
         # Print videos from a playlist
+        elif args.open and args.as_of:
+            order = "ASC" if args.ascend else "DESC"
+            arch.print_playlist_as_of(args.open, args.as_of.timestamp(), order=order)
         elif args.open:
-            if args.ascend:
-                arch.print_videos_from_playlist(args.open, order="ASC")
-            else:
-                arch.print_videos_from_playlist(args.open, order="DESC")
+            order = "ASC" if args.ascend else "DESC"
+            arch.print_videos_from_playlist(
+                args.open, order=order, page_size=args.page_size, after=args.after
+            )
+        # List the recorded changes of a playlist
+        elif args.history:
+            arch.print_playlist_history(args.history)
         # Search for a video in a playlist
         elif args.search:
             # Search all videos
             if len(args.search) == 1:
-                result = arch.search_all_videos_fts(args.search[0])
+                playlist_id = None
+                title = args.search[0]
             # Search specific playlist
             elif len(args.search) == 2:
                 playlist_id = args.search[0]
                 title = args.search[1]
-                result = arch.search_in_playlist_fts(playlist_id, title)
-            
-            arch.print_search_results(result)
+
+            # Matches are counted on the first page only
+            page = arch.search_videos(
+                title, playlist_id, args.page_size or 10, args.after, count=args.after is None
+            )
+            arch.print_search_results(page["results"], page["total"], page["next"])
         # Importing/exporting
         elif args.export:
             arch.export_playlist(args.export)
@@ -118,7 +271,16 @@ if __name__ == '__main__':
             arch.import_playlist(args.import_file)
         # Deleting playlists
         elif args.delete:
-            arch.delete_playlist(args.delete)
+            arch.delete_playlists(args.delete)
+        # Converting the stored video IDs
+        elif args.convert_ids:
+            arch.convert_video_ids(args.convert_ids)
+        # Rebuilding the full-text search index
+        elif args.fts_rebuild:
+            if args.fts_rebuild == "both":
+                arch.rebuild_fts(list(archiver.FTS_INDEXES))
+            else:
+                arch.rebuild_fts([args.fts_rebuild])
 
         ''' Remote Functions '''
 
@@ -130,11 +292,37 @@ if __name__ == '__main__':
         # Set up YouTube API (global variable)
         youtube = build(API_SERVICE_NAME, API_VERSION, developerKey=key)
         """
-        # OAuth 2.0
-        arch.authenticate()
+        # Record/replay transport
+        if args.record or args.replay:
+            from cassette import Cassette
+            if args.record:
+                cassette = Cassette(args.record, mode="record")
+            else:
+                cassette = Cassette(
+                    args.replay,
+                    latency=None if args.replay_latency < 0 else args.replay_latency,
+                    error_rate=args.replay_errors
+                )
+            arch.use_cassette(cassette)
+
+        # OAuth 2.0 and service construction happen on the first remote call,
+        # so local commands above run without credentials or network access
+        if args.quota_budget is not None:
+            arch.set_quota_budget(args.quota_budget)
+        arch.prefetch_depth = args.prefetch
 
+        # Quota estimate only
+        if args.dry_run:
+            if args.archive:
+                estimates = arch.estimate_archive_costs(playlist_ids=[args.archive])
+                arch.print_cost_estimates(estimates)
+            elif args.file:
+                estimates = arch.estimate_archive_costs(path=args.file)
+                arch.print_cost_estimates(estimates)
+            else:
+                print("--dry-run requires --archive or --file")
         # Single playlist
-        if args.id:
+        elif args.id:
             playlist_id = args.id
             if not args.number:
                 arch.get_entire_playlist(playlist_id, "print")
@@ -146,31 +334,66 @@ if __name__ == '__main__':
         elif args.file:
             if args.number:
                 n_items = args.number
-                arch.retrieve_items_from_playlists(args.file, n_items)
             elif args.n_list:
-                n_list = args.n_list
-                arch.retrieve_items_from_playlists(args.file, n_list)
+                n_items = args.n_list
+            else:
+                n_items = None
+            if args.use_async:
+                # Optional engine, only imported when requested
+                from async_archiver import archive_playlists_from_file
+                results = archive_playlists_from_file(args.file, args.concurrency, arch)
             else:
-                arch.retrieve_items_from_playlists(args.file) 
+                results = arch.retrieve_items_from_playlists(
+                    args.file, n_items, workers=args.workers
+                )
+            arch.print_playlist_results(results)
         # Checking playlist for changes
         elif args.check:
             arch.check_playlist_for_changes(args.check)
+        elif args.resync:
+            arch.resync_playlist(args.resync)
+        elif args.check_all:
+            changed = arch.check_all_playlists()
+            arch.print_changed_playlists(changed)
+        elif args.refresh_status:
+            if args.refresh_status is True:
+                arch.refresh_video_statuses()
+            else:
+                arch.refresh_video_statuses(args.refresh_status)
         # Archive an entire playlist by id
         elif args.archive:
             arch.archive_playlist(args.archive)
         # GUI
         elif args.gui:
-            # Create QApplication and launch GUI
-            gui = create_gui_application()
+            # Create QApplication and launch GUI (PySide6 is only loaded here)
+            from gui_archiver import create_gui_application
+            gui = create_gui_application(args.db)
             window = gui.window
             gui.window.show()
             # NOTE: Replace lambda with function for extra terminating behavior
             gui.app.lastWindowClosed.connect(lambda: print("GUI closing..."))
             gui.app.exec() 
 
+        if args.stats:
+            stats = arch.get_transfer_stats()
+            usage = arch.get_quota_usage()
+            print(f"\nAPI requests: {stats['requests']}, bytes received: {stats['bytes']}")
+            print(f"Quota used today: {usage['used']} of {usage['budget']} {usage['by_method']}")
+            if usage['replayed']:
+                print(f"Quota of replayed requests (offline, not spent): {usage['replayed']}")
+            print(f"Wall time: {time.perf_counter() - start:.3f}s")
+
     except archiver.HttpError as e:
         print('An HTTP error %d occurred:\n%s' % (e.resp.status, e.content))
         traceback.print_exc()
+    except archiver.QuotaBudgetExceeded as e:
+        print(f"Stopped, daily quota budget exceeded: {e}")
     except Exception as e:
         print(f"An error has occurred: {e}")
         traceback.print_exc()
+    finally:
+        # Persist quota units spent by remote commands, even after errors
+        if arch:
+            arch.record_quota_usage()
+        if cassette:
+            cassette.save()